@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+# Shared pytest setup for the backend tests.
+#
+# FastAPI's TestClient runs every request on a new event loop, and pooled async
+# database connections cannot move between event loops. The tests therefore use
+# the sync fallback of database.get_async_db() unless told otherwise.
+# This must run before the app is imported, which is why it lives in conftest.py.
+os.environ.setdefault("DATABASE_ASYNC", "false")
+
+# Profile SQL in every test request and treat going over a route's query budget
+# as a failure (see profiling.py). Responses carry a Server-Timing header with
+# the number of queries the request ran.
+os.environ.setdefault("SQL_PROFILING", "true")
+os.environ.setdefault("SQL_QUERY_BUDGET_ENFORCE", "true")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database_schema():
+    # Importing the app creates no tables (production runs "python -m app.cli migrate"),
+    # so the tests create the schema from the models once per run
+    from app import database, models
+
+    models.Base.metadata.create_all(bind=database.get_engine())
+
+
+@pytest.fixture(autouse=True)
+def fail_on_query_budget_violations():
+    from app import profiling
+
+    profiling.budget_violations.clear()
+    yield
+    violations = list(profiling.budget_violations)
+    profiling.budget_violations.clear()
+    assert not violations, f"Query budget exceeded: {violations}"
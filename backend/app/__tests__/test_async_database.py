@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import database
+from app.main import app
+
+# This file runs the plant endpoints through a real AsyncSession (asyncpg or aiosqlite),
+# instead of the sync fallback used by the rest of the test suite.
+
+
+def test_plant_crud_with_async_session():
+    async def scenario():
+        # Everything runs on one event loop, so one async engine can serve every request
+        engine = create_async_engine(database.ASYNC_DATABASE_URL)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def get_test_db():
+            async with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[database.get_async_db] = get_test_db
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                created = await client.post(
+                    "/api/v1/plants",
+                    json={"name": "AsyncPlant", "description": "desc", "watering_schedule": "Daily"},
+                )
+                assert created.status_code == 200
+                plant_id = created.json()["id"]
+
+                duplicate = await client.post(
+                    "/api/v1/plants",
+                    json={"name": "asyncplant", "description": "desc", "watering_schedule": "Daily"},
+                )
+                assert duplicate.status_code == 400
+
+                updated = await client.put(
+                    f"/api/v1/plants/id/{plant_id}",
+                    json={"name": "AsyncPlant", "description": "changed", "watering_schedule": "Daily"},
+                )
+                assert updated.json()["description"] == "changed"
+
+                page = await client.get("/api/v1/plants", params={"name_prefix": "asyncplant"})
+                assert [plant["id"] for plant in page.json()["items"]] == [plant_id]
+
+                deleted = await client.delete(f"/api/v1/plants/id/{plant_id}")
+                assert deleted.status_code == 204
+        finally:
+            app.dependency_overrides.pop(database.get_async_db, None)
+            await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,52 @@
+from app.cache import LocalCache, ReadCache
+
+# This file contains unit tests for the plant read cache (cache.py).
+
+
+class FakeClock:
+    # A clock the tests can move forward by hand
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_local_cache_expires_entries():
+    clock = FakeClock()
+    cache = LocalCache(max_entries=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    clock.now = 5.0  # TTL reached
+    assert cache.get("a") is None
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "a" is now more recently used than "b"
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_read_cache_counts_hits_and_misses():
+    cache = ReadCache(LocalCache())
+    assert cache.get("key") is None
+    cache.set("key", {"value": 1}, cache.generation)
+    assert cache.get("key") == {"value": 1}
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_read_cache_discards_results_read_before_an_invalidation():
+    cache = ReadCache(LocalCache())
+    generation = cache.generation  # A reader starts a database query...
+    cache.invalidate()  # ...a write commits while it runs...
+    cache.set("key", "stale", generation)  # ...so its (stale) result is not cached
+    assert cache.get("key") is None
@@ -0,0 +1,274 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.changes import NOTIFY_CHANNEL, ChangeFeed, PostgresNotifier, change_feed, event_stream, notify_reset
+from app.main import app
+
+# This file tests the plant change feed behind GET /api/v1/plants/changes (see changes.py).
+# The stream never ends on its own, so the tests read event_stream() directly.
+
+client = TestClient(app)
+
+
+def _parse(message: str) -> dict:
+    """Splits one SSE message into its fields ("id", "event", "data")."""
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines() if not line.startswith(":"))
+    if "data" in fields:
+        fields["data"] = json.loads(fields["data"])
+    return fields
+
+
+async def _take(stream, count: int) -> list:
+    return [_parse(await asyncio.wait_for(stream.__anext__(), timeout=1)) for _ in range(count)]
+
+
+def test_ring_buffer_and_last_event_id():
+    feed = ChangeFeed(buffer_size=3)
+    start = feed.position
+    for plant_id in range(1, 6):
+        feed.publish(1, "created", plant_id, {"id": plant_id})
+
+    assert feed.last_seq == 5
+    assert [change.seq for change in feed.changes_since(f"{feed.epoch}:3")] == [4, 5]
+    assert feed.changes_since(feed.position) == []
+    # Changes 1 and 2 have left the buffer, so a client that saw nothing must reload
+    assert feed.changes_since(start) is None
+    # Unknown epoch (e.g. the server restarted) or a malformed ID also means reload
+    assert feed.changes_since("other:5") is None
+    assert feed.changes_since("garbage") is None
+
+
+def test_event_stream_sends_ready_then_deltas():
+    async def scenario():
+        feed = ChangeFeed()
+        stream = event_stream(feed, None, 1)
+        assert (await stream.__anext__()).startswith("retry:")
+        [ready] = await _take(stream, 1)
+        assert ready["event"] == "ready"
+        assert ready["id"] == feed.position
+
+        feed.publish(1, "created", 7, {"id": 7, "name": "Fern"})
+        feed.publish(1, "deleted", 7)
+        created, deleted = await _take(stream, 2)
+        assert created == {"id": f"{feed.epoch}:1", "event": "created",
+                           "data": {"seq": 1, "id": 7, "plant": {"id": 7, "name": "Fern"}}}
+        assert deleted["event"] == "deleted"
+        assert deleted["data"] == {"seq": 2, "id": 7, "plant": None}
+        await stream.aclose()
+        assert feed.subscriber_count == 0
+
+    asyncio.run(scenario())
+
+
+def test_event_stream_resumes_from_last_event_id():
+    async def scenario():
+        feed = ChangeFeed()
+        feed.publish(1, "created", 1, {"id": 1})
+        seen = feed.position
+        feed.publish(1, "updated", 1, {"id": 1})
+        feed.publish(1, "created", 2, {"id": 2})
+
+        stream = event_stream(feed, seen, 1)
+        await stream.__anext__()  # retry
+        missed = await _take(stream, 2)
+        assert [event["data"]["seq"] for event in missed] == [2, 3]
+
+        stale = event_stream(feed, "old-epoch:1", 1)
+        await stale.__anext__()
+        [reset] = await _take(stale, 1)
+        assert reset["event"] == "reset"
+        assert reset["id"] == feed.position
+        await stream.aclose()
+        await stale.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_slow_client_is_reset():
+    async def scenario():
+        feed = ChangeFeed(subscriber_queue_size=2)
+        stream = event_stream(feed, None, 1)
+        await _take(stream, 2)  # retry, ready
+        for plant_id in range(5):
+            feed.publish(1, "created", plant_id, {"id": plant_id})
+        events = await _take(stream, 3)
+        assert [event["event"] for event in events] == ["created", "created", "reset"]
+        # The stream ends after a reset; the browser reconnects with Last-Event-ID
+        try:
+            await stream.__anext__()
+            raise AssertionError("stream should have ended")
+        except StopAsyncIteration:
+            pass
+
+    asyncio.run(scenario())
+
+
+def test_streams_only_send_their_own_garden():
+    async def scenario():
+        feed = ChangeFeed()
+        feed.publish(2, "created", 1, {"id": 1})
+        seen = f"{feed.epoch}:0"
+        feed.publish(1, "created", 2, {"id": 2})
+
+        # Replayed changes are filtered by garden too
+        stream = event_stream(feed, seen, 1, heartbeat=0.05)
+        await stream.__anext__()  # retry
+        [replayed] = await _take(stream, 1)
+        assert replayed["data"]["id"] == 2
+
+        feed.publish(2, "updated", 1, {"id": 1})
+        feed.publish(1, "deleted", 2)
+        [deleted] = await _take(stream, 1)
+        assert (deleted["event"], deleted["id"]) == ("deleted", f"{feed.epoch}:4")
+
+        # Another garden's change moves the client's position with the next keep-alive
+        feed.publish(2, "deleted", 1)
+        keep_alive = await asyncio.wait_for(stream.__anext__(), timeout=1)
+        assert keep_alive.startswith(f"id: {feed.epoch}:5\n")
+        assert await asyncio.wait_for(stream.__anext__(), timeout=1) == ": keep-alive\n\n"
+        await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_reset_only_reloads_its_garden():
+    async def scenario():
+        feed = ChangeFeed()
+        resets = []
+        feed.add_reset_listener(resets.append)
+        seen = feed.position
+        feed.publish(2, "created", 1, {"id": 1})
+        imported = event_stream(feed, None, 1)
+        other = event_stream(feed, None, 2, heartbeat=0.05)
+        await _take(imported, 2)  # retry, ready
+        await _take(other, 2)
+
+        epoch = feed.epoch
+        feed.publish_reset(1)
+        feed.publish(1, "created", 2, {"id": 2})
+        feed.publish(2, "updated", 1, {"id": 1})
+        reset, created = await _take(imported, 2)
+        assert (reset["event"], reset["id"]) == ("reset", f"{epoch}:2")
+        assert created["data"]["seq"] == 3
+        # Another garden's stream just carries on
+        [updated] = await _take(other, 1)
+        assert updated["data"]["seq"] == 4
+        assert (feed.epoch, resets) == (epoch, [1])
+
+        # Clients reconnecting from before the reset: the imported garden reloads, the other gets what it missed
+        reconnected = event_stream(feed, seen, 1)
+        await reconnected.__anext__()
+        [reload] = await _take(reconnected, 1)
+        assert (reload["event"], reload["id"]) == ("reset", feed.position)
+        reconnected_other = event_stream(feed, seen, 2)
+        await reconnected_other.__anext__()
+        assert [event["data"]["seq"] for event in await _take(reconnected_other, 2)] == [1, 4]
+        for stream in (imported, other, reconnected, reconnected_other):
+            await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_notified_reset_reaches_every_worker():
+    # Each worker gets the reset from LISTEN, numbered by the shared sequence; the
+    # notifier is not started, so no database is needed to deliver the payload
+    feed = ChangeFeed()
+    feed.epoch = "pg"
+    resets = []
+    feed.add_reset_listener(resets.append)
+    notifier = PostgresNotifier(feed, "postgresql://unused")
+    created = {"garden": 1, "type": "created", "id": 1, "plant": {"id": 1}}
+    notifier._on_notify(None, 0, NOTIFY_CHANNEL, "5:" + json.dumps(created))
+    reset = {"garden": 1, "type": "reset", "id": 0, "plant": None}
+    notifier._on_notify(None, 0, NOTIFY_CHANNEL, "7:" + json.dumps(reset))
+    assert (feed.epoch, feed.last_seq, resets) == ("pg", 7, [1])
+    assert [(change.seq, change.type) for change in feed.changes_since("pg:5")] == [(7, "reset")]
+    assert feed.changes_since("pg:7") == []
+
+    # With a notifier, publish_reset() only sends the reset; it is applied when it comes back
+    feed._notifier = notifier
+    feed.publish_reset(2)
+    assert notifier._outbox.get_nowait() == (2, "reset", 0, None)
+    assert feed.last_seq == 7 and resets == [1]
+
+
+def test_command_line_reset_is_applied_by_the_servers():
+    # notify_reset() (python -m app.cli import) sends what the servers' notifier reads back
+    class RecordingConnection:
+        def __init__(self):
+            self.notified = []
+
+        def execute(self, statement, params=None):
+            if "pg_notify" in str(statement):
+                self.notified.append((params["channel"], params["payload"]))
+
+    connection = RecordingConnection()
+    notify_reset(connection, 3)
+    [(channel, payload)] = connection.notified
+    assert channel == NOTIFY_CHANNEL
+
+    feed = ChangeFeed()
+    resets = []
+    feed.add_reset_listener(resets.append)
+    PostgresNotifier(feed, "postgresql://unused")._on_notify(None, 0, channel, f"12:{payload}")
+    assert (feed.last_seq, resets) == (12, [3])
+
+
+def test_import_resets_the_feed():
+    garden = client.post("/api/v1/gardens", json={"name": "Feed Import"}).json()
+    epoch, start = change_feed.epoch, change_feed.last_seq
+    resets = []
+    change_feed.add_reset_listener(resets.append)
+    try:
+        response = client.post(
+            "/api/v1/plants:import?format=ndjson",
+            content='{"name": "FeedImport", "description": "", "watering_schedule": "Daily"}\n',
+            headers={"X-Garden-ID": str(garden["id"])},
+        )
+        assert response.json()["imported"] == 1
+    finally:
+        change_feed._reset_listeners.remove(resets.append)
+    assert (change_feed.epoch, change_feed.last_seq, resets) == (epoch, start + 1, [garden["id"]])
+
+
+def test_plant_writes_are_published():
+    start = change_feed.last_seq
+    created = client.post(
+        "/api/v1/plants", json={"name": "FeedPlant", "description": "desc", "watering_schedule": "Daily"}
+    ).json()
+    client.put(
+        f"/api/v1/plants/id/{created['id']}",
+        json={"name": "FeedPlant", "description": "changed", "watering_schedule": "Daily"},
+    )
+    client.delete(f"/api/v1/plants/id/{created['id']}")
+
+    changes = change_feed.changes_since(f"{change_feed.epoch}:{start}")
+    assert [(change.type, change.plant_id) for change in changes] == [
+        ("created", created["id"]),
+        ("updated", created["id"]),
+        ("deleted", created["id"]),
+    ]
+    assert changes[1].plant == {
+        "name": "FeedPlant", "description": "changed", "watering_schedule": "Daily", "id": created["id"]
+    }
+
+
+def test_batch_writes_are_published():
+    start = change_feed.last_seq
+    result = client.post(
+        "/api/v1/plants:batch",
+        json={"items": [
+            {"name": "FeedBatch1", "description": "d", "watering_schedule": "Daily"},
+            {"name": "FeedBatch2", "description": "d", "watering_schedule": "Daily"},
+        ]},
+    ).json()
+    ids = [item["id"] for item in result["results"]]
+    client.request("DELETE", "/api/v1/plants:batch", json={"ids": ids})
+
+    changes = change_feed.changes_since(f"{change_feed.epoch}:{start}")
+    assert [(change.type, change.plant_id) for change in changes] == [
+        ("created", ids[0]), ("created", ids[1]), ("deleted", ids[0]), ("deleted", ids[1])
+    ]
+    assert changes[0].plant["name"] == "FeedBatch1"
@@ -0,0 +1,71 @@
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware, parse_accept_encoding
+from app.main import app
+
+# This file contains tests for response compression (compression.py) and the
+# cached landing page in main.py.
+
+client = TestClient(app)
+
+# Brotli is an optional dependency
+brotli = pytest.importorskip("brotli")
+
+
+def _create_many_plants(prefix, count):
+    # Creates enough plants that the list response is well above the compression threshold
+    plants = [
+        {"name": f"{prefix}{i}", "description": "A fairly long description " * 4, "watering_schedule": "Weekly"}
+        for i in range(count)
+    ]
+    response = client.post("/api/v1/plants:batch", json={"items": plants})
+    assert response.status_code == 200
+
+
+def test_parse_accept_encoding_reads_quality_values():
+    assert parse_accept_encoding("gzip;q=0.5, br, identity;q=0") == {"gzip": 0.5, "br": 1.0, "identity": 0.0}
+
+
+def test_choose_encoding_follows_configured_preference():
+    middleware = CompressionMiddleware(app=None, encodings=["br", "gzip"])
+    assert middleware.choose_encoding("gzip, br") == "br"
+    assert middleware.choose_encoding("gzip, br;q=0") == "gzip"
+    assert middleware.choose_encoding("*") == "br"
+    assert middleware.choose_encoding("identity") is None
+
+
+def test_large_list_is_compressed_with_brotli_or_gzip():
+    _create_many_plants("compress", 50)
+    params = {"name_prefix": "compress"}
+    plain = client.get("/api/v1/plants", params=params, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    br = client.get("/api/v1/plants", params=params, headers={"Accept-Encoding": "br"})
+    assert br.headers["content-encoding"] == "br"
+    assert "accept-encoding" in br.headers["vary"].lower()
+    # TestClient (httpx) decodes the body for us; compare with the raw bytes too
+    assert br.content == plain.content
+    assert len(brotli.compress(plain.content)) < len(plain.content)
+
+    gz = client.get("/api/v1/plants", params=params, headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gz.content == plain.content
+    assert len(gzip.compress(plain.content)) < len(plain.content)
+
+
+def test_small_responses_are_not_compressed():
+    response = client.get("/api/v1/plants/id/999999", headers={"Accept-Encoding": "br, gzip"})
+    assert response.status_code == 404
+    assert "content-encoding" not in response.headers
+
+
+def test_landing_page_is_cacheable():
+    first = client.get("/")
+    second = client.get("/")
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "public, max-age=3600"
+    assert first.text == second.text
+    assert "Happy Gardening!" in first.text
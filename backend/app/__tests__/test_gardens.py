@@ -0,0 +1,158 @@
+from fastapi.testclient import TestClient
+
+from app import gardens
+from app.main import app
+from app.search import PlantSearchIndexes
+
+# This file tests gardens (tenants): every plant endpoint works on the garden
+# chosen with the X-Garden-ID header (see gardens.py), and never sees or
+# changes another garden's plants.
+
+client = TestClient(app)
+
+
+def new_garden(name: str) -> dict:
+    response = client.post("/api/v1/gardens", json={"name": name})
+    assert response.status_code == 201
+    return response.json()
+
+
+def in_garden(garden: dict) -> dict:
+    return {"X-Garden-ID": str(garden["id"])}
+
+
+def plant(name: str, description: str = "desc") -> dict:
+    return {"name": name, "description": description, "watering_schedule": "Daily"}
+
+
+def test_create_and_get_garden():
+    garden = new_garden("  Balcony  ")
+    assert garden["name"] == "Balcony"
+    assert garden["id"] > 1  # Garden 1 is the default garden
+    assert client.get(f"/api/v1/gardens/{garden['id']}").json() == garden
+    assert client.get("/api/v1/gardens/1").json()["id"] == 1
+    assert client.get("/api/v1/gardens/999999").status_code == 404
+
+
+def test_same_name_in_two_gardens():
+    first, second = new_garden("First"), new_garden("Second")
+    one = client.post("/api/v1/plants", json=plant("Shared Fern"), headers=in_garden(first))
+    two = client.post("/api/v1/plants", json=plant("shared fern"), headers=in_garden(second))
+    assert one.status_code == 200 and two.status_code == 200
+    assert one.json()["id"] != two.json()["id"]
+
+    # Names are still unique within one garden
+    again = client.post("/api/v1/plants", json=plant("SHARED FERN"), headers=in_garden(first))
+    assert again.status_code == 400
+
+    # Lookups by name find each garden's own plant
+    assert client.get("/api/v1/plants/name/shared fern", headers=in_garden(second)).json() == two.json()
+    assert client.get("/api/v1/plants/name/shared fern").status_code == 404  # Not in the default garden
+
+
+def test_plant_endpoints_only_see_their_garden():
+    garden, other = new_garden("Scoped"), new_garden("Other")
+    created = client.post("/api/v1/plants", json=plant("Scoped Tomato", "red fruit"), headers=in_garden(garden))
+    plant_id = created.json()["id"]
+    client.post("/api/v1/plants", json=plant("Other Basil"), headers=in_garden(other))
+
+    listed = client.get("/api/v1/plants", headers=in_garden(garden)).json()
+    assert [item["name"] for item in listed["items"]] == ["Scoped Tomato"]
+    exported = client.get("/api/v1/plants/export", headers=in_garden(garden)).text
+    assert "Scoped Tomato" in exported and "Other Basil" not in exported
+    assert [item["name"] for item in client.get(
+        "/api/v1/plants/search", params={"q": "tomato"}, headers=in_garden(garden)
+    ).json()] == ["Scoped Tomato"]
+    assert client.get("/api/v1/plants/search", params={"q": "tomato"}, headers=in_garden(other)).json() == []
+
+    # Another garden can neither read nor change the plant by its ID
+    assert client.get(f"/api/v1/plants/id/{plant_id}", headers=in_garden(other)).status_code == 404
+    assert client.put(
+        f"/api/v1/plants/id/{plant_id}", json=plant("Stolen"), headers=in_garden(other)
+    ).status_code == 404
+    assert client.post(f"/api/v1/plants/id/{plant_id}/watered", headers=in_garden(other)).status_code == 404
+    assert client.delete(f"/api/v1/plants/id/{plant_id}", headers=in_garden(other)).status_code == 404
+    batch = client.request("DELETE", "/api/v1/plants:batch", json={"ids": [plant_id]}, headers=in_garden(other))
+    assert batch.json()["failed"] == 1
+    batch = client.put(
+        "/api/v1/plants:batch", json={"items": [{**plant("Stolen"), "id": plant_id}]}, headers=in_garden(other)
+    )
+    assert batch.json()["results"][0]["error"] == "Plant not found"
+    assert client.get(f"/api/v1/plants/id/{plant_id}", headers=in_garden(garden)).json()["name"] == "Scoped Tomato"
+
+
+def test_list_etag_is_per_garden():
+    garden, other = new_garden("Etag"), new_garden("Etag other")
+    etag = client.get("/api/v1/plants", headers=in_garden(garden)).headers["etag"]
+    assert client.get("/api/v1/plants", headers=in_garden(other)).headers["etag"] != etag
+
+    # A write in another garden doesn't change this garden's list
+    client.post("/api/v1/plants", json=plant("Etag Plant"), headers=in_garden(other))
+    response = client.get("/api/v1/plants", headers={**in_garden(garden), "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_garden_query_parameter():
+    # EventSource can't send headers, so the garden can also be passed as ?garden_id=
+    garden = new_garden("Query")
+    client.post("/api/v1/plants", json=plant("Query Plant"), params={"garden_id": garden["id"]})
+    listed = client.get("/api/v1/plants", headers=in_garden(garden)).json()
+    assert [item["name"] for item in listed["items"]] == ["Query Plant"]
+
+    response = client.get("/api/v1/plants", params={"garden_id": garden["id"]}, headers={"X-Garden-ID": "1"})
+    assert response.status_code == 400
+    assert client.get("/api/v1/plants", headers={"X-Garden-ID": "0"}).status_code == 422
+
+
+def test_writes_to_unknown_garden_are_rejected():
+    missing = {"X-Garden-ID": "999999"}
+    response = client.post("/api/v1/plants", json=plant("Nowhere"), headers=missing)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Garden not found"
+    response = client.post("/api/v1/plants:batch", json={"items": [plant("Nowhere")]}, headers=missing)
+    assert response.status_code == 404
+
+
+def test_owned_gardens_are_only_visible_to_their_owner():
+    alice, bob = {"X-User-ID": "501"}, {"X-User-ID": "502"}
+    owned = client.post("/api/v1/gardens", json={"name": "Alice's"}, headers=alice).json()
+    assert owned["owner_id"] == 501
+    assert client.post("/api/v1/gardens", json={"name": "Alice's second"}, headers=alice).status_code == 201
+    created = client.post("/api/v1/plants", json=plant("Owned Rose"), headers={**alice, **in_garden(owned)})
+    assert created.status_code == 200
+
+    # The owner uses the garden as usual
+    listed = client.get("/api/v1/plants", headers={**alice, **in_garden(owned)}).json()
+    assert [item["name"] for item in listed["items"]] == ["Owned Rose"]
+    assert client.get(f"/api/v1/gardens/{owned['id']}", headers=alice).json() == owned
+
+    # Other users and anonymous clients get 404 from every endpoint, as if the garden didn't exist
+    for caller in (bob, {}):
+        headers = {**caller, **in_garden(owned)}
+        assert client.get(f"/api/v1/gardens/{owned['id']}", headers=caller).status_code == 404
+        assert client.get("/api/v1/plants", headers=headers).status_code == 404
+        assert client.get("/api/v1/plants", params={"garden_id": owned["id"]}, headers=caller).status_code == 404
+        assert client.get(f"/api/v1/plants/id/{created.json()['id']}", headers=headers).status_code == 404
+        assert client.post("/api/v1/plants", json=plant("Intruder"), headers=headers).status_code == 404
+        assert client.get("/api/v1/plants/sync", params={"since": 0}, headers=headers).status_code == 404
+
+    # A worker that didn't create the garden reads its owner from the database
+    gardens._garden_owners.clear()
+    assert client.get("/api/v1/plants", headers={**bob, **in_garden(owned)}).status_code == 404
+    assert client.get("/api/v1/plants", headers={**alice, **in_garden(owned)}).status_code == 200
+
+    # Gardens without an owner (like the default garden) stay shared
+    shared = new_garden("Shared")
+    assert shared["owner_id"] is None
+    assert client.get("/api/v1/plants", headers={**bob, **in_garden(shared)}).status_code == 200
+    assert client.get("/api/v1/plants", headers=bob).status_code == 200
+
+
+def test_search_indexes_keep_recent_gardens():
+    indexes = PlantSearchIndexes(max_gardens=2)
+    first = indexes.get(1)
+    indexes.get(2)
+    assert indexes.get(1) is first  # Using garden 1 makes garden 2 the least recently used
+    indexes.get(3)
+    assert len(indexes) == 2
+    assert indexes.get(1) is first
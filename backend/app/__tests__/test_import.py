@@ -0,0 +1,136 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app import bulk_import, changes, cli, database
+from app.main import app
+from app.routers.plant_router import PlantSchema
+
+# This file tests bulk imports of CSV / NDJSON files (see bulk_import.py), through
+# POST /api/v1/plants:import and "python -m app.cli import". Each test imports
+# into a new garden, so the plants of other tests never get in the way.
+
+client = TestClient(app)
+
+CSV_FILE = (
+    "id,name,description,watering_schedule\n"
+    '7,Rose,"Red,\nclimbing",Daily\n'  # A quoted field may contain a newline
+    ",rose,Same name,Daily\n"
+    "8,Basil,Herb,Every 3 days\n"
+    "9,Broken\n"
+    "10,Mint,,Twice a week\n"
+)
+
+
+def new_garden() -> dict:
+    garden = client.post("/api/v1/gardens", json={"name": "Import"}).json()
+    return {"X-Garden-ID": str(garden["id"])}
+
+
+def chunks(text: str, size: int = 5):
+    # Send the body in small pieces, so lines and characters are split across chunks
+    data = text.encode()
+    return iter([data[i:i + size] for i in range(0, len(data), size)])
+
+
+def names_in(garden: dict) -> list:
+    return sorted(item["name"] for item in client.get("/api/v1/plants", headers=garden).json()["items"])
+
+
+def test_csv_import_reports_rejected_rows():
+    garden = new_garden()
+    response = client.post("/api/v1/plants:import?format=csv", content=chunks(CSV_FILE), headers=garden)
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["received"], report["imported"], report["rejected"]) == (5, 3, 2)
+    assert report["errors"] == [
+        {"line": 4, "error": "Duplicate name within file"},
+        {"line": 6, "error": "Expected 4 fields, got 2"},
+    ]
+    assert names_in(garden) == ["Basil", "Mint", "Rose"]
+    rose = client.get("/api/v1/plants/name/rose", headers=garden).json()
+    assert rose["description"] == "Red,\nclimbing" and rose["id"] != 7  # IDs come from the database
+
+    # Importing the same file again creates nothing
+    report = client.post("/api/v1/plants:import?format=csv", content=CSV_FILE, headers=garden).json()
+    assert report["imported"] == 0
+    assert [error["error"] for error in report["errors"]].count("Plant with this name already exists") == 4
+
+
+def test_ndjson_import_uses_the_content_type():
+    garden = new_garden()
+    lines = [
+        json.dumps({"name": "Fern", "description": "Shade", "watering_schedule": "Daily"}),
+        "",
+        "not json",
+        json.dumps({"name": 5, "description": "", "watering_schedule": "Daily"}),
+        json.dumps(["a list"]),
+    ]
+    response = client.post(
+        "/api/v1/plants:import",
+        content="\n".join(lines),
+        headers={**garden, "Content-Type": "application/x-ndjson"},
+    )
+    report = response.json()
+    assert (report["imported"], report["rejected"]) == (1, 3)
+    assert [error["line"] for error in report["errors"]] == [3, 4, 5]
+    assert report["errors"][1]["error"].startswith("name:")
+    assert names_in(garden) == ["Fern"]
+
+
+def test_export_can_be_imported_into_another_garden():
+    source, target = new_garden(), new_garden()
+    client.post("/api/v1/plants:import?format=csv", content=CSV_FILE, headers=source)
+    for export_format in ("csv", "ndjson"):
+        exported = client.get(f"/api/v1/plants/export?format={export_format}", headers=source).text
+        report = client.post(f"/api/v1/plants:import?format={export_format}", content=exported, headers=target).json()
+        assert report["rejected"] == (3 if export_format == "ndjson" else 0)  # Second round: already there
+    assert names_in(target) == names_in(source)
+
+
+def test_unusable_files_are_rejected():
+    garden = new_garden()
+    missing_column = client.post("/api/v1/plants:import?format=csv", content="name,description\nA,B\n", headers=garden)
+    assert missing_column.status_code == 400
+    assert "watering_schedule" in missing_column.json()["detail"]
+    assert client.post("/api/v1/plants:import", content=CSV_FILE, headers=garden).status_code == 400  # No format
+    not_utf8 = client.post("/api/v1/plants:import?format=ndjson", content=b"\xff\xfe", headers=garden)
+    assert not_utf8.status_code == 400
+    unknown_garden = client.post(
+        "/api/v1/plants:import?format=csv", content=CSV_FILE, headers={"X-Garden-ID": "999999"}
+    )
+    assert unknown_garden.status_code == 404
+    assert names_in(garden) == []
+
+
+def test_import_works_in_small_batches():
+    garden_id = int(new_garden()["X-Garden-ID"])
+    lines = ["name,description,watering_schedule\n"] + [f"Plant {i},,Daily\n" for i in range(25)]
+    lines.append("plant 3,,Daily\n")  # Duplicate of a row from an earlier batch
+    with database.get_engine().begin() as connection:
+        report = bulk_import.import_plants(connection, lines, "csv", garden_id, PlantSchema, batch_size=4)
+    assert (report.received, report.imported, report.rejected) == (26, 25, 1)
+    assert report.errors == [(27, "Duplicate name within file")]
+
+
+def test_cli_import(tmp_path, capsys):
+    garden_id = new_garden()["X-Garden-ID"]
+    path = tmp_path / "plants.ndjson"
+    path.write_text(json.dumps({"name": "Cli Plant", "description": "", "watering_schedule": "Weekly"}) + "\n")
+    assert cli.main(["import", str(path), "--garden", garden_id]) == 0
+    assert json.loads(capsys.readouterr().out)["imported"] == 1
+    assert names_in({"X-Garden-ID": garden_id}) == ["Cli Plant"]
+
+
+def test_cli_import_only_notifies_servers_on_postgresql(tmp_path, monkeypatch, caplog):
+    # With PLANT_CHANGES_NOTIFY on, the CLI tells running servers about the import
+    # through PostgreSQL; on SQLite it can't, and says so
+    sent = []
+    monkeypatch.setenv("PLANT_CHANGES_NOTIFY", "true")
+    monkeypatch.setattr(changes, "notify_reset", lambda connection, garden_id: sent.append(garden_id))
+    garden_id = new_garden()["X-Garden-ID"]
+    path = tmp_path / "plants.ndjson"
+    path.write_text(json.dumps({"name": "Cli Notify", "description": "", "watering_schedule": "Weekly"}) + "\n")
+    assert cli.import_file(str(path), int(garden_id))["imported"] == 1
+    assert sent == []
+    assert "servers are not told about the import" in caplog.text
@@ -0,0 +1,65 @@
+import importlib
+import io
+import json
+import logging
+
+import pytest
+
+from app.logging_config import JSONFormatter, configure_logging, shutdown_logging
+
+# This file contains tests for the logging setup (logging_config.py).
+
+
+@pytest.fixture
+def restore_logging():
+    # Put the app's default logging configuration back after each test
+    yield
+    configure_logging()
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, "Added %s", ("Basil",), None)
+    record.plant_id = 7
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app.test"
+    assert entry["message"] == "Added Basil"
+    assert entry["plant_id"] == 7
+
+
+def test_queued_logging_writes_json_lines(restore_logging):
+    stream = io.StringIO()
+    configure_logging(level="INFO", log_format="json", use_queue=True, stream=stream)
+    logger = logging.getLogger("app.test")
+    logger.debug("hidden %s", "value")
+    logger.info("Deleted plant %s", 3, extra={"plant_id": 3})
+    shutdown_logging()  # Waits for the background thread to write everything
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["message"] for line in lines] == ["Deleted plant 3"]
+    assert lines[0]["plant_id"] == 3
+
+
+def test_debug_arguments_are_not_formatted_when_disabled(restore_logging):
+    configure_logging(level="INFO", use_queue=False, stream=io.StringIO())
+
+    class Explodes:
+        def __str__(self):
+            raise AssertionError("formatted a disabled debug message")
+
+    logging.getLogger("app.test").debug("value: %s", Explodes())
+
+
+def test_configure_logging_rejects_unknown_level():
+    with pytest.raises(ValueError):
+        configure_logging(level="CHATTY")
+
+
+def test_router_does_not_configure_root_logger():
+    # Importing the router must not add handlers of its own to the root logger
+    importlib.import_module("app.routers.plant_router")
+
+    root = logging.getLogger()
+    assert all(
+        getattr(handler, "_app_handler", False) or "pytest" in type(handler).__module__ for handler in root.handlers
+    )
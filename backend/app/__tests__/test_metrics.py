@@ -0,0 +1,84 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.metrics import Histogram, PoolMetrics
+
+# This file contains tests for the metrics endpoints and the counters behind them.
+
+client = TestClient(app)
+
+
+def test_pool_metrics_endpoint():
+    # Make a request that uses the database, then read the pool telemetry
+    client.get("/api/v1/plants")
+    response = client.get("/metrics/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["settings"]["pool_size"] == 5  # Default when DATABASE_POOL_SIZE is not set
+    assert data["events"]["checkouts"] >= 1
+    assert "sync" in data["pools"]
+
+
+def test_pool_metrics_records_waits_and_overflow():
+    # Test the counters directly with known values
+    metrics = PoolMetrics()
+    metrics.record_checkout(0.0005, overflow=-3)
+    metrics.record_checkout(2.0, overflow=2)
+    metrics.record_timeout()
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 2
+    assert snapshot["checkout_wait_seconds"]["max"] == 2.0
+    assert snapshot["checkout_wait_seconds"]["buckets"]["0.001"] == 1
+    assert snapshot["checkout_wait_seconds"]["buckets"]["5.0"] == 1
+    assert snapshot["overflow_checkouts"] == 1
+    assert snapshot["max_overflow_in_use"] == 2
+    assert snapshot["timeouts"] == 1
+
+
+def test_health_and_ready():
+    assert client.get("/health").json() == {"status": "ok"}
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+
+def test_prometheus_metrics_are_labelled_by_route_template():
+    created = client.post(
+        "/api/v1/plants",
+        json={"name": "MetricsPlant", "description": "desc", "watering_schedule": "Weekly"},
+    ).json()
+    client.get(f"/api/v1/plants/id/{created['id']}")
+    client.get("/no/such/page")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    route = 'method="GET",route="/api/v1/plants/id/{plant_id}"'
+    assert f'http_requests_total{{{route},status="200"}}' in text
+    assert f"http_request_duration_seconds_count{{{route}}}" in text
+    assert f"http_response_size_bytes_count{{{route}}}" in text
+    assert 'route="<unmatched>",status="404"' in text
+    assert "http_requests_in_flight 1" in text  # The /metrics request itself
+    # The POST ran at least one query, and it was attributed to its route
+    post_queries = next(
+        line for line in text.splitlines()
+        if line.startswith('http_request_db_queries_sum{method="POST",route="/api/v1/plants"}')
+    )
+    assert float(post_queries.split()[-1]) >= 1
+    assert "db_queries_total" in text
+    assert "db_pool_checkouts_total" in text
+    assert "plant_cache_hits_total" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Test.", ("route",), (0.1, 1.0))
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 5.0)
+    lines = histogram.render()
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'test_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{route="/a"} 3' in lines
+    assert histogram.count(("/a",)) == 3
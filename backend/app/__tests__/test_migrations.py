@@ -0,0 +1,106 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+
+# This file checks that the Alembic migrations in backend/migrations/ apply cleanly
+# to an empty database and produce the schema the application expects.
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def make_config(database_url):
+    # Point Alembic at a throwaway database instead of DATABASE_URL
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["database_url"] = database_url
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def test_migrations_upgrade_and_downgrade(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    config = make_config(database_url)
+
+    command.upgrade(config, "head")
+    inspector = inspect(create_engine(database_url))
+    columns = {column["name"] for column in inspector.get_columns("plants")}
+    assert {"id", "name", "name_normalized", "description", "watering_schedule", "updated_at"} <= columns
+    assert {"watering_interval_hours", "last_watered", "next_due", "garden_id", "row_version"} <= columns
+    assert inspector.has_table("plant_tombstones")
+    unique_indexes = {index["name"] for index in inspector.get_indexes("plants") if index["unique"]}
+    assert unique_indexes == {"ix_plants_garden_name"}
+    [foreign_key] = inspector.get_foreign_keys("plants")
+    assert (foreign_key["referred_table"], foreign_key["constrained_columns"]) == ("gardens", ["garden_id"])
+    [owner_key] = inspector.get_foreign_keys("gardens")
+    assert (owner_key["referred_table"], owner_key["constrained_columns"]) == ("users", ["owner_id"])
+
+    # Every migration must also be reversible
+    command.downgrade(config, "base")
+    inspector = inspect(create_engine(database_url))
+    assert not inspector.has_table("plants")
+    assert not inspector.has_table("gardens")
+    assert not inspector.has_table("users")
+    assert not inspector.has_table("plant_tombstones")
+
+
+def test_watering_schedule_backfill(tmp_path):
+    # Plants that exist before migration 0005 get their schedule parsed and a due date
+    database_url = f"sqlite:///{tmp_path / 'backfill.db'}"
+    config = make_config(database_url)
+    command.upgrade(config, "0004")
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO plants (name, name_normalized, description, watering_schedule) VALUES "
+            "('Fern', 'fern', 'desc', 'Every 3 days'), ('Cactus', 'cactus', 'desc', 'When dry')"
+        ))
+
+    command.upgrade(config, "head")
+    with engine.connect() as connection:
+        rows = dict(connection.execute(text(
+            "SELECT name, watering_interval_hours FROM plants WHERE next_due IS NOT NULL"
+        )).all())
+    assert rows == {"Fern": 72}  # "When dry" is not understood, so it gets no due date
+
+
+def test_existing_plants_move_to_default_garden(tmp_path):
+    # Plants that exist before migration 0006 belong to garden 1; names are then unique per garden
+    database_url = f"sqlite:///{tmp_path / 'gardens.db'}"
+    config = make_config(database_url)
+    command.upgrade(config, "0005")
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO plants (name, name_normalized, description, watering_schedule) "
+            "VALUES ('Fern', 'fern', 'desc', 'Daily')"
+        ))
+
+    command.upgrade(config, "head")
+    with engine.begin() as connection:
+        assert connection.execute(text("SELECT garden_id FROM plants")).scalar_one() == 1
+        connection.execute(text("INSERT INTO gardens (id, name, created_at) VALUES (2, 'Other', CURRENT_TIMESTAMP)"))
+        connection.execute(text(
+            "INSERT INTO plants (garden_id, name, name_normalized, description, watering_schedule) "
+            "VALUES (2, 'Fern', 'fern', 'desc', 'Daily')"
+        ))
+        assert connection.execute(text("SELECT count(*) FROM plants WHERE name_normalized = 'fern'")).scalar_one() == 2
+
+
+def test_row_version_backfill(tmp_path):
+    # Plants that exist before migration 0007 get a version, and each garden's counter starts above them
+    database_url = f"sqlite:///{tmp_path / 'versions.db'}"
+    config = make_config(database_url)
+    command.upgrade(config, "0006")
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO gardens (id, name, created_at) VALUES (2, 'Empty', CURRENT_TIMESTAMP)"))
+        connection.execute(text(
+            "INSERT INTO plants (id, garden_id, name, name_normalized, description, watering_schedule) "
+            "VALUES (3, 1, 'Fern', 'fern', 'desc', 'Daily'), (8, 1, 'Moss', 'moss', 'desc', 'Daily')"
+        ))
+
+    command.upgrade(config, "head")
+    with engine.connect() as connection:
+        assert dict(connection.execute(text("SELECT name, row_version FROM plants")).all()) == {"Fern": 3, "Moss": 8}
+        assert dict(connection.execute(text("SELECT id, row_version FROM gardens")).all()) == {1: 8, 2: 0}
@@ -1,5 +1,14 @@
+import csv
+import io
+import json
+
+from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
 from app.main import app
+from app.routers.plant_router import PlantPage
+from app.search import PlantSearchIndex
 
 # This file contains tests for the plant API endpoints using FastAPI's TestClient.
 # Each test function simulates a client making requests to the API and checks the responses.
@@ -8,6 +17,13 @@ from app.main import app
 client = TestClient(app)
 
 
+def query_count(response):
+    # Number of SQL statements the request ran, from the Server-Timing header
+    # added by SQL profiling (enabled for the tests in conftest.py)
+    db_entry = response.headers["server-timing"].split(",")[0]
+    return int(db_entry.split('desc="')[1].split()[0])
+
+
 def test_create_plant_success():
     # Test creating a new plant (POST request)
     response = client.post(
@@ -40,20 +56,366 @@ def test_create_plant_duplicate_name():
     assert "already exists" in response.json()["detail"].lower()
 
 
+def test_create_plant_duplicate_name_case_insensitive():
+    # Test that names differing only in case or surrounding spaces count as duplicates
+    client.post(
+        "/api/v1/plants",
+        json={"name": "TestPlantCase", "description": "desc", "watering_schedule": "Daily"}
+    )
+    response = client.post(
+        "/api/v1/plants",
+        json={"name": "  testplantCASE ", "description": "desc", "watering_schedule": "Daily"}
+    )
+    assert response.status_code == 400
+    assert "already exists" in response.json()["detail"].lower()
+
+
 def test_get_plants():
-    # Test retrieving all plants (GET request)
+    # Test retrieving all plants with the legacy unpaginated opt-in (GET request)
     # Ensure at least one plant exists
     client.post(
         "/api/v1/plants",
         json={"name": "TestPlantGet", "description": "desc", "watering_schedule": "Every 3 days"}
     )
-    response = client.get("/api/v1/plants")
+    response = client.get("/api/v1/plants", params={"all": "true"})
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)  # The response should be a list
     assert any(plant["name"] == "TestPlantGet" and plant["watering_schedule"] == "Every 3 days" for plant in data)
 
 
+def test_get_plants_paginated():
+    # Test walking the plant list one page at a time using next_cursor
+    for i in range(3):
+        client.post(
+            "/api/v1/plants",
+            json={"name": f"PagePlant{i}", "description": "desc", "watering_schedule": "Weekly"}
+        )
+    response = client.get("/api/v1/plants", params={"limit": 2, "name_prefix": "pageplant"})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert [plant["name"] for plant in first_page["items"]] == ["PagePlant0", "PagePlant1"]
+    assert first_page["next_cursor"] == first_page["items"][-1]["id"]
+
+    response = client.get(
+        "/api/v1/plants",
+        params={"limit": 2, "name_prefix": "pageplant", "after": first_page["next_cursor"]},
+    )
+    second_page = response.json()
+    assert [plant["name"] for plant in second_page["items"]] == ["PagePlant2"]
+    assert second_page["next_cursor"] is None  # No more pages
+
+
+def test_get_plants_filter_by_watering_schedule():
+    # Test the server-side watering schedule filter
+    client.post(
+        "/api/v1/plants",
+        json={"name": "FilterPlant", "description": "desc", "watering_schedule": "Every 9 days"}
+    )
+    response = client.get("/api/v1/plants", params={"watering_schedule": "Every 9 days"})
+    assert response.status_code == 200
+    assert [plant["name"] for plant in response.json()["items"]] == ["FilterPlant"]
+
+
+def test_get_plants_limit_too_large():
+    # Test that a page size above the maximum is rejected
+    response = client.get("/api/v1/plants", params={"limit": 100000})
+    assert response.status_code == 422
+
+
+def test_export_plants_ndjson():
+    # Test streaming the plants table as newline-delimited JSON
+    client.post(
+        "/api/v1/plants",
+        json={"name": "ExportPlant", "description": "desc, with comma", "watering_schedule": "Daily"}
+    )
+    response = client.get("/api/v1/plants/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    exported = next(row for row in rows if row["name"] == "ExportPlant")
+    assert exported["description"] == "desc, with comma"
+    assert set(exported) == {"id", "name", "description", "watering_schedule"}
+
+
+def test_export_plants_csv():
+    # Test streaming the plants table as CSV with a header row
+    client.post(
+        "/api/v1/plants",
+        json={"name": "ExportPlantCsv", "description": "desc, with comma", "watering_schedule": "Daily"}
+    )
+    response = client.get("/api/v1/plants/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    exported = next(row for row in rows if row["name"] == "ExportPlantCsv")
+    assert exported["description"] == "desc, with comma"
+    assert exported["watering_schedule"] == "Daily"
+
+
+def test_add_plants_batch():
+    # Test creating many plants at once, with duplicates reported per item
+    client.post(
+        "/api/v1/plants",
+        json={"name": "BatchExisting", "description": "desc", "watering_schedule": "Weekly"}
+    )
+    response = client.post(
+        "/api/v1/plants:batch",
+        json={
+            "items": [
+                {"name": "BatchA", "description": "desc", "watering_schedule": "Weekly"},
+                {"name": "batchexisting", "description": "desc", "watering_schedule": "Weekly"},
+                {"name": "BatchB", "description": "desc", "watering_schedule": "Daily"},
+                {"name": "BATCHA", "description": "desc", "watering_schedule": "Daily"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [result["status"] for result in data["results"]] == ["created", "error", "created", "error"]
+    assert data["succeeded"] == 2
+    assert data["failed"] == 2
+    assert "already exists" in data["results"][1]["error"]
+
+    # The created plants are really in the database with the returned IDs
+    listing = client.get("/api/v1/plants", params={"name_prefix": "batch"}).json()["items"]
+    ids_by_name = {plant["name"]: plant["id"] for plant in listing}
+    assert ids_by_name["BatchA"] == data["results"][0]["id"]
+    assert ids_by_name["BatchB"] == data["results"][2]["id"]
+
+
+def test_update_plants_batch():
+    # Test updating many plants at once by ID
+    created = client.post(
+        "/api/v1/plants:batch",
+        json={
+            "items": [
+                {"name": "BatchUpd1", "description": "desc", "watering_schedule": "Weekly"},
+                {"name": "BatchUpd2", "description": "desc", "watering_schedule": "Weekly"},
+            ]
+        },
+    ).json()
+    first_id, second_id = [result["id"] for result in created["results"]]
+    response = client.put(
+        "/api/v1/plants:batch",
+        json={
+            "items": [
+                {"id": first_id, "name": "BatchUpd1", "description": "new", "watering_schedule": "Daily"},
+                {"id": second_id, "name": "batchupd1", "description": "new", "watering_schedule": "Daily"},
+                {"id": 999999, "name": "BatchUpdMissing", "description": "new", "watering_schedule": "Daily"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["updated", "error", "error"]
+    assert results[2]["error"] == "Plant not found"
+
+    listing = client.get("/api/v1/plants", params={"name_prefix": "batchupd1"}).json()["items"]
+    assert listing[0]["description"] == "new"
+
+
+def test_delete_plants_batch():
+    # Test deleting many plants at once by ID
+    created = client.post(
+        "/api/v1/plants:batch",
+        json={
+            "items": [
+                {"name": "BatchDel1", "description": "desc", "watering_schedule": "Weekly"},
+                {"name": "BatchDel2", "description": "desc", "watering_schedule": "Weekly"},
+            ]
+        },
+    ).json()
+    ids = [result["id"] for result in created["results"]]
+    response = client.request("DELETE", "/api/v1/plants:batch", json={"ids": ids + [999999]})
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()["results"]] == ["deleted", "deleted", "error"]
+    assert client.get("/api/v1/plants", params={"name_prefix": "batchdel"}).json()["items"] == []
+
+
+def test_get_plant_by_id_and_name():
+    # Test reading a single plant by ID and by (case-insensitive) name
+    create = client.post(
+        "/api/v1/plants",
+        json={"name": "SinglePlant", "description": "desc", "watering_schedule": "Weekly"}
+    )
+    plant_id = create.json()["id"]
+    by_id = client.get(f"/api/v1/plants/id/{plant_id}")
+    assert by_id.status_code == 200
+    assert by_id.json()["name"] == "SinglePlant"
+    by_name = client.get("/api/v1/plants/name/singleplant")
+    assert by_name.status_code == 200
+    assert by_name.json()["id"] == plant_id
+    assert client.get("/api/v1/plants/id/999999").status_code == 404
+
+
+def test_get_plants_sparse_fields():
+    # Test that fields= returns only the requested fields (plus id, the cursor)
+    for i in range(3):
+        client.post(
+            "/api/v1/plants",
+            json={"name": f"SparsePlant{i}", "description": "long text", "watering_schedule": "Weekly"}
+        )
+    response = client.get("/api/v1/plants", params={"fields": "name", "limit": 2, "name_prefix": "sparseplant"})
+    assert response.status_code == 200
+    page = response.json()
+    assert [set(plant) for plant in page["items"]] == [{"name", "id"}, {"name", "id"}]
+    next_page = client.get(
+        "/api/v1/plants",
+        params={"fields": "id,name", "limit": 2, "name_prefix": "sparseplant", "after": page["next_cursor"]},
+    ).json()
+    assert [plant["name"] for plant in next_page["items"]] == ["SparsePlant2"]
+
+    # The full plant is still returned without fields=, and unknown fields are rejected
+    full = client.get("/api/v1/plants", params={"name_prefix": "sparseplant"}).json()
+    assert full["items"][0]["description"] == "long text"
+    response = client.get("/api/v1/plants", params={"fields": "name,garden_id"})
+    assert response.status_code == 422
+    assert "garden_id" in response.json()["detail"]
+
+
+def matches_schema(value, schema: dict, components: dict) -> bool:
+    # A small JSON Schema check for the OpenAPI schema of a response: types,
+    # required and known properties, anyOf and $ref are all the plant schemas use
+    if "$ref" in schema:
+        return matches_schema(value, components[schema["$ref"].split("/")[-1]], components)
+    if "anyOf" in schema:
+        return any(matches_schema(value, option, components) for option in schema["anyOf"])
+    kind = schema.get("type")
+    if kind == "object":
+        properties = schema.get("properties", {})
+        return (
+            isinstance(value, dict)
+            and set(schema.get("required", [])) <= set(value)
+            and set(value) <= set(properties)
+            and all(matches_schema(value[key], properties[key], components) for key in value)
+        )
+    if kind == "array":
+        return isinstance(value, list) and all(matches_schema(item, schema["items"], components) for item in value)
+    python_types = {"string": str, "integer": int, "boolean": bool, "null": type(None)}
+    return kind is None or isinstance(value, python_types[kind])
+
+
+def test_get_plants_sparse_fields_match_the_published_schema():
+    # Test that fields= responses are valid against the OpenAPI schema clients generate code from
+    client.post("/api/v1/plants", json={"name": "SchemaPlant", "description": "d", "watering_schedule": "Weekly"})
+    openapi = client.get("/openapi.json").json()
+    components = openapi["components"]["schemas"]
+    response_schema = openapi["paths"]["/api/v1/plants"]["get"]["responses"]["200"]["content"]["application/json"]
+    for params in ({"fields": "id,name"}, {"fields": "id"}, {"fields": "name", "all": "true"}, {}):
+        body = client.get("/api/v1/plants", params={**params, "name_prefix": "schemaplant"}).json()
+        assert matches_schema(body, response_schema["schema"], components), params
+    # The item schema only requires the field that is always sent
+    assert components["PlantFields"]["required"] == ["id"]
+
+
+def test_get_plants_by_ids():
+    # Test fetching several known plants in one request (one IN query)
+    response = client.post(
+        "/api/v1/plants:batch",
+        json={"items": [
+            {"name": f"MultiGet{i}", "description": "desc", "watering_schedule": "Weekly"} for i in range(3)
+        ]},
+    )
+    first, _, third = [result["id"] for result in response.json()["results"]]
+    response = client.get("/api/v1/plants", params={"ids": f"{third},{first},999999,{first}"})
+    assert response.status_code == 200
+    assert [plant["name"] for plant in response.json()["items"]] == ["MultiGet0", "MultiGet2"]
+    assert query_count(response) == 2  # Version + one IN query
+
+    both = client.get("/api/v1/plants", params={"ids": f"{first},{third}", "fields": "name"}).json()
+    assert both["items"] == [{"name": "MultiGet0", "id": first}, {"name": "MultiGet2", "id": third}]
+    assert client.get("/api/v1/plants", params={"ids": "1,two"}).status_code == 422
+    assert client.get("/api/v1/plants", params={"ids": ",".join(str(i) for i in range(1, 1002))}).status_code == 422
+
+
+def test_cached_reads_are_invalidated_by_writes():
+    # Test that repeated reads hit the cache and a write makes the next read fresh
+    create = client.post(
+        "/api/v1/plants",
+        json={"name": "CachedPlant", "description": "before", "watering_schedule": "Weekly"}
+    )
+    plant_id = create.json()["id"]
+    client.get(f"/api/v1/plants/id/{plant_id}")
+    hits_before = client.get("/metrics/cache").json()["hits"]
+    assert client.get(f"/api/v1/plants/id/{plant_id}").json()["description"] == "before"
+    assert client.get("/metrics/cache").json()["hits"] == hits_before + 1
+
+    client.put(
+        f"/api/v1/plants/id/{plant_id}",
+        json={"name": "CachedPlant", "description": "after", "watering_schedule": "Weekly"},
+    )
+    assert client.get(f"/api/v1/plants/id/{plant_id}").json()["description"] == "after"
+    listing = client.get("/api/v1/plants", params={"name_prefix": "cachedplant"}).json()
+    assert listing["items"][0]["description"] == "after"
+
+
+def test_get_plants_conditional_request():
+    # Test that an unchanged plant list answers 304 Not Modified to If-None-Match
+    client.post(
+        "/api/v1/plants",
+        json={"name": "EtagPlant", "description": "desc", "watering_schedule": "Weekly"}
+    )
+    first = client.get("/api/v1/plants")
+    etag = first.headers["etag"]
+    assert "last-modified" in first.headers
+
+    cached = client.get("/api/v1/plants", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    # Any write changes the collection ETag
+    client.post(
+        "/api/v1/plants",
+        json={"name": "EtagPlant2", "description": "desc", "watering_schedule": "Weekly"}
+    )
+    changed = client.get("/api/v1/plants", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_get_plant_by_id_conditional_request():
+    # Test ETag and Last-Modified handling on a single plant
+    create = client.post(
+        "/api/v1/plants",
+        json={"name": "EtagSingle", "description": "desc", "watering_schedule": "Weekly"}
+    )
+    plant_id = create.json()["id"]
+    first = client.get(f"/api/v1/plants/id/{plant_id}")
+    assert client.get(
+        f"/api/v1/plants/id/{plant_id}", headers={"If-None-Match": first.headers["etag"]}
+    ).status_code == 304
+    assert client.get(
+        f"/api/v1/plants/id/{plant_id}", headers={"If-Modified-Since": first.headers["last-modified"]}
+    ).status_code == 304
+
+    client.put(
+        f"/api/v1/plants/id/{plant_id}",
+        json={"name": "EtagSingle", "description": "changed", "watering_schedule": "Weekly"},
+    )
+    after_update = client.get(f"/api/v1/plants/id/{plant_id}", headers={"If-None-Match": first.headers["etag"]})
+    assert after_update.status_code == 200
+    assert after_update.json()["description"] == "changed"
+
+
+def test_get_plants_fast_path_matches_response_model_bytes():
+    # Test that the fast JSON list encoding is byte-identical to FastAPI's response_model path
+    client.post(
+        "/api/v1/plants",
+        json={
+            "name": "FastJson Rosé 🌱",
+            "description": 'quotes " backslash \\ newline \n tab \t control \u0001 sep \u2028',
+            "watering_schedule": "Weekly",
+        },
+    )
+    response = client.get("/api/v1/plants", params={"name_prefix": "fastjson"})
+    adapter = TypeAdapter(PlantPage)
+    validated = adapter.validate_python(response.json())
+    expected = JSONResponse(content=adapter.dump_python(validated, mode="json")).body
+    assert response.content == expected
+    assert response.json()["items"][0]["name"] == "FastJson Rosé 🌱"
+
+
 def test_update_plant_by_id_success():
     # Test updating a plant by its ID (PUT request)
     create = client.post(
@@ -89,6 +451,38 @@ def test_update_plant_by_name_success():
     assert data["watering_schedule"] == "Every 2 weeks"
 
 
+def test_update_plant_by_id_name_conflict():
+    # Test that renaming a plant onto another plant's name is rejected
+    client.post(
+        "/api/v1/plants",
+        json={"name": "ConflictTarget", "description": "desc", "watering_schedule": "Weekly"}
+    )
+    create = client.post(
+        "/api/v1/plants",
+        json={"name": "ConflictSource", "description": "desc", "watering_schedule": "Weekly"}
+    )
+    response = client.put(
+        f"/api/v1/plants/id/{create.json()['id']}",
+        json={"name": "conflicttarget", "description": "desc", "watering_schedule": "Weekly"},
+    )
+    assert response.status_code == 400
+    assert "already exists" in response.json()["detail"].lower()
+
+
+def test_update_plant_by_name_case_insensitive():
+    # Test that plants can be looked up by name regardless of letter case
+    client.post(
+        "/api/v1/plants",
+        json={"name": "CaseLookup", "description": "desc", "watering_schedule": "Weekly"}
+    )
+    response = client.put(
+        "/api/v1/plants/name/caselookup",
+        json={"name": "CaseLookup", "description": "changed", "watering_schedule": "Weekly"},
+    )
+    assert response.status_code == 200
+    assert response.json()["description"] == "changed"
+
+
 def test_update_nonexistent_plant_by_id():
     # Test updating a plant that does not exist by ID
     response = client.put(
@@ -138,3 +532,173 @@ def test_delete_nonexistent_plant_by_name():
     # Test deleting a plant that does not exist by name
     response = client.delete("/api/v1/plants/name/NoSuchPlant")
     assert response.status_code == 404  # Should return 404 Not Found
+
+
+def test_write_round_trips():
+    # Regression guard: each single-plant write makes a fixed number of database round trips
+    response = client.post(
+        "/api/v1/plants",
+        json={"name": "RoundTrips", "description": "desc", "watering_schedule": "Weekly"}
+    )
+    assert query_count(response) == 2  # Claim a row_version, INSERT ... RETURNING
+    plant_id = response.json()["id"]
+
+    response = client.put(
+        f"/api/v1/plants/id/{plant_id}",
+        json={"name": "RoundTrips", "description": "new", "watering_schedule": "Daily"}
+    )
+    assert query_count(response) == 2  # Claim a row_version, UPDATE ... RETURNING
+
+    response = client.delete(f"/api/v1/plants/id/{plant_id}")
+    assert query_count(response) == 3  # Claim a row_version, DELETE ... RETURNING id, tombstone
+
+    response = client.get(f"/api/v1/plants/id/{plant_id}")
+    assert response.status_code == 404
+    assert query_count(response) == 1
+
+
+def search(query, **params):
+    response = client.get("/api/v1/plants/search", params={"q": query, **params})
+    assert response.status_code == 200
+    return [plant["name"] for plant in response.json()]
+
+
+def test_search_plants():
+    # Test that search finds partial and misspelled names, and words in descriptions
+    client.post(
+        "/api/v1/plants:batch",
+        json={"items": [
+            {"name": "Searchable Tomato", "description": "Red fruit for sauces", "watering_schedule": "Daily"},
+            {"name": "Searchable Basil", "description": "Herb that pairs with tomato", "watering_schedule": "Daily"},
+            {"name": "Searchable Fern", "description": "Likes deep shade", "watering_schedule": "Weekly"},
+        ]},
+    )
+    assert search("searchable toma")[0] == "Searchable Tomato"  # Partial name
+    assert search("serchable fern")[0] == "Searchable Fern"  # Typo
+    assert search("deep shade") == ["Searchable Fern"]  # Every description word must match
+
+    # A name match ranks above a plant that only mentions the query in its description
+    results = search("tomato")
+    assert results.index("Searchable Tomato") < results.index("Searchable Basil")
+
+    response = client.get("/api/v1/plants/search", params={"q": "searchable", "limit": 2})
+    assert len(response.json()) == 2
+    assert response.json()[0]["score"] >= response.json()[1]["score"]
+
+
+def test_search_plants_sees_writes(monkeypatch):
+    # Test that the search index picks up new, changed and deleted plants
+    assert search("Zucchinisearch") == []
+
+    # Once built, the index is updated with each write instead of being rebuilt
+    builds = []
+    original_build = PlantSearchIndex.build
+
+    def counting_build(index, rows, version):
+        builds.append(version)
+        original_build(index, rows, version)
+
+    monkeypatch.setattr(PlantSearchIndex, "build", counting_build)
+    response = client.post(
+        "/api/v1/plants",
+        json={"name": "Zucchinisearch", "description": "desc", "watering_schedule": "Daily"}
+    )
+    plant_id = response.json()["id"]
+    assert search("Zucchinisearch") == ["Zucchinisearch"]
+
+    client.put(
+        f"/api/v1/plants/id/{plant_id}",
+        json={"name": "Courgettesearch", "description": "Grows very quickly", "watering_schedule": "Daily"}
+    )
+    assert search("grows very quickly") == ["Courgettesearch"]
+    assert search("Zucchinisearch") == []  # The old name and description no longer match
+    assert "Courgettesearch" not in search("desc")
+
+    client.delete(f"/api/v1/plants/id/{plant_id}")
+    assert search("Courgettesearch") == []
+    assert search("grows very quickly") == []
+    assert builds == []
+
+
+def test_search_index_changes_match_a_rebuild():
+    # Test that applying changes to an index gives the same results as building it from scratch
+    rows = {1: ("red rose", "climbs walls"), 2: ("white rose", "climbs fences"), 3: ("tomato", "red fruit")}
+    index = PlantSearchIndex()
+    index.build([(plant_id, name, description) for plant_id, (name, description) in rows.items()], version=3)
+    changes = [
+        (4, "rosemary", "herb for walls"),  # Added, with a new name word
+        (1, "red climbing rose", "climbs fences"),  # Renamed and described differently
+        (3, None, None),  # Deleted
+        (3, "cherry tomato", "small red fruit"),  # ID reused by a new plant
+        (2, "white rose", "tall"),  # Description changed twice
+        (2, "white rose", "climbs walls"),
+    ]
+    index.apply_changes(changes, version=9)
+    for plant_id, name, description in changes:
+        if name is None:
+            rows.pop(plant_id)
+        else:
+            rows[plant_id] = (name, description)
+    rebuilt = PlantSearchIndex()
+    rebuilt.build([(plant_id, name, description) for plant_id, (name, description) in rows.items()], version=9)
+
+    assert index.version == 9
+    for query in ["rose", "ro", "climbs walls", "climbs fences", "red", "tomato", "tomatoe", "fruit", "tall", "herb"]:
+        assert index.search(query, 10) == rebuilt.search(query, 10), query
+
+
+def test_search_plants_requires_query():
+    # Test that an empty or blank search is rejected
+    assert client.get("/api/v1/plants/search", params={"q": ""}).status_code == 422
+    assert client.get("/api/v1/plants/search", params={"q": "   "}).status_code == 422
+    assert client.get("/api/v1/plants/search").status_code == 422
+
+
+def test_watering_schedule_and_due_plants():
+    # Test that new plants get a due date from their schedule and that watering moves it
+    response = client.post(
+        "/api/v1/plants",
+        json={"name": "DueFern", "description": "desc", "watering_schedule": "Every 2 days"}
+    )
+    plant_id = response.json()["id"]
+
+    due = client.get("/api/v1/plants/due", params={"before": "2100-01-01T00:00:00Z", "limit": 1000}).json()
+    fern = next(plant for plant in due if plant["id"] == plant_id)
+    assert fern["watering_interval_hours"] == 48
+    assert fern["last_watered"] is None
+    # Not due yet right now (the first due date is one interval after creation)
+    assert plant_id not in [plant["id"] for plant in client.get("/api/v1/plants/due").json()]
+
+    response = client.post(f"/api/v1/plants/id/{plant_id}/watered", json={"watered_at": "2026-05-01T08:00:00+02:00"})
+    assert response.status_code == 200
+    assert query_count(response) == 2  # Claim a row_version, UPDATE ... RETURNING
+    assert response.json()["last_watered"].startswith("2026-05-01T06:00:00")
+    assert response.json()["next_due"].startswith("2026-05-03T06:00:00")
+
+    # Due dates are compared in UTC
+    due = client.get("/api/v1/plants/due", params={"before": "2026-05-03T06:00:00Z"}).json()
+    assert plant_id in [plant["id"] for plant in due]
+    due = client.get("/api/v1/plants/due", params={"before": "2026-05-03T05:59:00Z"}).json()
+    assert plant_id not in [plant["id"] for plant in due]
+
+    # Editing the description keeps the due date; changing the schedule counts from the last watering
+    client.put(
+        f"/api/v1/plants/id/{plant_id}",
+        json={"name": "DueFern", "description": "new desc", "watering_schedule": "Every 2 days"}
+    )
+    response = client.post("/api/v1/plants/name/duefern/watered", json={"watered_at": "2026-05-01T06:00:00Z"})
+    assert response.json()["next_due"].startswith("2026-05-03T06:00:00")
+    client.put(
+        "/api/v1/plants:batch",
+        json={"items": [{"id": plant_id, "name": "DueFern", "description": "d", "watering_schedule": "Weekly"}]}
+    )
+    due = client.get("/api/v1/plants/due", params={"before": "2026-05-08T06:00:00Z"}).json()
+    fern = next(plant for plant in due if plant["id"] == plant_id)
+    assert fern["watering_interval_hours"] == 168
+    assert fern["next_due"].startswith("2026-05-08T06:00:00")
+
+
+def test_water_nonexistent_plant():
+    # Test that watering a plant that does not exist returns 404
+    assert client.post("/api/v1/plants/id/999999/watered").status_code == 404
+    assert client.post("/api/v1/plants/name/NoSuchPlant/watered").status_code == 404
@@ -0,0 +1,28 @@
+from app import profiling
+from app.metrics import QueryStats
+
+# This file contains unit tests for SQL profiling and query budgets (profiling.py).
+# The API tests exercise the same code: conftest.py enables profiling and fails
+# any test whose requests go over their route's query budget.
+
+
+def test_server_timing_header_lists_statements():
+    stats = QueryStats()
+    stats.statements = [("SELECT plants.id,\n  plants.name FROM plants", 0.0005)]
+    stats.count, stats.seconds = 1, 0.0005
+    header = profiling.server_timing_header(stats, 0.002)
+    assert header == (
+        'db;dur=0.50;desc="1 queries", app;dur=2.00, sql-1;dur=0.50;desc="SELECT plants.id, plants.name FROM plants"'
+    )
+
+
+def test_server_timing_header_only_for_profiled_requests():
+    assert profiling.server_timing_header(QueryStats(), 0.001) is None
+
+
+def test_going_over_budget_is_recorded():
+    stats = QueryStats()
+    stats.budget, stats.count = 1, 2
+    profiling.finish_request("GET", "/api/v1/plants/id/{plant_id}", stats)
+    assert profiling.budget_violations == ["GET /api/v1/plants/id/{plant_id} ran 2 queries (budget 1)"]
+    profiling.budget_violations.clear()  # Do not fail this test through conftest.py
@@ -0,0 +1,268 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app import reminders
+from app.main import app
+from app.reminders import QueueSink, ReminderScheduler
+
+# This file tests the watering reminder scheduler (see reminders.py). Most tests
+# give the scheduler fake loaders instead of a database, so they control exactly
+# which plants are due and when.
+
+
+def _in(seconds: float) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+def _make_scheduler(schedules):
+    """Returns a scheduler that loads `schedules` ({plant_id: next_due}) and names plants "Plant <id>"."""
+
+    def load_schedules(plant_ids=None):
+        return [(plant_id, due) for plant_id, due in schedules.items() if plant_ids is None or plant_id in plant_ids]
+
+    def load_names(plant_ids):
+        return {plant_id: f"Plant {plant_id}" for plant_id in plant_ids}
+
+    return ReminderScheduler(load_schedules=load_schedules, load_names=load_names)
+
+
+async def _received(sink: QueueSink, wait: float) -> list:
+    """Collects everything the sink receives within `wait` seconds."""
+    await asyncio.sleep(wait)
+    items = []
+    while not sink.queue.empty():
+        items.append(sink.queue.get_nowait())
+    return items
+
+
+def test_loaded_schedules_fire_in_due_order():
+    async def scenario():
+        scheduler = _make_scheduler({1: _in(0.3), 2: _in(-60), 3: _in(3600)})
+        sink = QueueSink()
+        await scheduler.start(sink)
+        try:
+            first = await _received(sink, 0.1)
+            assert [reminder.plant_id for reminder in first] == [2]
+            assert first[0].name == "Plant 2"
+
+            second = await _received(sink, 0.4)
+            assert [reminder.plant_id for reminder in second] == [1]
+            assert len(scheduler) == 1  # Plant 3 is still waiting
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_schedule_and_cancel_update_the_heap():
+    async def scenario():
+        scheduler = _make_scheduler({})
+        sink = QueueSink()
+        await scheduler.start(sink)
+        try:
+            await asyncio.sleep(0.05)  # Let the (empty) startup load finish
+
+            # A new plant that is due now wakes the idle scheduler immediately
+            scheduler.schedule(10, _in(-1))
+            # Moving a reminder earlier replaces the old due time
+            scheduler.schedule(11, _in(3600))
+            scheduler.schedule(11, _in(0.2))
+            # Cancelled and cleared reminders never fire
+            scheduler.schedule(12, _in(0.1))
+            scheduler.cancel(12)
+            scheduler.schedule(13, _in(0.1))
+            scheduler.schedule(13, None)
+
+            received = await _received(sink, 0.5)
+            assert [reminder.plant_id for reminder in received] == [10, 11]
+            assert len(scheduler) == 0
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_rescheduling_does_not_grow_the_heap_without_bound():
+    async def scenario():
+        scheduler = _make_scheduler({})
+        await scheduler.start(QueueSink())
+        try:
+            await asyncio.sleep(0.05)
+            for step in range(20000):
+                scheduler.schedule(step % 10, _in(3600 + step))
+            assert len(scheduler) == 10
+            assert len(scheduler._heap) <= 2 * len(scheduler) + reminders.COMPACT_MIN_STALE + 1
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_changes_during_startup_load_are_reread():
+    async def scenario():
+        schedules = {1: _in(3600)}
+        scheduler = _make_scheduler(schedules)
+        sink = QueueSink()
+        await scheduler.start(sink)
+        # Before the load finishes: the plant was watered and is now due
+        schedules[1] = _in(-1)
+        scheduler.schedule(1, schedules[1])
+        try:
+            received = await _received(sink, 0.2)
+            assert [reminder.plant_id for reminder in received] == [1]
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_reload_picks_up_bulk_imported_plants():
+    async def scenario():
+        schedules = {1: _in(3600)}
+        scheduler = _make_scheduler(schedules)
+        sink = QueueSink()
+        await scheduler.start(sink)
+        try:
+            await asyncio.sleep(0.05)
+            # Plants written straight to the database (bulk import); one is already due
+            schedules.update({2: _in(-1), 3: _in(3600)})
+            scheduler.reload()
+            received = await _received(sink, 0.2)
+            assert [reminder.plant_id for reminder in received] == [2]
+            assert len(scheduler) == 2
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_sent_reminders_are_not_sent_again():
+    async def scenario():
+        overdue = _in(-60)
+        schedules = {1: overdue}
+        scheduler = _make_scheduler(schedules)
+        sink = QueueSink()
+        await scheduler.start(sink)
+        try:
+            assert [reminder.plant_id for reminder in await _received(sink, 0.1)] == [1]
+            # An edit that keeps the due time, and a reload after a bulk import, send nothing new
+            scheduler.schedule(1, overdue)
+            scheduler.refresh([1])
+            scheduler.reload()
+            assert await _received(sink, 0.1) == []
+            # Once the due time changes (the plant was watered, or its schedule changed) it is reminded again
+            schedules[1] = _in(-1)
+            scheduler.schedule(1, schedules[1])
+            assert [reminder.plant_id for reminder in await _received(sink, 0.1)] == [1]
+            # ... and a cancelled plant is forgotten, so scheduling it again reminds again
+            scheduler.cancel(1)
+            scheduler.schedule(1, schedules[1])
+            assert [reminder.plant_id for reminder in await _received(sink, 0.1)] == [1]
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_scheduler_recovers_from_database_errors(monkeypatch):
+    monkeypatch.setattr(reminders, "RETRY_DELAY", 0.01)
+
+    async def scenario():
+        # The startup load fails twice and the first name lookup once, like a database that is briefly down
+        failures = {"load_schedules": 2, "load_names": 1}
+        schedules = {1: _in(-1)}
+
+        def fail(loader):
+            if failures[loader]:
+                failures[loader] -= 1
+                raise ConnectionError("database unreachable")
+
+        def load_schedules(plant_ids=None):
+            fail("load_schedules")
+            return [
+                (plant_id, due) for plant_id, due in schedules.items() if plant_ids is None or plant_id in plant_ids
+            ]
+
+        def load_names(plant_ids):
+            fail("load_names")
+            return {plant_id: f"Plant {plant_id}" for plant_id in plant_ids}
+
+        scheduler = ReminderScheduler(load_schedules=load_schedules, load_names=load_names)
+        sink = QueueSink()
+        await scheduler.start(sink)
+        try:
+            # A change made while the database is down is kept and applied once it is back
+            schedules[2] = _in(-1)
+            scheduler.schedule(2, schedules[2])
+            received = await _received(sink, 0.3)
+            assert sorted(reminder.plant_id for reminder in received) == [1, 2]
+            assert failures == {"load_schedules": 0, "load_names": 0}
+            assert scheduler.running
+            assert scheduler._to_refresh == set()
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_updates_are_ignored_when_not_running():
+    scheduler = _make_scheduler({})
+    scheduler.schedule(1, _in(0))
+    scheduler.cancel(1)
+    scheduler.refresh([1])
+    assert len(scheduler) == 0
+
+
+def test_app_lifespan_sends_reminder_for_watered_plant(monkeypatch):
+    monkeypatch.setenv("REMINDERS", "queue")
+    # Entering the client runs the app lifespan, which starts the shared scheduler
+    with TestClient(app) as client:
+        created = client.post(
+            "/api/v1/plants",
+            json={"name": "ReminderPlant", "description": "desc", "watering_schedule": "Every 1 hour"},
+        )
+        assert created.status_code == 200
+        plant_id = created.json()["id"]
+        try:
+            # Watered two hours ago on an hourly schedule: due an hour ago
+            watered_at = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+            response = client.post(f"/api/v1/plants/id/{plant_id}/watered", json={"watered_at": watered_at})
+            assert response.status_code == 200
+
+            sink = reminders.reminder_scheduler.sink
+
+            async def wait_for_plant():
+                while True:
+                    reminder = await asyncio.wait_for(sink.queue.get(), timeout=2)
+                    if reminder.plant_id == plant_id:
+                        return reminder
+
+            reminder = client.portal.call(wait_for_plant)
+            assert reminder.name == "ReminderPlant"
+        finally:
+            client.delete(f"/api/v1/plants/id/{plant_id}")
+    assert not reminders.reminder_scheduler.running
+
+
+def test_editing_an_overdue_plant_does_not_repeat_its_reminder(monkeypatch):
+    monkeypatch.setenv("REMINDERS", "queue")
+    with TestClient(app) as client:
+        plant = {"name": "RemindOncePlant", "description": "desc", "watering_schedule": "Every 1 hour"}
+        plant_id = client.post("/api/v1/plants", json=plant).json()["id"]
+        try:
+            watered_at = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+            client.post(f"/api/v1/plants/id/{plant_id}/watered", json={"watered_at": watered_at})
+            sink = reminders.reminder_scheduler.sink
+
+            async def reminders_for_plant(wait: float) -> list:
+                return [reminder for reminder in await _received(sink, wait) if reminder.plant_id == plant_id]
+
+            assert len(client.portal.call(reminders_for_plant, 0.3)) == 1
+            # A description-only edit re-schedules the plant with the same (already reminded) due time
+            response = client.put(f"/api/v1/plants/id/{plant_id}", json={**plant, "description": "new description"})
+            assert response.status_code == 200
+            assert client.portal.call(reminders_for_plant, 0.3) == []
+        finally:
+            client.delete(f"/api/v1/plants/id/{plant_id}")
@@ -0,0 +1,126 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app import models, replicas
+from app.cache import read_cache
+from app.main import app
+
+# This file tests read replica routing (see replicas.py). Two extra SQLite files
+# stand in for the replicas; each holds a plant the primary doesn't have, so a
+# response shows which database served it.
+
+client = TestClient(app)
+
+
+def make_replica(tmp_path, name: str) -> str:
+    url = f"sqlite:///{tmp_path / name}.db"
+    engine = create_engine(url)
+    models.Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            models.Plant.__table__.insert(),
+            {"name": name, "name_normalized": name.lower(), "description": "", "watering_schedule": "Daily"},
+        )
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def use_replicas(monkeypatch, tmp_path):
+    # Installs a replica set for one test; returns a function that takes the replica URLs
+    def install(*urls):
+        replica_set = replicas.ReplicaSet(list(urls), retry_seconds=30)
+        monkeypatch.setattr(replicas, "replica_set", replica_set)
+        return replica_set
+
+    replicas.recent_writes.clear()
+    client.cookies.clear()
+    read_cache.invalidate()
+    yield install
+    replicas.recent_writes.clear()
+    client.cookies.clear()
+    read_cache.invalidate()
+
+
+def served_by(name: str) -> bool:
+    read_cache.invalidate()
+    return client.get(f"/api/v1/plants/name/{name}").status_code == 200
+
+
+def test_reads_rotate_between_replicas(use_replicas, tmp_path):
+    use_replicas(make_replica(tmp_path, "ReplicaA"), make_replica(tmp_path, "ReplicaB"))
+    names = []
+    for _ in range(4):
+        read_cache.invalidate()
+        names += [item["name"] for item in client.get("/api/v1/plants").json()["items"]]
+    assert names == ["ReplicaA", "ReplicaB", "ReplicaA", "ReplicaB"]
+
+
+def test_unreachable_replica_is_skipped(use_replicas, tmp_path):
+    broken = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"  # The folder doesn't exist
+    replica_set = use_replicas(broken, make_replica(tmp_path, "Healthy"))
+    assert served_by("Healthy") and served_by("Healthy")
+    assert [replica["healthy"] for replica in replica_set.status()] == [False, True]
+    assert client.get("/metrics/pool").json()["replicas"][0]["failures"] == 1
+
+
+def test_all_replicas_down_reads_from_primary(use_replicas, tmp_path):
+    use_replicas(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    client.post("/api/v1/plants", json={"name": "Primary Only", "description": "", "watering_schedule": "Daily"})
+    replicas.recent_writes.clear()
+    client.cookies.clear()
+    assert served_by("Primary Only")
+
+
+def test_reads_after_a_write_use_the_primary(use_replicas, tmp_path):
+    use_replicas(make_replica(tmp_path, "Lagging"))
+    assert served_by("Lagging")
+
+    response = client.post(
+        "/api/v1/plants", json={"name": "Just Written", "description": "", "watering_schedule": "Daily"}
+    )
+    assert replicas.PRIMARY_COOKIE in response.headers["set-cookie"]
+    # The replica doesn't have the new plant, but the client's next read comes from the primary
+    assert served_by("Just Written")
+
+    # Either signal is enough: the cookie (any worker) ...
+    replicas.recent_writes.clear()
+    assert served_by("Just Written")
+    # ... or a recent write to the same garden on this worker (clients without cookies)
+    client.cookies.clear()
+    replicas.recent_writes.record(models.DEFAULT_GARDEN_ID)
+    assert served_by("Just Written")
+
+    # Once the window has passed, reads go back to the replica
+    replicas.recent_writes.clear()
+    assert served_by("Lagging") and not served_by("Just Written")
+
+
+def test_reads_after_a_write_skip_the_read_cache(use_replicas, tmp_path):
+    # The read cache may hold a page read from a lagging replica after the write: filled by a
+    # worker that didn't handle the write, or shared between workers. The writer must not get it.
+    use_replicas(make_replica(tmp_path, "Lagging"))
+    response = client.post(
+        "/api/v1/plants", json={"name": "Replica Lag Write", "description": "", "watering_schedule": "Daily"}
+    )
+    writer = {"Cookie": f"{replicas.PRIMARY_COOKIE}={response.cookies[replicas.PRIMARY_COOKIE]}"}
+
+    # Another client, on a worker that has not seen the write, fills the cache from the replica
+    client.cookies.clear()
+    replicas.recent_writes.clear()
+    params = {"name_prefix": "Replica Lag"}
+    stale = client.get("/api/v1/plants", params=params)
+    assert stale.json()["items"] == []
+    assert client.get("/api/v1/plants/name/Replica Lag Write").status_code == 404
+
+    # The writer's reads skip those entries (and its copy's ETag is not answered from them)
+    fresh = client.get("/api/v1/plants", params=params, headers=writer)
+    assert [item["name"] for item in fresh.json()["items"]] == ["Replica Lag Write"]
+    assert fresh.headers["etag"] != stale.headers["etag"]
+    revalidate = {**writer, "If-None-Match": stale.headers["etag"]}
+    assert client.get("/api/v1/plants", params=params, headers=revalidate).status_code == 200
+    assert client.get("/api/v1/plants/name/Replica Lag Write", headers=writer).status_code == 200
+
+    # ... and don't fill the cache with primary data for everyone else
+    assert client.get("/api/v1/plants", params=params).json()["items"] == []
@@ -0,0 +1,53 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+from app import cli, models
+
+# This file checks that importing the app has no side effects (no database
+# connection, no tables created, no driver imports), and that the schema is
+# created by the "migrate" command instead (see cli.py).
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def test_import_does_not_touch_the_database():
+    # Nothing listens on port 1, so any connection attempt would fail the import
+    script = (
+        "import json, sys\n"
+        "from app.main import app\n"
+        "from app import database\n"
+        "print(json.dumps({'engine': database._engine is not None,"
+        " 'drivers': [m for m in ('psycopg2', 'asyncpg', 'aiosqlite') if m in sys.modules]}))\n"
+    )
+    env = {**os.environ, "DATABASE_URL": "postgresql://nobody@127.0.0.1:1/missing"}
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.splitlines()[-1]) == {"engine": False, "drivers": []}
+
+
+def test_migrate_creates_and_keeps_the_schema(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'migrate.db'}"
+    cli.migrate(database_url=database_url)
+    inspector = inspect(create_engine(database_url))
+    assert inspector.has_table("plants") and inspector.has_table("gardens")
+
+    # Running it again changes nothing
+    cli.migrate(database_url=database_url)
+    with create_engine(database_url).connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM gardens")).scalar() == 1
+
+
+def test_migrate_adopts_a_schema_created_without_migrations(tmp_path):
+    # Databases created by older versions of the app (create_all on import) have no alembic_version
+    database_url = f"sqlite:///{tmp_path / 'old.db'}"
+    models.Base.metadata.create_all(create_engine(database_url))
+    cli.migrate(database_url=database_url)
+    with create_engine(database_url).connect() as connection:
+        assert connection.execute(text("SELECT version_num FROM alembic_version")).scalar() == "0008"
@@ -0,0 +1,106 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+# This file tests incremental sync (GET /api/v1/plants/sync): row versions,
+# tombstones for deletes, and paging. Each test uses a new garden, so its
+# version numbers are not affected by other tests.
+
+client = TestClient(app)
+
+
+def new_garden() -> dict:
+    garden = client.post("/api/v1/gardens", json={"name": "Sync"}).json()
+    return {"X-Garden-ID": str(garden["id"])}
+
+
+def plant(name: str, description: str = "") -> dict:
+    return {"name": name, "description": description, "watering_schedule": "Daily"}
+
+
+def sync(garden: dict, since: int, **params) -> dict:
+    response = client.get("/api/v1/plants/sync", params={"since": since, **params}, headers=garden)
+    assert response.status_code == 200
+    return response.json()
+
+
+def summary(page: dict) -> list:
+    # (id, name or "deleted") of each change, in the order given
+    return [
+        (change["id"], "deleted" if change["deleted"] else change["plant"]["name"]) for change in page["changes"]
+    ]
+
+
+def test_sync_returns_only_what_changed():
+    garden = new_garden()
+    first = sync(garden, 0)
+    assert first == {"changes": [], "version": 0, "has_more": False}
+
+    rose = client.post("/api/v1/plants", json=plant("Rose"), headers=garden).json()
+    fern = client.post("/api/v1/plants", json=plant("Fern"), headers=garden).json()
+    everything = sync(garden, 0)
+    assert summary(everything) == [(rose["id"], "Rose"), (fern["id"], "Fern")]
+    assert everything["changes"][0]["plant"] == rose
+    version = everything["version"]
+    assert sync(garden, version)["changes"] == []
+
+    # Update one plant, delete the other and add a batch: only those come back, oldest first
+    client.put(f"/api/v1/plants/id/{rose['id']}", json=plant("Rose", "Red"), headers=garden)
+    client.delete("/api/v1/plants/name/fern", headers=garden)
+    batch = client.post("/api/v1/plants:batch", json={"items": [plant("Mint"), plant("Sage")]}, headers=garden)
+    mint_id, sage_id = [result["id"] for result in batch.json()["results"]]
+    client.post(f"/api/v1/plants/id/{mint_id}/watered", headers=garden)
+    delta = sync(garden, version)
+    assert summary(delta) == [(rose["id"], "Rose"), (fern["id"], "deleted"), (sage_id, "Sage"), (mint_id, "Mint")]
+    assert delta["changes"][0]["plant"]["description"] == "Red"
+    assert delta["changes"][1]["plant"] is None
+    assert delta["version"] > version
+
+    # A client starting from scratch doesn't get tombstones
+    assert [name for _, name in summary(sync(garden, 0))] == ["Rose", "Sage", "Mint"]
+
+
+def test_batch_delete_and_import_are_synced():
+    garden = new_garden()
+    client.post("/api/v1/plants:batch", json={"items": [plant("A"), plant("B"), plant("C")]}, headers=garden)
+    everything = sync(garden, 0)
+    ids = [change["id"] for change in everything["changes"]]
+
+    client.request("DELETE", "/api/v1/plants:batch", json={"ids": [ids[0], ids[2], 999999]}, headers=garden)
+    client.post(
+        "/api/v1/plants:import?format=csv", content="name,description,watering_schedule\nD,,Daily\nB,,Daily\n",
+        headers=garden,
+    )
+    delta = sync(garden, everything["version"])
+    assert summary(delta)[:2] == [(ids[0], "deleted"), (ids[2], "deleted")]
+    assert [name for _, name in summary(delta)[2:]] == ["D"]
+
+
+def test_sync_pages_through_changes():
+    garden = new_garden()
+    client.post(
+        "/api/v1/plants:batch", json={"items": [plant(f"Paged {i}") for i in range(5)]}, headers=garden
+    )
+    names, since, pages = [], 0, 0
+    while True:
+        page = sync(garden, since, limit=2)
+        names += [name for _, name in summary(page)]
+        since, pages = page["version"], pages + 1
+        if not page["has_more"]:
+            break
+    assert names == [f"Paged {i}" for i in range(5)]
+    assert pages == 3
+
+
+def test_sync_and_list_etag_are_per_garden():
+    garden, other = new_garden(), new_garden()
+    client.post("/api/v1/plants", json=plant("Mine"), headers=garden)
+    client.post("/api/v1/plants", json=plant("Theirs"), headers=other)
+    assert [name for _, name in summary(sync(garden, 0))] == ["Mine"]
+
+    # The list ETag follows the garden's version, so a delete changes it too
+    etag = client.get("/api/v1/plants", headers=garden).headers["etag"]
+    client.delete("/api/v1/plants/name/theirs", headers=other)
+    assert client.get("/api/v1/plants", headers={**garden, "If-None-Match": etag}).status_code == 304
+    client.delete("/api/v1/plants/name/mine", headers=garden)
+    assert client.get("/api/v1/plants", headers={**garden, "If-None-Match": etag}).status_code == 200
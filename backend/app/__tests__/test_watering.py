@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, create_engine, select
+
+from app.watering import parse_watering_schedule, plus_hours
+
+# This file tests the watering schedule parser and the plus_hours SQL expression
+# (see watering.py).
+
+
+@pytest.mark.parametrize(
+    "schedule, hours",
+    [
+        ("Daily", 24),
+        ("Once a week", 168),
+        ("Weekly", 168),
+        ("every day", 24),
+        ("Every 3 days", 72),
+        ("Every other week", 336),
+        ("Twice a day", 12),
+        ("3 times a week", 56),
+        ("Once every 2 weeks", 336),
+        ("Every 12 hours", 12),
+        ("Bi-weekly", 336),
+        ("  ONCE  A  WEEK. ", 168),
+    ],
+)
+def test_parse_watering_schedule(schedule, hours):
+    assert parse_watering_schedule(schedule) == hours
+
+
+@pytest.mark.parametrize("schedule", ["", "When the soil is dry", "Every 0 days", "sometimes"])
+def test_parse_watering_schedule_not_understood(schedule):
+    assert parse_watering_schedule(schedule) is None
+
+
+def test_plus_hours_on_sqlite():
+    # SQLite has no interval type; plus_hours compiles to datetime(..., '+N hours')
+    engine = create_engine("sqlite://")
+    table = Table("t", MetaData(), Column("at", DateTime(timezone=True)), Column("hours", Integer))
+    table.create(engine)
+    with engine.begin() as connection:
+        connection.execute(table.insert(), [{"at": datetime(2026, 3, 1, 10, 0), "hours": 36}, {"at": None, "hours": 1}])
+        results = connection.execute(select(plus_hours(table.c.at, table.c.hours))).scalars().all()
+    assert results == [datetime(2026, 3, 2, 22, 0), None]
@@ -0,0 +1,401 @@
+# bulk_import.py
+#
+# Imports large CSV or NDJSON files of plants (e.g. a nursery catalogue with
+# hundreds of thousands of rows) into one garden.
+#
+# Used by POST /api/v1/plants:import (see plant_router.py) and by
+# "python -m app.cli import" (see cli.py). The file is read line by line and
+# handled IMPORT_BATCH_SIZE rows at a time, so memory use does not depend on
+# the size of the file:
+#
+# 1. Each batch is validated against the plant schema in one call. Rows that
+#    don't validate are rejected; the others get their derived columns
+#    (name_normalized, watering interval, first due date).
+# 2. Valid rows go into a temporary staging table: with COPY on PostgreSQL
+#    (psycopg2), with executemany elsewhere (SQLite).
+# 3. At the end, one INSERT ... SELECT moves every new plant from the staging
+#    table into plants. Rows whose name already exists in the garden, or
+#    repeats an earlier row of the same file, are rejected. Each new plant's
+#    row_version is the garden's counter plus its line number (see
+#    crud.claim_row_versions), so GET /plants/sync picks the import up.
+#
+# Everything runs in one transaction: either all accepted rows are imported,
+# or (on a database error) none are. The report lists the first
+# MAX_REPORTED_ERRORS rejected rows with their line numbers, and counts all of them.
+
+import codecs
+import csv
+import io
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import DDL, Column, DateTime, Integer, MetaData, String, Table, exists, func, insert, literal, select
+from sqlalchemy.engine import Connection
+
+from . import crud, models
+from .watering import next_due_after, parse_watering_schedule
+
+logger = logging.getLogger(__name__)
+
+# Rows validated and written to the staging table at a time
+IMPORT_BATCH_SIZE = 5000
+# Rejected rows listed in the report (all of them are counted)
+MAX_REPORTED_ERRORS = 1000
+# Longest accepted line; a longer one means the file is not really CSV / NDJSON
+MAX_LINE_LENGTH = 1024 * 1024
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Columns every CSV file must have (other columns, like the exported "id", are ignored)
+CSV_REQUIRED_COLUMNS = ("name", "description", "watering_schedule")
+
+# The staging table: one row per valid input row, numbered by its line in the file.
+# It is a temporary table, so it is private to the importing connection.
+_staging_metadata = MetaData()
+staging = Table(
+    "plants_import",
+    _staging_metadata,
+    Column("line", Integer, primary_key=True),
+    Column("name", String),
+    Column("name_normalized", String),
+    Column("description", String),
+    Column("watering_schedule", String),
+    Column("watering_interval_hours", Integer),
+    Column("next_due", DateTime(timezone=True)),
+    prefixes=["TEMPORARY"],
+)
+# Created after loading (cheaper than maintaining it during COPY); serves the duplicate checks
+STAGING_NAME_INDEX = DDL(f"CREATE INDEX ix_{staging.name}_name_normalized ON {staging.name} (name_normalized)")
+
+STAGING_COLUMNS = [column.name for column in staging.columns]
+
+
+class GardenNotFoundError(LookupError):
+    """The garden to import into does not exist."""
+
+
+class ImportFormatError(ValueError):
+    """The file can't be imported at all (unknown format, missing CSV columns, bad encoding, huge line)."""
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import."""
+
+    received: int = 0  # Data rows read from the file
+    imported: int = 0  # Plants created
+    rejected: int = 0  # Rows not imported
+    errors: List[Tuple[int, str]] = field(default_factory=list)  # (line, reason), first MAX_REPORTED_ERRORS
+    seconds: float = 0.0
+
+    def reject(self, line: int, reason: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, reason))
+
+    def to_dict(self) -> dict:
+        return {
+            "received": self.received,
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "errors": [{"line": line, "error": reason} for line, reason in self.errors],
+            "errors_truncated": self.rejected > len(self.errors),
+            "seconds": round(self.seconds, 3),
+        }
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Splits a stream of UTF-8 byte chunks into lines (each keeps its line ending).
+
+    Only the unfinished last line of a chunk is held back, so memory stays at
+    one chunk plus one line. A byte-order mark at the start is skipped.
+
+    Raises:
+        ImportFormatError: If the data is not UTF-8, or a line is longer than MAX_LINE_LENGTH
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        for chunk in chunks:
+            lines = (pending + decoder.decode(chunk)).splitlines(keepends=True)
+            pending = lines.pop() if lines and not lines[-1].endswith("\n") else ""
+            if len(pending) > MAX_LINE_LENGTH:
+                raise ImportFormatError(f"Line longer than {MAX_LINE_LENGTH} characters")
+            yield from lines
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise ImportFormatError(f"File is not valid UTF-8: {e}")
+    if pending:
+        yield pending
+
+
+def _csv_records(lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+    """Yields (line number, record) for each CSV data row; the header names the fields."""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [name.strip() for name in header]
+    missing = [name for name in CSV_REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise ImportFormatError(f"CSV header is missing column(s): {', '.join(missing)}")
+    while True:
+        line = reader.line_num + 1  # Where the next record starts (quoted fields may span lines)
+        try:
+            values = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield line, f"Invalid CSV: {e}"
+            continue
+        if not values:
+            continue  # Blank line
+        if len(values) != len(columns):
+            yield line, f"Expected {len(columns)} fields, got {len(values)}"
+            continue
+        yield line, {name: value for name, value in zip(columns, values) if name in CSV_REQUIRED_COLUMNS}
+
+
+def _ndjson_records(lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+    """Yields (line number, record) for each non-blank NDJSON line."""
+    for line, text in enumerate(lines, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            yield line, f"Invalid JSON: {e}"
+            continue
+        yield line, record if isinstance(record, dict) else "Not a JSON object"
+
+
+def _records(lines: Iterable[str], import_format: str) -> Iterator[Tuple[int, object]]:
+    """Yields (line, record dict) for every data row, or (line, error text) for unreadable ones."""
+    if import_format == "csv":
+        return _csv_records(lines)
+    if import_format == "ndjson":
+        return _ndjson_records(lines)
+    raise ImportFormatError(f"Unknown import format {import_format!r} (use one of {', '.join(IMPORT_FORMATS)})")
+
+
+def _batches(records: Iterator[Tuple[int, object]], size: int) -> Iterator[List[Tuple[int, object]]]:
+    batch: List[Tuple[int, object]] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _first_error(error: ValidationError) -> str:
+    detail = error.errors()[0]
+    location = ".".join(str(part) for part in detail["loc"] if not isinstance(part, int))
+    return f"{location}: {detail['msg']}" if location else detail["msg"]
+
+
+class PlantImporter:
+    """
+    Loads validated rows into the staging table and merges them into plants.
+
+    Args:
+        connection (Connection): Connection with an open transaction (the caller commits)
+        garden_id (int): Garden the plants are imported into
+        schema (Type[BaseModel]): Schema every row must match (PlantSchema)
+    """
+
+    def __init__(self, connection: Connection, garden_id: int, schema: Type[BaseModel]):
+        self.connection = connection
+        self.garden_id = garden_id
+        self.schema = schema
+        self._batch_adapter = TypeAdapter(List[schema])  # type: ignore[valid-type]
+        self.report = ImportReport()
+        self.now = models.utc_now()
+        staging.drop(connection, checkfirst=True)  # Left over on this connection by an aborted import
+        staging.create(connection)
+        raw_cursor = connection.connection.dbapi_connection.cursor()  # type: ignore[union-attr]
+        # COPY needs PostgreSQL with psycopg2; other databases use executemany
+        self.use_copy = connection.dialect.name == "postgresql" and hasattr(raw_cursor, "copy_expert")
+        raw_cursor.close()
+
+    def add(self, records: List[Tuple[int, object]]) -> None:
+        """Validates one batch of (line, record) pairs and writes the valid rows to the staging table."""
+        self.report.received += len(records)
+        candidates = []
+        for line, record in records:
+            if isinstance(record, str):
+                self.report.reject(line, record)
+            elif isinstance(record, dict):
+                # IDs are always assigned by the database (so an exported file can be imported elsewhere)
+                candidates.append((line, {key: value for key, value in record.items() if key != "id"}))
+        if not candidates:
+            return
+
+        # Validate the whole batch in one call; only when something fails, find out which rows
+        try:
+            plants = self._batch_adapter.validate_python([record for _, record in candidates])
+            valid = [(line, plant) for (line, _), plant in zip(candidates, plants)]
+        except ValidationError:
+            valid = []
+            for line, record in candidates:
+                try:
+                    valid.append((line, self.schema.model_validate(record)))
+                except ValidationError as e:
+                    self.report.reject(line, _first_error(e))
+
+        rows = []
+        for line, plant in valid:
+            name, schedule = plant.name.strip(), plant.watering_schedule.strip()  # type: ignore[attr-defined]
+            interval = parse_watering_schedule(schedule)
+            rows.append(
+                {
+                    "line": line,
+                    "name": name,
+                    "name_normalized": models.normalize_plant_name(name),
+                    "description": plant.description.strip(),  # type: ignore[attr-defined]
+                    "watering_schedule": schedule,
+                    "watering_interval_hours": interval,
+                    "next_due": next_due_after(self.now, interval),
+                }
+            )
+        if not rows:
+            return
+        if self.use_copy:
+            self._copy(rows)
+        else:
+            self.connection.execute(insert(staging), rows)
+
+    def _copy(self, rows: List[dict]) -> None:
+        """Writes rows to the staging table with COPY ... FROM STDIN (text format)."""
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_value(row[column]) for column in STAGING_COLUMNS) + "\n")
+        buffer.seek(0)
+        cursor = self.connection.connection.dbapi_connection.cursor()  # type: ignore[union-attr]
+        try:
+            cursor.copy_expert(f"COPY {staging.name} ({', '.join(STAGING_COLUMNS)}) FROM STDIN", buffer)
+        finally:
+            cursor.close()
+
+    def finish(self) -> ImportReport:
+        """
+        Rejects duplicate names, then inserts every remaining staged row into plants.
+
+        Returns:
+            ImportReport: The final report
+
+        Raises:
+            GardenNotFoundError: If the garden does not exist
+        """
+        self.connection.execute(STAGING_NAME_INDEX)
+        plant = models.Plant
+        earlier = staging.alias("earlier")
+        exists_in_garden = exists().where(
+            plant.garden_id == self.garden_id, plant.name_normalized == staging.c.name_normalized
+        )
+        first_line_of_name = (
+            select(func.min(earlier.c.line))
+            .where(earlier.c.name_normalized == staging.c.name_normalized)
+            .scalar_subquery()
+        )
+        duplicates = [
+            ("Plant with this name already exists", exists_in_garden),
+            ("Duplicate name within file", ~exists_in_garden & (staging.c.line != first_line_of_name)),
+        ]
+        rejected = []
+        for reason, condition in duplicates:
+            count = self.connection.scalar(select(func.count()).select_from(staging).where(condition))
+            lines = self.connection.scalars(
+                select(staging.c.line).where(condition).order_by(staging.c.line).limit(MAX_REPORTED_ERRORS)
+            )
+            self.report.rejected += count or 0
+            rejected += [(line, reason) for line in lines]
+        # Keep the report in line order, and still only the first MAX_REPORTED_ERRORS rows
+        self.report.errors = sorted(self.report.errors + rejected)[:MAX_REPORTED_ERRORS]
+
+        # Claim one version per line of the file (lines are unique, and numbers of
+        # rejected lines just go unused). This locks the garden's counter, so it is
+        # done last: other writes to the garden only wait for the merge itself.
+        last_line = self.connection.scalar(select(func.max(staging.c.line))) or 0
+        last_version = self.connection.scalar(crud.row_version_claim(self.garden_id, last_line))
+        if last_version is None:
+            raise GardenNotFoundError(f"Garden {self.garden_id} not found")
+        row_version = literal(last_version - last_line) + staging.c.line
+
+        # The set-based merge: every staged row that is the first with its name and
+        # whose name is new to the garden
+        columns = ["name", "name_normalized", "description", "watering_schedule", "watering_interval_hours", "next_due"]
+        new_plants = select(
+            literal(self.garden_id),
+            *[staging.c[name] for name in columns],
+            literal(self.now, DateTime(timezone=True)),
+            row_version,
+        ).where(~exists_in_garden, staging.c.line == first_line_of_name)
+        result = self.connection.execute(
+            insert(plant).from_select(["garden_id", *columns, "updated_at", "row_version"], new_plants)
+        )
+        self.report.imported = result.rowcount
+        staging.drop(self.connection)
+        return self.report
+
+
+def _copy_value(value) -> str:
+    """Formats one value for COPY's text format (\\N is NULL; backslash, tab and newlines are escaped)."""
+    if value is None:
+        return "\\N"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return (
+        str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    )
+
+
+def import_plants(
+    connection: Connection,
+    lines: Iterable[str],
+    import_format: str,
+    garden_id: int,
+    schema: Type[BaseModel],
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportReport:
+    """
+    Imports the plants in a CSV or NDJSON file into a garden.
+
+    Args:
+        connection (Connection): Connection with an open transaction; the caller commits
+        lines (Iterable[str]): The file's lines (read lazily; see iter_lines)
+        import_format (str): "csv" (header row required) or "ndjson"
+        garden_id (int): Garden to import into
+        schema (Type[BaseModel]): Schema every row must match (PlantSchema)
+        batch_size (int): Rows validated and staged at a time
+
+    Returns:
+        ImportReport: Rows received, imported and rejected (with reasons)
+
+    Raises:
+        ImportFormatError: If the file can't be read as the given format
+        GardenNotFoundError: If the garden does not exist
+    """
+    start = time.perf_counter()
+    records = _records(lines, import_format)
+    importer = PlantImporter(connection, garden_id, schema)
+    for batch in _batches(records, batch_size):
+        importer.add(batch)
+    report = importer.finish()
+    report.seconds = time.perf_counter() - start
+    logger.info(
+        "Imported %d of %d plants into garden %s in %.2fs (%d rejected, %s)",
+        report.imported,
+        report.received,
+        garden_id,
+        report.seconds,
+        report.rejected,
+        "COPY" if importer.use_copy else "executemany",
+    )
+    return report
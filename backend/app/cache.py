@@ -0,0 +1,178 @@
+# cache.py
+#
+# A small read-through cache for plant reads.
+#
+# Most API traffic reads the plant list, and the list only changes when a plant
+# is added, updated or deleted. The plant router stores read results here and
+# the mutating handlers call read_cache.invalidate() after each commit, so reads
+# are served from memory until the data actually changes.
+#
+# Storage is pluggable: LocalCache keeps entries in this process (one copy per
+# worker). A multi-worker deployment can call set_cache_backend() at startup
+# with a shared implementation of CacheBackend (for example one backed by Redis)
+# so that an invalidation on one worker is seen by all of them.
+#
+# A key of None means "don't cache this read": get() returns nothing and set()
+# stores nothing. The plant router uses it for reads that must see the client's
+# own recent writes (see replicas.read_cache_scope).
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+class CacheBackend:
+    """
+    Storage interface used by ReadCache.
+
+    Values are plain JSON-friendly data (dicts, lists, strings, numbers), so a
+    shared backend can serialize them however it likes.
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value for key, or None if it is missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any) -> None:
+        """Stores value under key."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        """Returns the number of stored entries (used for metrics only)."""
+        return 0
+
+
+class LocalCache(CacheBackend):
+    """
+    In-process cache with a time-to-live and a size-bounded LRU eviction policy.
+
+    Args:
+        max_entries (int): Maximum number of entries; the least recently used is evicted first
+        ttl_seconds (float): How long an entry stays valid after it is stored
+        clock (Callable): Time source, replaceable in tests
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)  # Mark as most recently used
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)  # Drop the least recently used entry
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ReadCache:
+    """
+    Front end for a CacheBackend that counts hits and misses and handles invalidation.
+
+    Each invalidation bumps a generation number. Readers capture the generation
+    before querying the database and pass it to set(); if a write committed in
+    the meantime the result is discarded instead of caching stale data.
+    """
+
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Optional[str]) -> Optional[Any]:
+        """Returns the cached value for key (or None), counting a hit or a miss."""
+        if not self.enabled or key is None:
+            return None
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Optional[str], value: Any, generation: int) -> None:
+        """
+        Stores a value read from the database.
+
+        Args:
+            key (str, optional): Cache key (None stores nothing)
+            value (Any): JSON-friendly value to store
+            generation (int): self.generation captured before the database read
+        """
+        if self.enabled and key is not None and generation == self.generation:
+            self.backend.set(key, value)
+
+    def invalidate(self) -> None:
+        """Drops every cached read. Called by the plant router after each committed write."""
+        self.generation += 1
+        self.invalidations += 1
+        self.backend.clear()
+
+    def stats(self) -> Dict:
+        """Returns the hit/miss counters for the metrics endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": getattr(self.backend, "evictions", 0),
+        }
+
+
+# Shared cache used by the plant router
+# PLANT_CACHE_ENABLED, PLANT_CACHE_TTL and PLANT_CACHE_MAX_ENTRIES configure it from the environment.
+read_cache = ReadCache(
+    LocalCache(
+        max_entries=int(os.getenv("PLANT_CACHE_MAX_ENTRIES", "1024")),
+        ttl_seconds=float(os.getenv("PLANT_CACHE_TTL", "30")),
+    ),
+    enabled=os.getenv("PLANT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"),
+)
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """
+    Replaces the storage used by read_cache (for example with a shared cache
+    in multi-worker deployments, or a fake in tests).
+
+    Args:
+        backend (CacheBackend): The new storage
+    """
+    read_cache.backend = backend
+    read_cache.invalidate()
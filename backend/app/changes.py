@@ -0,0 +1,438 @@
+# changes.py
+#
+# Live plant changes for GET /api/v1/plants/changes (server-sent events).
+#
+# Instead of re-fetching the whole plant list after every write, a client keeps
+# one SSE connection open and receives only what changed: "created", "updated"
+# and "deleted" events, each with a sequence number that always increases.
+#
+# The plant router calls change_feed.publish() after each committed write. The
+# feed keeps the most recent changes in a ring buffer (PLANT_CHANGES_BUFFER,
+# default 1000), so a client that reconnects with the standard Last-Event-ID
+# header gets the changes it missed. When those changes are no longer in the
+# buffer (or the server restarted), the client gets a "reset" event and
+# reloads the full list once.
+#
+# Changes are numbered in one sequence for all gardens, but each stream only
+# receives the changes of its own garden. While other gardens are busy, idle
+# streams are sent their position with each keep-alive, so a reconnecting
+# client resumes from there instead of from its own garden's last change.
+#
+# Changes too large to send one by one (a bulk import) are announced with
+# publish_reset(garden_id): it is buffered and numbered like a change, the
+# garden's streams get a "reset" event (reload the list), other gardens'
+# streams just move past it, and the reset listeners run (the plant router
+# drops its read cache and reloads the reminders).
+#
+# Each worker process has its own feed. With several workers, set
+# PLANT_CHANGES_NOTIFY=true (PostgreSQL only): changes and resets are then sent
+# through PostgreSQL LISTEN/NOTIFY, so every worker sees every one of them, and
+# the sequence numbers come from a database sequence so they mean the same on
+# all workers. "python -m app.cli import" sends its reset the same way (see
+# notify_reset), so running servers pick up plants imported from the command line.
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from .responses import dumps
+
+logger = logging.getLogger(__name__)
+
+# How long the browser waits before reconnecting after the stream drops
+RETRY_MILLISECONDS = 3000
+# A comment line is sent this often while nothing changes, so proxies keep the connection open
+HEARTBEAT_SECONDS = 15.0
+# Changes waiting to be sent to one client; a client that falls this far behind is reset
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+NOTIFY_CHANNEL = "plant_changes"
+NOTIFY_SEQUENCE = "plant_change_seq"
+# Advisory lock held while numbering a change, so NOTIFY order matches sequence order
+NOTIFY_LOCK_KEY = 4242001
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_PAYLOAD = 7900
+
+CHANGE_TYPES = ("created", "updated", "deleted")
+# Notification type of a publish_reset() announcement
+RESET_TYPE = "reset"
+
+
+class PlantChange(NamedTuple):
+    """One committed write, as sent to clients."""
+
+    seq: int
+    garden_id: int  # The garden the plant belongs to; streams only send their own garden's changes
+    type: str  # "created", "updated", "deleted", or "reset" (reload the garden's list)
+    plant_id: int
+    plant: Optional[dict]  # The plant after the change; None for deletes
+
+    def to_event(self, epoch: str) -> str:
+        data = dumps({"seq": self.seq, "id": self.plant_id, "plant": self.plant}).decode()
+        return f"id: {epoch}:{self.seq}\nevent: {self.type}\ndata: {data}\n\n"
+
+
+class Subscription:
+    """The queue of changes for one open stream."""
+
+    def __init__(self, maxsize: int):
+        self.queue: "asyncio.Queue[Optional[PlantChange]]" = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def put(self, change: Optional[PlantChange]) -> None:
+        """Queues a change; None asks the stream to reset. A full queue also resets the stream."""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self) -> Optional[PlantChange]:
+        """Returns the next change, or None when the stream has to reset."""
+        if self.overflowed and self.queue.empty():
+            return None
+        return await self.queue.get()
+
+
+class ChangeFeed:
+    """
+    Sequence numbering, ring buffer and fan-out for plant changes.
+
+    Args:
+        buffer_size (int): How many recent changes are kept for reconnecting clients
+        subscriber_queue_size (int): How many changes may wait for one slow client
+    """
+
+    def __init__(self, buffer_size: int = 1000, subscriber_queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        # Event IDs are "<epoch>:<seq>". A new epoch (e.g. after a restart)
+        # tells reconnecting clients that their old sequence numbers mean nothing here.
+        self.epoch = uuid.uuid4().hex[:8]
+        self.last_seq = 0
+        self.subscriber_queue_size = subscriber_queue_size
+        self._buffer: Deque[PlantChange] = deque(maxlen=buffer_size)
+        self._subscribers: Set[Subscription] = set()
+        self._notifier: Optional["PostgresNotifier"] = None
+        self._reset_listeners: List[Callable[[int], None]] = []
+
+    @property
+    def position(self) -> str:
+        """Event ID of the latest change (what a client that is up to date has seen)."""
+        return f"{self.epoch}:{self.last_seq}"
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, garden_id: int, change_type: str, plant_id: int, plant: Optional[dict] = None) -> None:
+        """
+        Records a committed change and sends it to every open stream.
+
+        Args:
+            garden_id (int): Garden the changed plant belongs to
+            change_type (str): "created", "updated" or "deleted"
+            plant_id (int): ID of the changed plant
+            plant (dict, optional): The plant's fields after the change (None for deletes)
+        """
+        if self._notifier is not None:
+            # Numbered by PostgreSQL and delivered back through LISTEN, to every worker
+            self._notifier.send(garden_id, change_type, plant_id, plant)
+        else:
+            self.append(PlantChange(self.last_seq + 1, garden_id, change_type, plant_id, plant))
+
+    def append(self, change: PlantChange) -> None:
+        """Adds an already numbered change to the buffer and the open streams."""
+        self.last_seq = change.seq
+        self._buffer.append(change)
+        for subscription in self._subscribers:
+            subscription.put(change)
+
+    def add_reset_listener(self, listener: Callable[[int], None]) -> None:
+        """Registers a function called with the garden ID on every worker for each publish_reset()."""
+        self._reset_listeners.append(listener)
+
+    def publish_reset(self, garden_id: int) -> None:
+        """
+        Announces a change to one garden too large to send plant by plant (a bulk import).
+
+        The garden's open streams, and its clients reconnecting from before the
+        reset, are told to reload; other gardens' streams carry on. The reset
+        listeners run too. With LISTEN/NOTIFY this happens on every worker, and
+        the epoch stays the same everywhere.
+
+        Args:
+            garden_id (int): Garden that changed
+        """
+        if self._notifier is not None:
+            self._notifier.send(garden_id, RESET_TYPE, 0, None)
+        else:
+            self.apply_reset(self.last_seq + 1, garden_id)
+
+    def apply_reset(self, seq: int, garden_id: int) -> None:
+        """Applies an already numbered reset: it is buffered and sent like a change, then the listeners run."""
+        self.append(PlantChange(seq, garden_id, RESET_TYPE, 0, None))
+        for listener in self._reset_listeners:
+            try:
+                listener(garden_id)
+            except Exception:
+                logger.exception("Plant change reset listener failed")
+
+    def reset(self) -> None:
+        """Starts a new epoch: every open stream and every reconnecting client reloads."""
+        self.epoch = uuid.uuid4().hex[:8]
+        self._buffer.clear()
+        for subscription in self._subscribers:
+            subscription.put(None)
+
+    def changes_since(self, event_id: str) -> Optional[List[PlantChange]]:
+        """
+        Returns the changes after a client's Last-Event-ID.
+
+        Args:
+            event_id (str): The last event ID the client received
+
+        Returns:
+            Optional[List[PlantChange]]: The missed changes (possibly none), or None when
+            the client has to reload: unknown epoch, or changes already dropped from the buffer
+        """
+        epoch, _, seq_text = event_id.partition(":")
+        if epoch != self.epoch or not seq_text.isdigit():
+            return None
+        seq = int(seq_text)
+        if seq > self.last_seq:
+            return None
+        if seq == self.last_seq:
+            return []
+        if not self._buffer or self._buffer[0].seq > seq + 1:
+            return None
+        return [change for change in self._buffer if change.seq > seq]
+
+    @contextmanager
+    def subscribe(self) -> Iterator[Subscription]:
+        """Registers a stream for the duration of the `with` block."""
+        subscription = Subscription(self.subscriber_queue_size)
+        self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+
+    async def start(self, database_url: str) -> None:
+        """Switches to LISTEN/NOTIFY when PLANT_CHANGES_NOTIFY is on (called from the app lifespan)."""
+        if not notify_enabled():
+            return
+        if not database_url.startswith("postgresql"):
+            logger.warning("PLANT_CHANGES_NOTIFY needs PostgreSQL; plant changes stay local to each worker")
+            return
+        self._notifier = PostgresNotifier(self, database_url)
+        await self._notifier.start()
+
+    async def stop(self) -> None:
+        if self._notifier is not None:
+            await self._notifier.stop()
+            self._notifier = None
+
+
+async def event_stream(
+    feed: ChangeFeed, last_event_id: Optional[str], garden_id: int, heartbeat: float = HEARTBEAT_SECONDS
+) -> AsyncIterator[str]:
+    """
+    Yields the SSE messages for one client, for the changes in one garden.
+
+    The first message is one of:
+    - "ready" (new client): load the list now, then apply the events that follow
+    - the missed changes (reconnecting client, Last-Event-ID still in the buffer)
+    - "reset" (reconnecting client that missed too much, or whose garden was
+      reset since): reload the list
+    Later events are changes, or "reset" when the garden gets a bulk import.
+
+    Args:
+        feed (ChangeFeed): The feed to follow
+        last_event_id (str, optional): The client's Last-Event-ID header
+        garden_id (int): Garden whose changes are sent
+        heartbeat (float): Seconds between keep-alive comments while idle
+    """
+    # Subscribe before reading the buffer, so no change can fall in between
+    with feed.subscribe() as subscription:
+        missed = feed.changes_since(last_event_id) if last_event_id else None
+        # Read before the first yield: changes published while a message is being
+        # sent arrive through the subscription and must not be skipped
+        sent_seq, position = feed.last_seq, feed.position
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        if missed is None:
+            event = "reset" if last_event_id else "ready"
+            yield f"id: {position}\nevent: {event}\ndata: {dumps({'seq': sent_seq}).decode()}\n\n"
+        elif any(change.garden_id == garden_id and change.type == RESET_TYPE for change in missed):
+            # The garden was reset (bulk import) since the client's last event: reload instead
+            yield f"id: {position}\nevent: reset\ndata: {dumps({'seq': sent_seq}).decode()}\n\n"
+        else:
+            for missed_change in missed:
+                if missed_change.garden_id == garden_id:
+                    yield missed_change.to_event(feed.epoch)
+        # The client's position: every change up to here was sent or belongs to another garden
+        client_seq = sent_seq
+
+        while True:
+            try:
+                change = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                if sent_seq > client_seq:
+                    # An "id" line without data moves the browser's Last-Event-ID
+                    # past other gardens' changes without firing an event
+                    client_seq = sent_seq
+                    yield f"id: {feed.epoch}:{sent_seq}\n: keep-alive\n\n"
+                else:
+                    yield ": keep-alive\n\n"
+                continue
+            if change is None:
+                # Fell behind or the feed was reset; the client reloads and reconnects
+                yield f"id: {feed.position}\nevent: reset\ndata: {dumps({'seq': feed.last_seq}).decode()}\n\n"
+                return
+            if change.seq <= sent_seq:
+                continue  # Already sent from the buffer
+            sent_seq = change.seq
+            if change.garden_id == garden_id:
+                client_seq = sent_seq
+                yield change.to_event(feed.epoch)
+
+
+def notify_enabled() -> bool:
+    """True when PLANT_CHANGES_NOTIFY asks for changes to be shared through LISTEN/NOTIFY."""
+    return os.getenv("PLANT_CHANGES_NOTIFY", "false").lower() in ("1", "true", "yes")
+
+
+def _notify_payload(garden_id: int, change_type: str, plant_id: int, plant: Optional[dict]) -> str:
+    """The JSON body of a notification, as read back by PostgresNotifier._on_notify."""
+    payload = dumps({"garden": garden_id, "type": change_type, "id": plant_id, "plant": plant}).decode()
+    if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+        # Too large for NOTIFY: send the ID only; clients then reload the list
+        payload = dumps({"garden": garden_id, "type": change_type, "id": plant_id, "plant": None}).decode()
+    return payload
+
+
+def notify_reset(connection, garden_id: int) -> None:
+    """
+    Sends a garden reset to the running servers, for writes made outside them
+    (python -m app.cli import). They apply it like ChangeFeed.publish_reset().
+
+    The notification is numbered and sent on the caller's connection, so
+    PostgreSQL delivers it when that transaction commits, and not at all if it
+    rolls back.
+
+    Args:
+        connection: SQLAlchemy Connection to PostgreSQL, inside the transaction that made the writes
+        garden_id (int): Garden that changed
+    """
+    connection.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {NOTIFY_SEQUENCE}"))
+    connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": NOTIFY_LOCK_KEY})
+    connection.execute(
+        text(f"SELECT pg_notify(:channel, nextval('{NOTIFY_SEQUENCE}')::text || ':' || :payload)"),
+        {"channel": NOTIFY_CHANNEL, "payload": _notify_payload(garden_id, RESET_TYPE, 0, None)},
+    )
+
+
+def _asyncpg_dsn(url: str) -> str:
+    """postgresql+asyncpg://... -> postgresql://... (asyncpg takes a plain libpq URL)."""
+    scheme, _, rest = url.partition("://")
+    return f"{scheme.split('+')[0]}://{rest}"
+
+
+class PostgresNotifier:
+    """
+    Shares plant changes between workers through PostgreSQL LISTEN/NOTIFY.
+
+    Every worker listens on NOTIFY_CHANNEL. A change (or a reset, see
+    ChangeFeed.publish_reset) is numbered with nextval(NOTIFY_SEQUENCE) under
+    an advisory lock and sent with pg_notify(), so all workers receive the same
+    changes with the same numbers, in order.
+    The connection is re-opened if it drops; open streams are reset then,
+    because notifications sent in the meantime are lost.
+    """
+
+    def __init__(self, feed: ChangeFeed, database_url: str):
+        self.feed = feed
+        self.dsn = _asyncpg_dsn(database_url)
+        self._outbox: "asyncio.Queue[Tuple[int, str, int, Optional[dict]]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        # Wait briefly so the first requests already go through the database
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            logger.warning("Plant change notifications are not connected yet")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def send(self, garden_id: int, change_type: str, plant_id: int, plant: Optional[dict]) -> None:
+        self._outbox.put_nowait((garden_id, change_type, plant_id, plant))
+
+    async def _run(self) -> None:
+        import asyncpg  # type: ignore[import-untyped]  # Only needed with PLANT_CHANGES_NOTIFY=true
+
+        while True:
+            connection: Any = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                await connection.execute(f"CREATE SEQUENCE IF NOT EXISTS {NOTIFY_SEQUENCE}")
+                await connection.add_listener(NOTIFY_CHANNEL, self._on_notify)
+                last_value, is_called = await connection.fetchrow(
+                    f"SELECT last_value, is_called FROM {NOTIFY_SEQUENCE}"
+                )
+                # Numbers come from the database now; old local numbers are meaningless
+                self.feed.reset()
+                self.feed.epoch = "pg"
+                self.feed.last_seq = last_value if is_called else 0
+                self._connected.set()
+                logger.info("Plant change notifications connected")
+                while True:
+                    garden_id, change_type, plant_id, plant = await self._outbox.get()
+                    await self._notify(connection, garden_id, change_type, plant_id, plant)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Plant change notifications failed, reconnecting: %s", e)
+                self._connected.clear()
+                self.feed.reset()
+                await asyncio.sleep(1)
+            finally:
+                if connection is not None:
+                    await connection.close()
+
+    async def _notify(
+        self, connection, garden_id: int, change_type: str, plant_id: int, plant: Optional[dict]
+    ) -> None:
+        payload = _notify_payload(garden_id, change_type, plant_id, plant)
+        async with connection.transaction():
+            await connection.execute("SELECT pg_advisory_xact_lock($1)", NOTIFY_LOCK_KEY)
+            await connection.execute(
+                f"SELECT pg_notify($1, nextval('{NOTIFY_SEQUENCE}')::text || ':' || $2)", NOTIFY_CHANNEL, payload
+            )
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        seq_text, _, body = payload.partition(":")
+        data = json.loads(body)
+        if data["type"] in CHANGE_TYPES:
+            self.feed.append(PlantChange(int(seq_text), data["garden"], data["type"], data["id"], data["plant"]))
+        elif data["type"] == RESET_TYPE:
+            self.feed.apply_reset(int(seq_text), data["garden"])
+
+
+# Shared feed used by the plant router
+change_feed = ChangeFeed(buffer_size=int(os.getenv("PLANT_CHANGES_BUFFER", "1000")))
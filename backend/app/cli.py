@@ -0,0 +1,250 @@
+# cli.py
+#
+# Command-line tasks for the backend, run from the backend/ directory:
+#
+#     python -m app.cli migrate            # create or upgrade the database schema
+#     python -m app.cli migrate --sql      # print the SQL instead of running it
+#     python -m app.cli import plants.csv --garden 2   # bulk-import a CSV / NDJSON file
+#
+# The API never creates or changes tables itself. Run "migrate" once before
+# starting the server (the Docker image does this on every start; it does
+# nothing when the schema is already up to date).
+#
+# Alembic and the models are imported inside the commands, so importing this
+# module (or the app) stays cheap.
+
+import argparse
+import json
+import logging
+import sys
+import time
+import warnings
+from pathlib import Path
+from typing import List, Optional
+
+from . import database
+
+logger = logging.getLogger(__name__)
+
+# backend/ (holds alembic.ini and the migrations/ folder)
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def alembic_config(database_url: Optional[str] = None):
+    """
+    Returns the Alembic configuration for backend/migrations, whatever the current directory is.
+
+    Args:
+        database_url (str, optional): Database to migrate; defaults to DATABASE_URL
+
+    Returns:
+        alembic.config.Config: Configuration for alembic.command functions
+    """
+    from alembic.config import Config
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    config.attributes["database_url"] = database_url or database.SQLALCHEMY_DATABASE_URL
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def wait_for_database(database_url: str, timeout: float) -> None:
+    """
+    Waits until the database accepts connections.
+
+    Args:
+        database_url (str): Database to connect to
+        timeout (float): Seconds to keep retrying (0 = try once)
+
+    Raises:
+        sqlalchemy.exc.OperationalError: If the database is still unreachable after timeout
+    """
+    from sqlalchemy import create_engine, exc, pool, text
+
+    engine = create_engine(database_url, poolclass=pool.NullPool)
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                return
+            except exc.OperationalError as e:
+                if time.monotonic() >= deadline:
+                    raise
+                logger.info("Database not ready yet, retrying: %s", e)
+                time.sleep(1)
+    finally:
+        engine.dispose()
+
+
+def _adopt_unversioned_schema(config, database_url: str) -> None:
+    """
+    Marks a database created by the old create_all() startup as migrated.
+
+    Before migrations were run on startup, the app created its tables itself,
+    so such databases have tables but no alembic_version table. If the tables
+    match the current models exactly, the database is stamped as up to date;
+    otherwise the right revision has to be stamped by hand.
+
+    Raises:
+        SystemExit: If the existing tables don't match the current models
+    """
+    from alembic import command
+    from alembic.autogenerate import compare_metadata
+    from alembic.runtime.migration import MigrationContext
+    from sqlalchemy import create_engine, pool
+
+    from . import models
+
+    def include_object(obj, name, type_, reflected, compare_to):
+        # The search indexes are only created on PostgreSQL (see models.py)
+        return not (type_ == "index" and name in models.POSTGRESQL_ONLY_INDEXES and not is_postgresql)
+
+    engine = create_engine(database_url, poolclass=pool.NullPool)
+    is_postgresql = engine.dialect.name == "postgresql"
+    try:
+        with engine.connect() as connection:
+            context = MigrationContext.configure(connection, opts={"include_object": include_object})
+            with warnings.catch_warnings():
+                # SQLite can't reflect the expression index; it is skipped either way
+                warnings.filterwarnings("ignore", message="autogenerate skipping")
+                differences = compare_metadata(context, models.Base.metadata)
+    finally:
+        engine.dispose()
+    if differences:
+        for difference in differences:
+            logger.error("Schema difference: %s", difference)
+        raise SystemExit(
+            "The database has tables but no migration history, and they don't match the current models. "
+            "Mark the revision they match with 'alembic stamp <revision>' (see migrations/versions/), "
+            "then run migrate again."
+        )
+    logger.warning("Database was created without migrations and matches the models; marking it as up to date")
+    command.stamp(config, "head")
+
+
+def migrate(revision: str = "head", database_url: Optional[str] = None, sql: bool = False, wait: float = 0) -> None:
+    """
+    Creates or upgrades the database schema with the Alembic migrations.
+
+    Args:
+        revision (str): Revision to upgrade to (default: the latest)
+        database_url (str, optional): Database to migrate; defaults to DATABASE_URL
+        sql (bool): Print the SQL instead of running it (nothing is changed)
+        wait (float): Seconds to wait for the database to accept connections first
+    """
+    from alembic import command
+    from sqlalchemy import create_engine, inspect, pool
+
+    config = alembic_config(database_url)
+    url = config.attributes["database_url"]
+    if sql:
+        command.upgrade(config, revision, sql=True)
+        return
+
+    wait_for_database(url, wait)
+    engine = create_engine(url, poolclass=pool.NullPool)
+    try:
+        with engine.connect() as connection:
+            inspector = inspect(connection)
+            unversioned = inspector.has_table("plants") and not inspector.has_table("alembic_version")
+    finally:
+        engine.dispose()
+    if unversioned:
+        _adopt_unversioned_schema(config, url)
+
+    start = time.perf_counter()
+    command.upgrade(config, revision)
+    logger.info("Database schema is at revision %s (%.2f s)", revision, time.perf_counter() - start)
+
+
+# Bytes read from an import file at a time
+IMPORT_CHUNK_SIZE = 64 * 1024
+
+
+def import_file(path: str, garden_id: int, import_format: Optional[str] = None) -> dict:
+    """
+    Bulk-imports a CSV or NDJSON file of plants into a garden (see bulk_import.py).
+
+    With PLANT_CHANGES_NOTIFY=true (PostgreSQL), running servers are told about
+    the import when it commits, as after POST /plants:import: they drop their
+    cached plant lists, reload their reminders and tell open change streams to
+    reload. Without it they don't find out: cached plant lists are served until
+    they expire (PLANT_CACHE_TTL), the imported plants get no watering reminders
+    and open change streams don't show them until the servers are restarted.
+
+    Args:
+        path (str): File to import ("-" reads standard input)
+        garden_id (int): Garden to import into
+        import_format (str, optional): "csv" or "ndjson"; taken from the file extension when omitted
+
+    Returns:
+        dict: The import report (rows received, imported and rejected, with reasons)
+
+    Raises:
+        SystemExit: If the format is unknown, the file can't be read as that format,
+            or the garden does not exist
+    """
+    from . import bulk_import, changes
+    from .routers.plant_router import PlantSchema
+
+    if import_format is None:
+        extension = Path(path).suffix.lower()
+        import_format = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}.get(extension)
+    if import_format is None:
+        raise SystemExit(f"Can't tell the format of {path}; pass --format csv or --format ndjson")
+
+    source = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        chunks = iter(lambda: source.read(IMPORT_CHUNK_SIZE), b"")
+        with database.get_engine().begin() as connection:
+            report = bulk_import.import_plants(
+                connection, bulk_import.iter_lines(chunks), import_format, garden_id, PlantSchema
+            )
+            if report.imported and changes.notify_enabled():
+                if connection.dialect.name == "postgresql":
+                    changes.notify_reset(connection, garden_id)
+                else:
+                    logger.warning("PLANT_CHANGES_NOTIFY needs PostgreSQL; servers are not told about the import")
+    except (bulk_import.ImportFormatError, bulk_import.GardenNotFoundError) as e:
+        raise SystemExit(f"Can't import {path}: {e}")
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+    return report.to_dict()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of "python -m app.cli"; returns the process exit code."""
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Plant Tracker backend tasks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser("migrate", help="Create or upgrade the database schema")
+    migrate_parser.add_argument("--revision", default="head", help="Revision to upgrade to (default: head)")
+    migrate_parser.add_argument("--sql", action="store_true", help="Print the SQL instead of running it")
+    migrate_parser.add_argument(
+        "--wait", type=float, default=30, help="Seconds to wait for the database to come up (default: 30)"
+    )
+
+    import_parser = commands.add_parser("import", help="Bulk-import plants from a CSV or NDJSON file")
+    import_parser.add_argument("path", help="File to import (- for standard input)")
+    import_parser.add_argument("--garden", type=int, default=1, help="Garden to import into (default: 1)")
+    import_parser.add_argument("--format", choices=["csv", "ndjson"], help="File format (default: from the extension)")
+
+    args = parser.parse_args(argv)
+    from .logging_config import configure_logging
+
+    configure_logging(use_queue=False)  # LOG_LEVEL / LOG_FORMAT apply as for the server
+    logging.getLogger("alembic.runtime.plugins").setLevel(logging.WARNING)  # One line per plugin otherwise
+    if args.command == "migrate":
+        migrate(args.revision, sql=args.sql, wait=args.wait)
+    elif args.command == "import":
+        report = import_file(args.path, args.garden, args.format)
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
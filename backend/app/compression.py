@@ -0,0 +1,144 @@
+# compression.py
+#
+# Response compression middleware (Brotli and gzip).
+#
+# Large plant listings are mostly repeated JSON keys and words, so they compress
+# very well. This middleware picks the best encoding the client accepts, in the
+# order configured by the COMPRESSION environment variable, and leaves small
+# responses (below COMPRESSION_MINIMUM_SIZE bytes) uncompressed because the
+# saving would not be worth the CPU time.
+#
+# Brotli needs the optional "brotli" package; without it only gzip is offered.
+# Streaming responses such as text/event-stream are never compressed.
+
+import os
+from typing import Any, Dict, List, Optional
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+
+class BrotliResponder(IdentityResponder):
+    """Compresses a response body with Brotli (same buffering rules as Starlette's GZipResponder)."""
+
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int):
+        super().__init__(app, minimum_size)
+        self.quality = quality
+        self._compressor: Any = None  # brotli.Compressor, created on the first chunk
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        compressed = self._compressor.process(body)
+        # Flush each streamed chunk so the client can decode it right away
+        return compressed + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Parses an Accept-Encoding header into {encoding: quality}.
+
+    Example: "gzip;q=0.8, br" -> {"gzip": 0.8, "br": 1.0}
+    """
+    accepted = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compresses HTTP responses with the best encoding both sides support.
+
+    Args:
+        app (ASGIApp): The application to wrap
+        encodings (List[str]): Encodings to offer, in order of preference ("br", "gzip")
+        minimum_size (int): Responses smaller than this many bytes are sent uncompressed
+        gzip_level (int): gzip compression level (1 = fastest, 9 = smallest)
+        brotli_quality (int): Brotli quality (0 = fastest, 11 = smallest)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: List[str],
+        minimum_size: int = 1000,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        # Brotli can only be offered when the package is installed
+        self.encodings = [name for name in encodings if name == "gzip" or (name == "br" and brotli is not None)]
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        """Returns the first configured encoding the client accepts, or None."""
+        accepted = parse_accept_encoding(accept_encoding)
+        for name in self.encodings:
+            if accepted.get(name, accepted.get("*", 0.0)) > 0:
+                return name
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder: ASGIApp
+        if encoding == "br":
+            responder = BrotliResponder(self.app, self.minimum_size, quality=self.brotli_quality)
+        elif encoding == "gzip":
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+def compression_settings_from_env() -> Optional[dict]:
+    """
+    Reads the compression settings from the environment.
+
+    COMPRESSION                  Encodings to offer, in order of preference (default "br,gzip";
+                                 "off" disables compression)
+    COMPRESSION_MINIMUM_SIZE     Smallest response, in bytes, worth compressing (default 1000)
+    COMPRESSION_GZIP_LEVEL       gzip level 1-9 (default 6)
+    COMPRESSION_BROTLI_QUALITY   Brotli quality 0-11 (default 4, fast enough for dynamic responses)
+
+    Returns:
+        dict: Keyword arguments for CompressionMiddleware, or None when compression is disabled
+    """
+    encodings = [
+        name.strip().lower()
+        for name in os.getenv("COMPRESSION", "br,gzip").split(",")
+        if name.strip().lower() in SUPPORTED_ENCODINGS
+    ]
+    if not encodings:
+        return None
+    return {
+        "encodings": encodings,
+        "minimum_size": int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1000")),
+        "gzip_level": int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+        "brotli_quality": int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4")),
+    }
@@ -1,10 +1,582 @@
-# This file is intended to contain CRUD (Create, Read, Update, Delete) operations for the database.
-# In a larger FastAPI project, you would define functions here to interact with the database models.
-# For example, you might have functions like create_plant, get_plant_by_id, update_plant, delete_plant, etc.
-# These functions would be imported and used by your API routers to keep business logic separate from route definitions.
+# This file contains CRUD (Create, Read, Update, Delete) operations for the Plant
+# and Garden models. Each function interacts with the database using SQLAlchemy ORM.
+#
+# Every plant belongs to a garden (tenant). Functions that look plants up by
+# name, or work on a set of plants, take a garden_id and only ever see that
+# garden's plants. Single-plant writes take a WHERE condition that the router
+# already limits to the caller's garden.
+#
+# Most single-plant logic still lives directly in the router file (plant_router.py).
+# The functions here are the set-based helpers used by the batch endpoints: each one
+# handles many plants with a single SQL statement instead of one query per plant.
+# The single-plant writes (insert_plant, update_plant, delete_plant) likewise do their
+# work in one round trip with INSERT/UPDATE/DELETE ... RETURNING.
+# They never commit; the caller decides when the whole batch is committed.
+#
+# Every write to a garden's plants first claims version numbers from the garden
+# (claim_row_versions) and stamps the changed rows with them; deletes leave a
+# tombstone with their version. GET /plants/sync uses these to send a client
+# only what changed since the version it last saw (get_plant_changes).
 #
-# In this project, the CRUD logic is currently handled directly in the router file (plant_router.py),
-# so this file is empty. You can use it in the future if you want to refactor or expand your backend.
+# All functions are async and take the session from database.get_async_db()
+# (an AsyncSession, or the SyncSessionAdapter fallback).
 
-# This file contains CRUD (Create, Read, Update, Delete) operations for the Plant
-# model. Each function interacts with the database using SQLAlchemy ORM.
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import (
+    DateTime, Integer, bindparam, case, delete, exists, false, func, insert, literal, null, or_, select, true,
+    union_all, update
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models
+from .search import DESCRIPTION_SCORE, SUBSTRING_BONUS
+from .watering import next_due_after, parse_watering_schedule, plus_hours
+
+
+async def add_user_if_missing(db: AsyncSession, user_id: int) -> None:
+    """
+    Adds a users row for an owner the first time it is seen, in one INSERT ... SELECT. Does not commit.
+
+    Args:
+        db (AsyncSession): Database session
+        user_id (int): The user's ID (from the X-User-ID header)
+    """
+    user = models.User
+    missing = select(literal(user_id), literal(models.utc_now(), DateTime(timezone=True))).where(
+        ~exists().where(user.id == user_id)
+    )
+    await db.execute(insert(user).from_select([user.id, user.created_at], missing))
+
+
+async def create_garden(db: AsyncSession, name: str, owner_id: Optional[int] = None) -> dict:
+    """
+    Creates a garden with INSERT ... RETURNING. Does not commit.
+
+    Args:
+        db (AsyncSession): Database session
+        name (str): Display name of the garden
+        owner_id (int, optional): The user who owns it (None: a shared garden);
+            the users row must exist (see add_user_if_missing)
+
+    Returns:
+        dict: The new garden's id, name and owner_id
+    """
+    garden = models.Garden
+    statement = insert(garden).values(name=name, owner_id=owner_id).returning(garden.id, garden.name, garden.owner_id)
+    return dict((await db.execute(statement)).one()._mapping)
+
+
+async def get_garden(db: AsyncSession, garden_id: int) -> Optional[dict]:
+    """
+    Loads one garden by ID.
+
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): ID of the garden
+
+    Returns:
+        Optional[dict]: The garden's id, name and owner_id, or None if it does not exist
+    """
+    garden = models.Garden
+    row = (await db.execute(select(garden.id, garden.name, garden.owner_id).where(garden.id == garden_id))).first()
+    return dict(row._mapping) if row is not None else None
+
+
+def row_version_claim(garden_id: int, count: int):
+    """
+    Builds the statement behind claim_row_versions (also run by bulk_import.py on a sync connection).
+
+    Returns:
+        UPDATE gardens ... RETURNING row_version, which returns the last claimed version
+    """
+    garden = models.Garden
+    return (
+        update(garden)
+        .where(garden.id == garden_id)
+        .values(row_version=garden.row_version + count)
+        .returning(garden.row_version)
+    )
+
+
+async def claim_row_versions(db: AsyncSession, garden_id: int, count: int) -> Optional[int]:
+    """
+    Claims `count` consecutive version numbers in a garden for the current transaction.
+
+    The UPDATE locks the garden's row until the transaction ends, so another
+    write to the same garden waits for this one to commit before it gets
+    higher numbers. That keeps versions in commit order, which is what lets a
+    sync client trust that nothing below its last version is still to come.
+    Numbers claimed by a transaction that rolls back are simply never used.
+
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden being written to
+        count (int): How many numbers to claim (one per changed row)
+
+    Returns:
+        Optional[int]: The first claimed number (the others follow it), or None if the garden does not exist
+    """
+    last = (await db.execute(row_version_claim(garden_id, count))).scalar()
+    return last - count + 1 if last is not None else None
+
+
+async def find_plant_ids_by_names(db: AsyncSession, garden_id: int, names: Iterable[str]) -> Dict[str, int]:
+    """
+    Looks up many plant names in one garden with one query.
+
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden to look in
+        names (Iterable[str]): Normalized plant names (see models.normalize_plant_name)
+
+    Returns:
+        Dict[str, int]: Normalized name -> plant ID, for every name that already exists
+    """
+    names = list(set(names))
+    if not names:
+        return {}
+    normalized = models.Plant.name_normalized
+    rows = await db.execute(
+        select(normalized, models.Plant.id).where(models.Plant.garden_id == garden_id, normalized.in_(names))
+    )
+    return {name: plant_id for name, plant_id in rows}
+
+
+async def find_existing_plant_ids(db: AsyncSession, garden_id: int, plant_ids: Iterable[int]) -> set:
+    """
+    Returns which of the given plant IDs exist in a garden, using one query.
+
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden to look in
+        plant_ids (Iterable[int]): Plant IDs to check
+
+    Returns:
+        set: The subset of plant_ids found in the garden
+    """
+    plant_ids = list(set(plant_ids))
+    if not plant_ids:
+        return set()
+    plant = models.Plant
+    return set(await db.scalars(select(plant.id).where(plant.garden_id == garden_id, plant.id.in_(plant_ids))))
+
+
+def _with_name_normalized(rows: List[dict]) -> List[dict]:
+    """Adds the name_normalized key to rows that set a name (Core statements skip the ORM validator)."""
+    return [
+        {**row, "name_normalized": models.normalize_plant_name(row["name"])} if "name" in row else row
+        for row in rows
+    ]
+
+
+def _with_derived_columns(rows: List[dict]) -> List[dict]:
+    """
+    Adds the columns derived from a new plant's values: name_normalized, and the
+    parsed watering interval with the first due date (counted from now).
+    """
+    now = models.utc_now()
+    rows = _with_name_normalized(rows)
+    for row in rows:
+        if "watering_schedule" in row:
+            interval = parse_watering_schedule(row["watering_schedule"])
+            row["watering_interval_hours"] = interval
+            row["next_due"] = next_due_after(now, interval)
+    return rows
+
+
+def _schedule_changes(interval, now) -> dict:
+    """
+    SET clause for an UPDATE that writes a (possibly unchanged) watering schedule.
+
+    When the parsed interval changes, next_due is recalculated from the last
+    watering (or from now if the plant was never watered). Otherwise next_due is
+    left alone, so editing a plant's name or description does not move its due date.
+
+    Args:
+        interval: New interval in hours (a value or a bindparam)
+        now: Current time (a value or a bindparam)
+    """
+    plant = models.Plant
+    changed = plant.watering_interval_hours.is_distinct_from(interval) | plant.next_due.is_(None)
+    return {
+        "watering_interval_hours": interval,
+        "next_due": case(
+            (changed, plus_hours(func.coalesce(plant.last_watered, now), interval)),
+            else_=plant.next_due,
+        ),
+    }
+
+
+async def insert_plant(db: AsyncSession, values: dict) -> dict:
+    """
+    Inserts one plant with INSERT ... RETURNING, so the new row (including its
+    ID and server-generated columns) comes back without a second query.
+
+    Args:
+        db (AsyncSession): Database session
+        values (dict): Column values for the new plant
+
+    Returns:
+        dict: Every column of the new row
+
+    Raises:
+        IntegrityError: If another plant in the garden already has the same
+            (normalized) name, or the garden does not exist
+    """
+    statement = (
+        insert(models.Plant)
+        .values(**_with_derived_columns([values])[0])
+        .returning(*models.Plant.__table__.c)
+    )
+    return dict((await db.execute(statement)).one()._mapping)
+
+
+async def update_plant(db: AsyncSession, condition, values: dict) -> Optional[dict]:
+    """
+    Updates the plant matching `condition` with a single UPDATE ... RETURNING.
+
+    Name conflicts are not checked beforehand: the unique index on
+    (garden_id, name_normalized) rejects them, which is also safe against concurrent requests.
+
+    Args:
+        db (AsyncSession): Database session
+        condition: WHERE clause that selects at most one plant (by garden and id or name_normalized)
+        values (dict): New column values
+
+    Returns:
+        Optional[dict]: Every column of the updated row, or None if no plant matched
+
+    Raises:
+        IntegrityError: If the new name belongs to another plant
+    """
+    values = _with_name_normalized([values])[0]
+    if "watering_schedule" in values:
+        values.update(_schedule_changes(parse_watering_schedule(values["watering_schedule"]), models.utc_now()))
+    statement = (
+        update(models.Plant)
+        .where(condition)
+        .values(**values)
+        .returning(*models.Plant.__table__.c)
+        .execution_options(synchronize_session=False)
+    )
+    row = (await db.execute(statement)).first()
+    return dict(row._mapping) if row is not None else None
+
+
+async def delete_plant(db: AsyncSession, garden_id: int, condition, row_version: int) -> Optional[int]:
+    """
+    Deletes the plant matching `condition` with a single DELETE ... RETURNING id,
+    and records a tombstone for it.
+
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden the plant belongs to
+        condition: WHERE clause that selects at most one plant (by garden and id or name_normalized)
+        row_version (int): Version of the delete (from claim_row_versions)
+
+    Returns:
+        Optional[int]: The deleted plant's ID, or None if no plant matched
+    """
+    statement = (
+        delete(models.Plant)
+        .where(condition)
+        .returning(models.Plant.id)
+        .execution_options(synchronize_session=False)
+    )
+    plant_id = (await db.execute(statement)).scalar()
+    if plant_id is not None:
+        await _insert_tombstones(db, garden_id, [plant_id], row_version)
+    return plant_id
+
+
+async def _insert_tombstones(db: AsyncSession, garden_id: int, plant_ids: List[int], first_version: int) -> None:
+    """Records that plants were deleted, numbering the deletes from first_version."""
+    now = models.utc_now()
+    rows = [
+        {"garden_id": garden_id, "row_version": first_version + offset, "plant_id": plant_id, "deleted_at": now}
+        for offset, plant_id in enumerate(plant_ids)
+    ]
+    await db.execute(insert(models.PlantTombstone), rows)
+
+
+async def bulk_insert_plants(db: AsyncSession, rows: List[dict]) -> List[int]:
+    """
+    Inserts many plants with a multi-row INSERT ... RETURNING.
+
+    Args:
+        db (AsyncSession): Database session
+        rows (List[dict]): Column values for each new plant, including its garden_id
+
+    Returns:
+        List[int]: The new plant IDs, in the same order as rows
+    """
+    if not rows:
+        return []
+    # sort_by_parameter_order guarantees the returned IDs line up with rows,
+    # even when SQLAlchemy splits the INSERT into several multi-row statements
+    statement = insert(models.Plant).returning(models.Plant.id, sort_by_parameter_order=True)
+    return list(await db.scalars(statement, _with_derived_columns(rows)))
+
+
+async def bulk_update_plants(db: AsyncSession, garden_id: int, rows: List[dict]) -> None:
+    """
+    Updates many plants in one garden by ID in one executemany UPDATE.
+
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden the plants belong to (other gardens' plants are never touched)
+        rows (List[dict]): Column values for each plant, each including its "id"
+            (every row must set the same columns)
+    """
+    if not rows:
+        return
+    rows = _with_name_normalized(rows)
+    table = models.Plant.__table__
+    # Parameters are prefixed with "b_" because SQLAlchemy reserves the plain
+    # column names for the SET clause
+    values: Dict[str, Any] = {column: bindparam(f"b_{column}") for column in rows[0] if column != "id"}
+    parameters = [{f"b_{column}": value for column, value in row.items()} for row in rows]
+    if "watering_schedule" in rows[0]:
+        now = models.utc_now()
+        values.update(_schedule_changes(
+            bindparam("b_watering_interval_hours", type_=Integer), bindparam("b_now", type_=DateTime(timezone=True))
+        ))
+        for row in parameters:
+            row["b_watering_interval_hours"] = parse_watering_schedule(row["b_watering_schedule"])
+            row["b_now"] = now
+    statement = (
+        update(table)
+        .where(table.c.garden_id == garden_id, table.c.id == bindparam("b_id"))
+        .values(**values)
+    )
+    await db.execute(statement, parameters)
+
+
+async def bulk_delete_plants(db: AsyncSession, garden_id: int, plant_ids: Iterable[int], first_version: int) -> set:
+    """
+    Deletes many plants in one garden with a single DELETE ... RETURNING id,
+    and records a tombstone for each deleted plant.
+
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden the plants belong to
+        plant_ids (Iterable[int]): IDs of the plants to delete
+        first_version (int): First of one claimed version per distinct ID
+            (the numbers of IDs that don't exist go unused)
+
+    Returns:
+        set: The IDs that were actually deleted
+    """
+    plant_ids = list(set(plant_ids))
+    if not plant_ids:
+        return set()
+    statement = (
+        delete(models.Plant)
+        .where(models.Plant.garden_id == garden_id, models.Plant.id.in_(plant_ids))
+        .returning(models.Plant.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = set(await db.scalars(statement))
+    if deleted:
+        await _insert_tombstones(db, garden_id, sorted(deleted), first_version)
+    return deleted
+
+
+async def get_plants_version(db: AsyncSession, garden_id: int) -> Tuple[int, Optional[datetime]]:
+    """
+    Returns a cheap version stamp for one garden's plants.
+
+    The garden's row_version moves forward on every insert, update and delete
+    (see claim_row_versions), so it changes whenever the garden's plants do.
+    It is one primary key lookup; max(updated_at) (for Last-Modified) comes
+    from the (garden_id, updated_at) index.
+
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden to describe
+
+    Returns:
+        Tuple[int, Optional[datetime]]: (the garden's row_version, or 0 if the garden
+        does not exist; newest updated_at or None if empty)
+    """
+    plant = models.Plant
+    last_modified = select(func.max(plant.updated_at)).where(plant.garden_id == garden_id).scalar_subquery()
+    statement = select(models.Garden.row_version, last_modified).where(models.Garden.id == garden_id)
+    row = (await db.execute(statement)).first()
+    return (row[0], row[1]) if row is not None else (0, None)
+
+
+# The columns of one change returned by get_plant_changes
+PLANT_CHANGE_FIELDS = ["id", "row_version", "deleted", "name", "description", "watering_schedule"]
+
+
+async def get_plant_changes(db: AsyncSession, garden_id: int, since: int, limit: int) -> List[dict]:
+    """
+    Returns a garden's plant changes after a version, oldest first.
+
+    Changed plants and tombstones are read with one UNION ALL statement, so
+    both come from the same snapshot of the database, and each side is a range
+    scan of a (garden_id, row_version) index that stops after `limit` rows.
+    Tombstones are skipped when since is 0: a client starting from nothing
+    only needs the plants that exist.
+
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden to read
+        since (int): Return changes with a higher version than this
+        limit (int): Most changes to return
+
+    Returns:
+        List[dict]: PLANT_CHANGE_FIELDS of each change, in row_version order;
+        deletes have "deleted" set and no name, description or schedule
+    """
+    plant = models.Plant
+    tombstone = models.PlantTombstone
+    statement = select(
+        plant.id, plant.row_version, false().label("deleted"), plant.name, plant.description, plant.watering_schedule
+    ).where(plant.garden_id == garden_id, plant.row_version > since)
+    if since > 0:
+        deleted = select(
+            tombstone.plant_id, tombstone.row_version, true(), null(), null(), null()
+        ).where(tombstone.garden_id == garden_id, tombstone.row_version > since)
+        statement = union_all(statement, deleted)  # type: ignore[assignment]
+    statement = statement.order_by(statement.selected_columns.row_version).limit(limit)
+    return [
+        {**dict(zip(PLANT_CHANGE_FIELDS, row)), "deleted": bool(row[2])} for row in await db.execute(statement)
+    ]
+
+
+async def get_plant_search_rows(db: AsyncSession, garden_id: int) -> List[Tuple[int, str, str]]:
+    """
+    Loads what the in-process search index needs (see search.py) for every plant in a garden.
+
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden to index
+
+    Returns:
+        List[Tuple[int, str, str]]: (id, name_normalized, description) of every plant in the garden
+    """
+    plant = models.Plant
+    rows = await db.execute(
+        select(plant.id, plant.name_normalized, plant.description).where(plant.garden_id == garden_id)
+    )
+    return [(row.id, row.name_normalized, row.description) for row in rows]
+
+
+async def get_plants_by_ids(db: AsyncSession, garden_id: int, plant_ids: List[int]) -> Dict[int, dict]:
+    """
+    Loads many plants in one garden by ID with one IN query.
+
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden the plants belong to
+        plant_ids (List[int]): Plant IDs to load
+
+    Returns:
+        Dict[int, dict]: Plant ID -> every column of the row, for the IDs that exist in the garden
+    """
+    if not plant_ids:
+        return {}
+    table = models.Plant.__table__
+    rows = await db.execute(select(*table.c).where(table.c.garden_id == garden_id, table.c.id.in_(plant_ids)))
+    return {row.id: dict(row._mapping) for row in rows}
+
+
+async def search_plants_postgres(db: AsyncSession, garden_id: int, query: str, limit: int) -> List[dict]:
+    """
+    Ranked search of one garden's plants using PostgreSQL's pg_trgm and full-text search indexes.
+
+    A plant matches if its name is similar to the query (trigram similarity
+    above pg_trgm's threshold), contains the query, or its description
+    contains every query word. Names count most; see search.py for the
+    matching in-process ranking used on other databases.
+
+    Args:
+        db (AsyncSession): Database session (PostgreSQL)
+        garden_id (int): Garden to search
+        query (str): Search text
+        limit (int): Most results to return
+
+    Returns:
+        List[dict]: Plant columns plus "score", best match first
+    """
+    needle = " ".join(query.lower().split())
+    name = models.Plant.name_normalized
+    document = func.to_tsvector(models.SEARCH_LANGUAGE, models.Plant.description)
+    words = func.plainto_tsquery(models.SEARCH_LANGUAGE, needle)
+    # The LIKE pattern is built here, not in SQL, so the planner sees a constant
+    # it can look up in the trigram index
+    escaped = needle.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    contains = name.like(f"%{escaped}%", escape="/")
+    description_match = document.op("@@")(words)
+    score = (
+        func.similarity(name, needle)
+        + case((contains, SUBSTRING_BONUS), else_=0.0)
+        + case((description_match, DESCRIPTION_SCORE), else_=0.0) * (1 + func.ts_rank(document, words))
+    ).label("score")
+    statement = (
+        select(*models.Plant.__table__.c, score)
+        .where(models.Plant.garden_id == garden_id, or_(name.op("%")(needle), contains, description_match))
+        .order_by(score.desc(), models.Plant.id)
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in await db.execute(statement)]
+
+
+async def mark_plant_watered(db: AsyncSession, condition, watered_at: datetime, row_version: int) -> Optional[dict]:
+    """
+    Records that a plant was watered and moves its next_due forward by its
+    interval, with one UPDATE ... RETURNING (only this plant's row is touched).
+
+    Args:
+        db (AsyncSession): Database session
+        condition: WHERE clause that selects at most one plant (by garden and id or name_normalized)
+        watered_at (datetime): When the plant was watered (UTC)
+        row_version (int): Version of the change (from claim_row_versions)
+
+    Returns:
+        Optional[dict]: Every column of the updated row, or None if no plant matched
+    """
+    plant = models.Plant
+    statement = (
+        update(plant)
+        .where(condition)
+        .values(
+            last_watered=watered_at,
+            row_version=row_version,
+            next_due=plus_hours(literal(watered_at, DateTime(timezone=True)), plant.watering_interval_hours),
+        )
+        .returning(*plant.__table__.c)
+        .execution_options(synchronize_session=False)
+    )
+    row = (await db.execute(statement)).first()
+    return dict(row._mapping) if row is not None else None
+
+
+async def get_due_plants(db: AsyncSession, garden_id: int, before: datetime, limit: int) -> List[dict]:
+    """
+    Returns a garden's plants due for watering at or before a time, soonest first.
+
+    (garden_id, next_due) is indexed, so this is an index range scan that stops after
+    `limit` rows; plants without a parsed schedule have no next_due and are skipped.
+
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden to look in
+        before (datetime): Latest due time to include (UTC)
+        limit (int): Most plants to return
+
+    Returns:
+        List[dict]: Every column of each due plant, ordered by next_due, then ID
+    """
+    table = models.Plant.__table__
+    statement = (
+        select(*table.c)
+        .where(table.c.garden_id == garden_id, table.c.next_due <= before)
+        .order_by(table.c.next_due, table.c.id)
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in await db.execute(statement)]
@@ -0,0 +1,118 @@
+# gardens.py
+#
+# Picks the garden (tenant) a request works on.
+#
+# Every /api/v1/plants endpoint depends on get_garden_id, so all plant reads
+# and writes are limited to one garden. Clients choose the garden with the
+# X-Garden-ID header, or the garden_id query parameter where headers can't be
+# set (the browser's EventSource, used by GET /plants/changes, can't send
+# custom headers). Requests that send neither use models.DEFAULT_GARDEN_ID, so
+# single-garden clients keep working unchanged.
+#
+# Gardens can belong to a user (models.Garden.owner_id). The caller's user ID
+# comes from the X-User-ID header, and a garden that has an owner can only be
+# used by that user; to anyone else it answers 404, as if it didn't exist.
+# Gardens without an owner (the default garden, and gardens created without
+# X-User-ID) are shared by every client.
+#
+# Note: the app does not authenticate anyone. X-User-ID must be set by an
+# authenticating reverse proxy in front of the API, which also strips any
+# X-User-ID sent by the client itself.
+#
+# Every plant request needs its garden's owner. Owners never change and gardens
+# are never deleted, so each worker looks an owner up once and keeps it in
+# _garden_owners; that lookup isn't counted in the route's query budget.
+
+from typing import Dict, Optional, Tuple
+
+from fastapi import Depends, Header, HTTPException, Query
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from . import models
+from .database import SessionLocal
+from .metrics import current_query_stats
+from .models import DEFAULT_GARDEN_ID
+
+# Garden ID -> owner's user ID (None: shared garden), for gardens known to exist
+_garden_owners: Dict[int, Optional[int]] = {}
+
+
+def get_user_id(
+    x_user_id: Optional[int] = Header(None, ge=1, description="ID of the signed-in user (set by the auth proxy)"),
+) -> Optional[int]:
+    """FastAPI dependency that returns the caller's user ID, or None for anonymous callers."""
+    return x_user_id
+
+
+def remember_garden_owner(garden_id: int, owner_id: Optional[int]) -> None:
+    """Records the owner of a garden this worker just created, so its first request needs no lookup."""
+    _garden_owners[garden_id] = owner_id
+
+
+def _load_garden_owner(garden_id: int) -> Tuple[bool, Optional[int]]:
+    """Reads a garden's owner from the primary: (garden exists, owner ID)."""
+    with SessionLocal() as db:
+        row = db.execute(select(models.Garden.owner_id).where(models.Garden.id == garden_id)).first()
+    return (row is not None, row[0] if row is not None else None)
+
+
+async def check_garden_access(garden_id: int, user_id: Optional[int]) -> None:
+    """
+    Checks that the caller may use a garden.
+
+    Gardens that don't exist are let through: writes to them fail with 404 on
+    the plants.garden_id foreign key, and reads find nothing.
+
+    Args:
+        garden_id (int): The garden the request is for
+        user_id (int, optional): The caller (see get_user_id)
+
+    Raises:
+        HTTPException: 404 if the garden belongs to another user
+    """
+    if garden_id not in _garden_owners:
+        # Not part of the request's own queries, so it is left out of the query budget
+        token = current_query_stats.set(None)
+        try:
+            found, owner_id = await run_in_threadpool(_load_garden_owner, garden_id)
+        finally:
+            current_query_stats.reset(token)
+        if not found:
+            return  # Not cached: the garden may be created later
+        _garden_owners[garden_id] = owner_id
+    owner_id = _garden_owners[garden_id]
+    if owner_id is not None and owner_id != user_id:
+        raise HTTPException(status_code=404, detail="Garden not found")
+
+
+async def get_garden_id(
+    x_garden_id: Optional[int] = Header(None, ge=1, description="ID of the garden to work on"),
+    garden_id: Optional[int] = Query(None, ge=1, description="Same as X-Garden-ID, for clients that can't set headers"),
+    user_id: Optional[int] = Depends(get_user_id),
+) -> int:
+    """
+    FastAPI dependency that returns the garden ID for the current request.
+
+    Args:
+        x_garden_id (int, optional): Garden ID from the X-Garden-ID header
+        garden_id (int, optional): Garden ID from the garden_id query parameter
+        user_id (int, optional): The caller, from the X-User-ID header
+
+    Returns:
+        int: The garden to use (DEFAULT_GARDEN_ID if none was given)
+
+    Raises:
+        HTTPException: 400 if the header and query parameter name different gardens,
+            404 if the garden belongs to another user
+    """
+    if x_garden_id is not None and garden_id is not None and x_garden_id != garden_id:
+        raise HTTPException(status_code=400, detail="X-Garden-ID header and garden_id parameter disagree")
+    if x_garden_id is not None:
+        chosen = x_garden_id
+    elif garden_id is not None:
+        chosen = garden_id
+    else:
+        chosen = DEFAULT_GARDEN_ID
+    await check_garden_access(chosen, user_id)
+    return chosen
@@ -0,0 +1,83 @@
+# http_cache.py
+#
+# Helpers for HTTP conditional requests (ETag / If-None-Match and
+# Last-Modified / If-Modified-Since).
+#
+# When a response carries an ETag, the browser sends it back in If-None-Match
+# the next time it asks for the same URL. If the data has not changed, the
+# server answers "304 Not Modified" with no body, so neither the database nor
+# the network has to carry the full plant list again.
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """
+    Builds a weak ETag from the values that identify a version of a resource.
+
+    The ETag is weak (W/"...") because the same data may be sent with
+    different encodings (for example gzip-compressed or not).
+    """
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treats naive datetimes (SQLite returns these) as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag."""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Checks whether the client's cached copy is still current.
+
+    If-None-Match takes priority; If-Modified-Since is only used when the
+    client did not send an ETag (as required by RFC 9110).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False  # Ignore malformed dates
+        # HTTP dates have one-second resolution
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def set_cache_headers(response: Response, etag: str, last_modified: Optional[datetime]) -> None:
+    """
+    Adds the validators to a response.
+
+    Cache-Control: no-cache lets the browser keep the response but makes it
+    revalidate (with If-None-Match) before every reuse, so clients never see
+    stale plants.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    """Builds the empty 304 Not Modified response."""
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, last_modified)
+    return response
@@ -0,0 +1,130 @@
+# logging_config.py
+#
+# Application-wide logging setup.
+#
+# Log records are formatted as one JSON object per line (easy to search in log
+# tools) or as plain text for local development. Writing to stderr is slow
+# compared to handling a request, so request code only puts records on an
+# in-memory queue (QueueHandler); a background thread (QueueListener) formats
+# them and does the actual writing.
+#
+# Settings (environment variables):
+#   LOG_LEVEL   Minimum level to log: DEBUG, INFO, WARNING, ... (default INFO)
+#   LOG_FORMAT  "json" (default) or "text"
+#   LOG_QUEUE   "true" (default) to write logs from a background thread,
+#               "false" to write them directly from the calling thread
+#
+# Library code never configures logging itself; it only calls
+# logging.getLogger(__name__) and logs with lazy %-style arguments, e.g.
+#   logger.debug("Found %d plants", count)
+# so nothing is formatted when the level is disabled.
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_STANDARD_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# The running background listener, if any (see configure_logging)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats a log record as a single line of JSON.
+
+    Fields passed with `extra={...}` are added as top-level keys, so
+    logger.info("Plant added", extra={"plant_id": 3}) produces
+    {"time": "...", "level": "INFO", "logger": "...", "message": "Plant added", "plant_id": 3}
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Reads a true/false setting from the environment."""
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    use_queue: Optional[bool] = None,
+    stream=None,
+) -> None:
+    """
+    Configures the root logger. Safe to call more than once; later calls replace
+    the earlier configuration.
+
+    Args:
+        level (str, optional): Log level name; defaults to LOG_LEVEL or "INFO"
+        log_format (str, optional): "json" or "text"; defaults to LOG_FORMAT or "json"
+        use_queue (bool, optional): Write from a background thread; defaults to LOG_QUEUE or True
+        stream (optional): Where to write log lines (default: sys.stderr)
+
+    Raises:
+        ValueError: If the level or format is not recognized
+    """
+    global _listener
+
+    level = (level or os.getenv("LOG_LEVEL") or "INFO").upper()
+    log_format = (log_format or os.getenv("LOG_FORMAT") or "json").lower()
+    if use_queue is None:
+        use_queue = _env_bool("LOG_QUEUE", True)
+    if not isinstance(logging.getLevelName(level), int):  # getLevelName maps known names to numbers
+        raise ValueError(f"Unknown log level: {level}")
+    if log_format not in ("json", "text"):
+        raise ValueError(f"Unknown log format: {log_format}")
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JSONFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    shutdown_logging()
+    root = logging.getLogger()
+    for old_handler in list(root.handlers):
+        if getattr(old_handler, "_app_handler", False):
+            root.removeHandler(old_handler)
+
+    if use_queue:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        handler: logging.Handler = logging.handlers.QueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+    else:
+        handler = output
+    setattr(handler, "_app_handler", True)  # Marks the handlers this module owns
+    root.addHandler(handler)
+    root.setLevel(level)
+
+
+def shutdown_logging() -> None:
+    """Stops the background listener, writing out any queued records first."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# Make sure queued records are written when the process exits
+atexit.register(shutdown_logging)
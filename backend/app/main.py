@@ -2,18 +2,56 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .routers.plant_router import router as plant_router
-from . import models
-from . import database
-from .database import engine
+from .routers.garden_router import router as garden_router
+from .routers.metrics_router import router as metrics_router
+from . import database, replicas
 from fastapi.responses import HTMLResponse
+from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import lru_cache
+from .compression import CompressionMiddleware, compression_settings_from_env
+from .logging_config import configure_logging
+from .metrics_middleware import MetricsMiddleware
+from .changes import change_feed
+from .reminders import reminder_scheduler, reminder_sink_from_env
+from .replicas import ReadYourWritesMiddleware
+
+# Importing this module has no side effects: no logging setup, no database
+# connection and no table creation. Everything that touches the outside world
+# happens in lifespan() below, when a server actually starts. The database schema
+# is created and upgraded by "python -m app.cli migrate" (see cli.py), not here.
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Runs once when the server starts (before `yield`) and once when it stops.
+
+    Sets up logging from LOG_LEVEL / LOG_FORMAT / LOG_QUEUE (see logging_config.py),
+    starts the watering reminder scheduler unless REMINDERS=off (see reminders.py)
+    and, with PLANT_CHANGES_NOTIFY=true, the LISTEN/NOTIFY link for the plant
+    change feed (see changes.py). Nothing here waits for the database: the
+    engine connects on the first query, and GET /ready reports whether it can.
+    """
+    configure_logging()
+    sink = reminder_sink_from_env()
+    if sink is not None:
+        await reminder_scheduler.start(sink)
+    await change_feed.start(database.SQLALCHEMY_DATABASE_URL)
+    try:
+        yield
+    finally:
+        await change_feed.stop()
+        await reminder_scheduler.stop()
+        await database.dispose_engines()
+        await replicas.replica_set.dispose()
 
-models.Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Plant Tracker Gardening App API",
     description="Plant Tracker API for managing garden plants",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -24,6 +62,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (e.g. the full plant list) with Brotli or gzip.
+# Set COMPRESSION=off to disable; see compression.py for the other settings.
+compression_settings = compression_settings_from_env()
+if compression_settings is not None:
+    app.add_middleware(CompressionMiddleware, **compression_settings)
+
+# After a successful write, send the client's reads to the primary database for a
+# few seconds, so it sees its own change even if the read replicas lag behind
+# (see replicas.py; does nothing unless DATABASE_REPLICA_URLS is set).
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Record request counts, latency, response sizes and database queries per route
+# (served from GET /metrics). Added last so it wraps all the other middleware.
+app.add_middleware(MetricsMiddleware)
+
 
 def get_db():
     db = database.SessionLocal()
@@ -39,9 +92,13 @@ app.include_router(
     tags=["plants"],
 )
 
-@app.get("/", response_class=HTMLResponse)
-def root():
-    return f"""
+app.include_router(garden_router, prefix="/api/v1", tags=["gardens"])
+
+app.include_router(metrics_router, tags=["metrics"])
+
+# The landing page never changes except for the year in the footer, so it is
+# rendered once per year (per process) instead of on every request.
+LANDING_PAGE_TEMPLATE = """
     <html>
     <head>
         <style>
@@ -91,8 +148,33 @@ def root():
             <h1>🌱 Plant Tracker Gardening App API</h1>
             <p>Welcome to the Plant Tracker Gardening App backend.</p>
             <p>See the <a href='/docs'>Plant Tracker Gardening App API Documentation</a> or <a href='/redoc'>ReDoc - Plant Tracker Gardening App API Reference Documentation</a>.</p>
-            <div class='footer'>Happy Gardening! &copy; {datetime.now().year}</div>
+            <div class='footer'>Happy Gardening! &copy; {year}</div>
         </div>
     </body>
     </html>
     """
+
+# Browsers and proxies may reuse the landing page for an hour
+LANDING_PAGE_CACHE_CONTROL = "public, max-age=3600"
+
+
+@lru_cache(maxsize=2)
+def _render_landing_page(year: int) -> str:
+    """
+    Renders the landing page HTML for the given footer year.
+
+    Args:
+        year (int): Year shown in the copyright footer
+
+    Returns:
+        str: The complete HTML page
+    """
+    return LANDING_PAGE_TEMPLATE.format(year=year)
+
+
+@app.get("/", response_class=HTMLResponse)
+def root():
+    return HTMLResponse(
+        _render_landing_page(datetime.now().year),
+        headers={"Cache-Control": LANDING_PAGE_CACHE_CONTROL},
+    )
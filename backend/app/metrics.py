@@ -0,0 +1,344 @@
+# metrics.py
+#
+# In-process counters that describe how the application is behaving.
+# They are updated from hot paths (for example every time a database connection
+# is checked out of the pool), so recording a value must be cheap: a lock and a
+# few integer additions, no I/O. The values are read by the metrics endpoints in
+# routers/metrics_router.py.
+
+import contextvars
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Upper bounds (in seconds) of the pool checkout wait buckets.
+# A checkout that waits longer than the last bound is counted in "+Inf".
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# Upper bounds of the request latency and database query duration buckets (seconds)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds of the response size buckets (bytes)
+RESPONSE_SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Upper bounds of the "database queries per request" buckets
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+class PoolMetrics:
+    """
+    Records database connection pool events.
+
+    These numbers answer "is the pool the right size?":
+    - long checkout waits or timeouts mean requests are queueing for a connection
+    - frequent overflow checkouts mean pool_size is smaller than normal load
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears every counter (used by tests)."""
+        with self._lock:
+            self.checkouts = 0  # Connections handed out by the pool
+            self.checkout_wait_total = 0.0  # Seconds spent waiting for those connections
+            self.checkout_wait_max = 0.0  # Longest single wait
+            self.checkout_wait_buckets = [0] * (len(CHECKOUT_WAIT_BUCKETS) + 1)
+            self.overflow_checkouts = 0  # Checkouts that needed a connection beyond pool_size
+            self.max_overflow_in_use = 0  # Most overflow connections open at once
+            self.timeouts = 0  # Checkouts that gave up after pool_timeout
+            self.connections_opened = 0  # New DBAPI connections created by the pool
+
+    def record_checkout(self, wait_seconds: float, overflow: int) -> None:
+        """
+        Records one successful checkout.
+
+        Args:
+            wait_seconds (float): How long the caller waited for the connection
+            overflow (int): The pool's overflow count after the checkout
+        """
+        bucket = next(
+            (i for i, bound in enumerate(CHECKOUT_WAIT_BUCKETS) if wait_seconds <= bound),
+            len(CHECKOUT_WAIT_BUCKETS),
+        )
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_total += wait_seconds
+            self.checkout_wait_max = max(self.checkout_wait_max, wait_seconds)
+            self.checkout_wait_buckets[bucket] += 1
+            if overflow > 0:
+                self.overflow_checkouts += 1
+                self.max_overflow_in_use = max(self.max_overflow_in_use, overflow)
+
+    def record_timeout(self) -> None:
+        """Records a checkout that timed out waiting for a free connection."""
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self) -> None:
+        """Records a new DBAPI connection being opened."""
+        with self._lock:
+            self.connections_opened += 1
+
+    def snapshot(self) -> Dict:
+        """Returns a consistent copy of every counter as plain JSON-friendly values."""
+        with self._lock:
+            bounds = [str(bound) for bound in CHECKOUT_WAIT_BUCKETS] + ["+Inf"]
+            return {
+                "checkouts": self.checkouts,
+                "checkout_wait_seconds": {
+                    "total": self.checkout_wait_total,
+                    "max": self.checkout_wait_max,
+                    "buckets": dict(zip(bounds, self.checkout_wait_buckets)),
+                },
+                "overflow_checkouts": self.overflow_checkouts,
+                "max_overflow_in_use": self.max_overflow_in_use,
+                "timeouts": self.timeouts,
+                "connections_opened": self.connections_opened,
+            }
+
+
+# Shared instance updated by the instrumented pools in database.py
+pool_metrics = PoolMetrics()
+
+
+class Histogram:
+    """
+    A Prometheus-style histogram: observations are counted into cumulative
+    buckets ("how many were <= bound"), plus a running sum and count.
+    One set of buckets is kept per combination of label values.
+
+    Args:
+        name (str): Metric name, e.g. "http_request_duration_seconds"
+        help_text (str): One-line description shown by Prometheus
+        label_names (Tuple[str, ...]): Names of the labels, e.g. ("method", "route")
+        buckets (Tuple[float, ...]): Bucket upper bounds in increasing order
+    """
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        """Records one observation for the given label values."""
+        bucket = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [per-bucket counts (last one is +Inf), sum, count]
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bucket] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, labels: Tuple[str, ...]) -> int:
+        """Returns how many observations were recorded for the given label values."""
+        with self._lock:
+            series = self._series.get(labels)
+            return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        """Returns the histogram in the Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: ([*counts], total, count) for labels, (counts, total, count) in self._series.items()}
+        for labels, (counts, total, count) in sorted(series.items()):
+            base = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, bucket_count in zip([*map(_format_value, self.buckets), "+Inf"], counts):
+                cumulative += bucket_count
+                le = _format_labels(self.label_names + ("le",), labels + (bound,))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{base} {_format_value(total)}")
+            lines.append(f"{self.name}_count{base} {count}")
+        return lines
+
+
+class RequestMetrics:
+    """
+    Records HTTP requests and the database queries they run.
+
+    Requests are labelled by route template (for example
+    /api/v1/plants/id/{plant_id}), never by the raw URL, so the number of
+    series stays small no matter which ids clients ask for.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears every counter (used by tests)."""
+        with self._lock:
+            self.requests_total: Dict[Tuple[str, str, str], int] = {}
+            self.in_flight = 0
+            self.db_queries_total = 0
+            self.db_query_errors_total = 0
+        self.request_duration = Histogram(
+            "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"), LATENCY_BUCKETS
+        )
+        self.response_size = Histogram(
+            "http_response_size_bytes", "HTTP response body size by route.", ("method", "route"), RESPONSE_SIZE_BUCKETS
+        )
+        self.request_queries = Histogram(
+            "http_request_db_queries", "Database queries run per HTTP request.",
+            ("method", "route"), QUERY_COUNT_BUCKETS,
+        )
+        self.request_query_duration = Histogram(
+            "http_request_db_duration_seconds", "Time spent in database queries per HTTP request.",
+            ("method", "route"), LATENCY_BUCKETS,
+        )
+        self.query_duration = Histogram(
+            "db_query_duration_seconds", "Duration of individual database queries.", (), LATENCY_BUCKETS
+        )
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(
+        self, method: str, route: str, status: int, seconds: float, response_bytes: int, queries: "QueryStats"
+    ) -> None:
+        """Records a completed request and the database work it did."""
+        labels = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            key = (method, route, str(status))
+            self.requests_total[key] = self.requests_total.get(key, 0) + 1
+        self.request_duration.observe(labels, seconds)
+        self.response_size.observe(labels, response_bytes)
+        self.request_queries.observe(labels, queries.count)
+        self.request_query_duration.observe(labels, queries.seconds)
+
+    def record_query(self, seconds: float, failed: bool = False) -> None:
+        """Records one database query (called from the engine events in database.py)."""
+        with self._lock:
+            self.db_queries_total += 1
+            if failed:
+                self.db_query_errors_total += 1
+        self.query_duration.observe((), seconds)
+
+    def render(self) -> List[str]:
+        """Returns every request and query metric in the Prometheus text format."""
+        with self._lock:
+            requests_total = dict(self.requests_total)
+            in_flight = self.in_flight
+            queries_total = self.db_queries_total
+            query_errors = self.db_query_errors_total
+        lines = ["# HELP http_requests_total HTTP requests by route and status.", "# TYPE http_requests_total counter"]
+        for labels, count in sorted(requests_total.items()):
+            lines.append(f"http_requests_total{_format_labels(('method', 'route', 'status'), labels)} {count}")
+        lines += [
+            "# HELP http_requests_in_flight HTTP requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {in_flight}",
+        ]
+        lines += self.request_duration.render()
+        lines += self.response_size.render()
+        lines += self.request_queries.render()
+        lines += self.request_query_duration.render()
+        lines += [
+            "# HELP db_queries_total Database queries executed.",
+            "# TYPE db_queries_total counter",
+            f"db_queries_total {queries_total}",
+            "# HELP db_query_errors_total Database queries that raised an error.",
+            "# TYPE db_query_errors_total counter",
+            f"db_query_errors_total {query_errors}",
+        ]
+        lines += self.query_duration.render()
+        return lines
+
+
+# Shared instance updated by the metrics middleware and the engine events
+request_metrics = RequestMetrics()
+
+
+class QueryStats:
+    """Database queries run while handling one request."""
+
+    __slots__ = ("count", "seconds", "statements", "budget")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        # (statement, seconds) pairs; None unless SQL profiling is on (see profiling.py)
+        self.statements: Optional[List[Tuple[str, float]]] = None
+        # Most queries the matched route should run; None when it declares no budget
+        self.budget: Optional[int] = None
+
+
+# The QueryStats of the request being handled, if any. The middleware sets it
+# and the engine events add to it. It holds a mutable object, so queries run in
+# a worker thread (which gets a copy of the context) still update it.
+current_query_stats: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _format_value(value: float) -> str:
+    """Formats a number the way Prometheus expects (integers without ".0")."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    """Formats label pairs as {name="value",...} (empty string when there are none)."""
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def render_pool_metrics(snapshot: Dict) -> List[str]:
+    """Converts a PoolMetrics snapshot into the Prometheus text format."""
+    wait = snapshot["checkout_wait_seconds"]
+    lines = [
+        "# HELP db_pool_checkouts_total Connections handed out by the pool.",
+        "# TYPE db_pool_checkouts_total counter",
+        f"db_pool_checkouts_total {snapshot['checkouts']}",
+        "# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled connection.",
+        "# TYPE db_pool_checkout_wait_seconds histogram",
+    ]
+    cumulative = 0
+    for bound, count in wait["buckets"].items():
+        cumulative += count
+        lines.append(f'db_pool_checkout_wait_seconds_bucket{{le="{bound}"}} {cumulative}')
+    lines += [
+        f"db_pool_checkout_wait_seconds_sum {_format_value(wait['total'])}",
+        f"db_pool_checkout_wait_seconds_count {snapshot['checkouts']}",
+        "# HELP db_pool_overflow_checkouts_total Checkouts that needed a connection beyond pool_size.",
+        "# TYPE db_pool_overflow_checkouts_total counter",
+        f"db_pool_overflow_checkouts_total {snapshot['overflow_checkouts']}",
+        "# HELP db_pool_timeouts_total Checkouts that gave up after pool_timeout.",
+        "# TYPE db_pool_timeouts_total counter",
+        f"db_pool_timeouts_total {snapshot['timeouts']}",
+        "# HELP db_pool_connections_opened_total New database connections opened.",
+        "# TYPE db_pool_connections_opened_total counter",
+        f"db_pool_connections_opened_total {snapshot['connections_opened']}",
+    ]
+    return lines
+
+
+def render_cache_metrics(stats: Dict) -> List[str]:
+    """Converts the read cache stats (cache.ReadCache.stats) into the Prometheus text format."""
+    lines = []
+    for key in ("hits", "misses", "invalidations", "evictions"):
+        if key in stats:
+            lines += [
+                f"# HELP plant_cache_{key}_total Plant read cache {key}.",
+                f"# TYPE plant_cache_{key}_total counter",
+                f"plant_cache_{key}_total {stats[key]}",
+            ]
+    if "entries" in stats:
+        lines += [
+            "# HELP plant_cache_entries Entries currently in the plant read cache.",
+            "# TYPE plant_cache_entries gauge",
+            f"plant_cache_entries {stats['entries']}",
+        ]
+    return lines
@@ -0,0 +1,90 @@
+# metrics_middleware.py
+#
+# ASGI middleware that records every HTTP request in metrics.request_metrics:
+# count by status, latency, response size, requests in flight, and the number
+# and duration of database queries the request ran (collected by the engine
+# events in database.py through metrics.current_query_stats). When SQL
+# profiling is on, it also adds the Server-Timing header and checks query
+# budgets (see profiling.py).
+
+import re
+import time
+from typing import Dict
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from . import profiling
+from .metrics import QueryStats, current_query_stats, request_metrics
+
+# Label used for requests that did not match any route (404s for random URLs),
+# so unknown paths cannot create an unlimited number of series
+UNMATCHED_ROUTE = "<unmatched>"
+
+# route.path_regex without its "^" anchor, per route (see route_template)
+_suffix_patterns: Dict[int, "re.Pattern"] = {}
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Returns the route template the request matched, e.g. /api/v1/plants/id/{plant_id}.
+
+    Depending on the FastAPI version, a route included with
+    include_router(prefix="/api/v1") may keep its own path ("/plants/id/{plant_id}"),
+    so the prefix is recovered from the start of the request path.
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if route is None or path_format is None:
+        return UNMATCHED_ROUTE
+    pattern = _suffix_patterns.get(id(route))
+    if pattern is None:
+        pattern = _suffix_patterns[id(route)] = re.compile(route.path_regex.pattern.lstrip("^"))
+    match = pattern.search(scope.get("path", ""))
+    return scope["path"][: match.start()] + path_format if match else path_format
+
+
+class MetricsMiddleware:
+    """
+    Records request metrics, labelled by route template.
+
+    Add it last (outermost) so the latency and response size it records cover
+    the other middleware too, including compression.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # Reported if the app fails before sending a response
+        response_bytes = 0
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                server_timing = profiling.server_timing_header(stats, time.perf_counter() - start)
+                if server_timing is not None:
+                    MutableHeaders(scope=message).append("Server-Timing", server_timing)
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        request_metrics.request_started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope it was given
+            route = route_template(scope)
+            request_metrics.request_finished(
+                scope["method"], route, status, time.perf_counter() - start, response_bytes, stats
+            )
+            profiling.finish_request(scope["method"], route, stats)
+            current_query_stats.reset(token)
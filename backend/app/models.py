@@ -1,19 +1,188 @@
-from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, String
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column, validates
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, Integer, String, event, func, text
 from .database import Base
+from .watering import next_due_after, parse_watering_schedule
+
+
+# Plant names are unique regardless of letter case or surrounding whitespace.
+# Every duplicate-name check compares names through this function so that
+# "Rose", " rose" and "ROSE" are all treated as the same plant.
+def normalize_plant_name(name: str) -> str:
+    return name.strip().lower()
+
+
+# Timestamps are stored in UTC
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# Requests that don't choose a garden use this one (see gardens.py)
+DEFAULT_GARDEN_ID = 1
+
+
+# A user who owns gardens. The app doesn't check passwords: the user ID comes
+# from the X-User-ID header, which the authenticating proxy in front of the API
+# sets (see gardens.py). A row is added the first time a user creates a garden.
+class User(Base):
+    __tablename__ = "users"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
+
+
+# A garden owns plants. Each user or household gets its own garden, and every
+# plant query is limited to one garden, so tenants never see each other's plants.
+class Garden(Base):
+    __tablename__ = "gardens"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
+    # owner_id: the user the garden belongs to; only that user can use it.
+    # None for shared gardens (the default garden, and gardens created without
+    # X-User-ID), which every client can use.
+    owner_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), index=True, nullable=True)
+    # row_version: the last version number handed out to this garden's plants.
+    # Every write claims the next numbers by incrementing it (see crud.claim_row_versions),
+    # which also locks this row until the write commits. So within a garden, versions
+    # are committed in increasing order and a sync client never skips a change.
+    row_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+
+# The default garden always exists, so clients that never send a garden ID keep working.
+# (On PostgreSQL the ID sequence is moved past it, so new gardens don't collide with it.)
+event.listen(
+    Garden.__table__,
+    "after_create",
+    DDL(f"INSERT INTO gardens (id, name, created_at) VALUES ({DEFAULT_GARDEN_ID}, 'My garden', CURRENT_TIMESTAMP)"),
+)
+event.listen(
+    Garden.__table__,
+    "after_create",
+    DDL(f"SELECT setval(pg_get_serial_sequence('gardens', 'id'), {DEFAULT_GARDEN_ID})").execute_if(
+        dialect="postgresql"
+    ),
+)
 
 
 # This class defines the structure of the 'plants' table in the database using SQLAlchemy 2.0 style.
 # Each instance of this class represents a row in the table.
 # SQLAlchemy's ORM (Object Relational Mapper) allows us to interact with the database using Python classes.
+#
+# On PostgreSQL, migration 0006 turns the table into a hash-partitioned table
+# (PARTITION BY HASH (garden_id)), so a query for one garden only touches one
+# partition. Its primary key there is (id, garden_id), because PostgreSQL
+# requires the partition key in every unique constraint; id values still come
+# from one sequence and stay unique on their own.
 class Plant(Base):
     __tablename__ = "plants"  # The name of the table in the database
 
     # id: unique identifier for each plant (primary key, auto-incremented)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    # name: the name of the plant (must be unique)
-    name: Mapped[str] = mapped_column(String, unique=True, index=True)
+    # garden_id: the garden (tenant) this plant belongs to
+    garden_id: Mapped[int] = mapped_column(ForeignKey("gardens.id"), default=DEFAULT_GARDEN_ID)
+    # name: the name of the plant, as the user typed it
+    name: Mapped[str] = mapped_column(String, index=True)
+    # name_normalized: lower-cased, trimmed copy of name (see normalize_plant_name)
+    # The unique index on (garden_id, name_normalized) below is what stops two
+    # plants in one garden having the same name, and lets duplicate checks use
+    # an index lookup instead of an ILIKE scan.
+    name_normalized: Mapped[str] = mapped_column(String)
     # description: a short description of the plant
     description: Mapped[str] = mapped_column(String, index=True)
     # watering_schedule: how often to water the plant (e.g., "Once a week")
     watering_schedule: Mapped[str] = mapped_column(String, index=True)
+    # updated_at: when the plant was created or last changed (set automatically)
+    # The API uses it for Last-Modified / ETag headers; the index makes max(updated_at) cheap.
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, onupdate=utc_now)
+    # Structured form of watering_schedule (see watering.py), kept in sync with it.
+    # watering_interval_hours: hours between waterings (None if the schedule text is not understood)
+    watering_interval_hours: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # last_watered: when the plant was last watered (None until the first POST .../watered)
+    last_watered: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # next_due: when the plant next needs water
+    next_due: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # row_version: the garden's version number of this row's last change (see Garden.row_version).
+    # GET /plants/sync?since=N returns the rows (and tombstones) with a version above N.
+    row_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    # Every per-garden query is served by an index that starts with garden_id,
+    # so its cost depends on the size of that garden, not on the number of gardens:
+    # - name lookups and duplicate checks (unique: names are unique within a garden)
+    # - the plant list, ordered by ID (keyset pagination)
+    # - max(updated_at) for the list's ETag / Last-Modified
+    # - "due before X" range scans
+    # - changes since a version, for GET /plants/sync
+    __table_args__ = (
+        Index("ix_plants_garden_name", "garden_id", "name_normalized", unique=True),
+        Index("ix_plants_garden_id_id", "garden_id", "id"),
+        Index("ix_plants_garden_updated_at", "garden_id", "updated_at"),
+        Index("ix_plants_garden_next_due", "garden_id", "next_due"),
+        Index("ix_plants_garden_row_version", "garden_id", "row_version"),
+    )
+
+    # Keep name_normalized in sync whenever name is set through the ORM.
+    # Bulk Core statements (see crud.py) set name_normalized themselves.
+    @validates("name")
+    def _sync_name_normalized(self, key: str, name: str) -> str:
+        self.name_normalized = normalize_plant_name(name)
+        return name
+
+    # Keep the parsed interval and next_due in sync with watering_schedule.
+    # A new schedule counts from the last watering (or from now if never watered).
+    @validates("watering_schedule")
+    def _sync_watering_interval(self, key: str, schedule: str) -> str:
+        interval = parse_watering_schedule(schedule)
+        if interval != self.watering_interval_hours or self.next_due is None:
+            self.watering_interval_hours = interval
+            self.next_due = next_due_after(self.last_watered or utc_now(), interval)
+        return schedule
+
+
+# A tombstone records that a plant was deleted, so GET /plants/sync can tell
+# clients to remove it. It takes the version of the delete from the garden's
+# counter, like any other change. The primary key (garden_id, row_version)
+# serves the sync query. (SQLite can reuse the ID of the newest deleted plant,
+# so a plant ID may have more than one tombstone.)
+class PlantTombstone(Base):
+    __tablename__ = "plant_tombstones"
+
+    garden_id: Mapped[int] = mapped_column(ForeignKey("gardens.id"), primary_key=True)
+    row_version: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    # plant_id: the ID of the deleted plant
+    plant_id: Mapped[int] = mapped_column(Integer)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
+
+
+# Search indexes (PostgreSQL only; other databases use the in-process index in search.py)
+# - a pg_trgm GIN index on name_normalized serves fuzzy matches (similarity, the % operator)
+#   and substring matches (LIKE '%tom%')
+# - a GIN index on to_tsvector('english', description) serves full-text word matches
+# The expressions must match the ones in crud.search_plants_postgres exactly, or
+# PostgreSQL will not use the indexes.
+# (The language is inline SQL, not a bound parameter, so the expressions really are identical.)
+SEARCH_LANGUAGE = text("'english'")
+# Names of the indexes below, which only exist on PostgreSQL
+POSTGRESQL_ONLY_INDEXES = {"ix_plants_name_normalized_trgm", "ix_plants_description_tsv"}
+
+Index(
+    "ix_plants_name_normalized_trgm",
+    Plant.name_normalized,
+    postgresql_using="gin",
+    postgresql_ops={"name_normalized": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+Index(
+    "ix_plants_description_tsv",
+    func.to_tsvector(SEARCH_LANGUAGE, Plant.description),
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+# gin_trgm_ops comes from the pg_trgm extension, which must exist before the index is created
+event.listen(
+    Plant.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,121 @@
+# profiling.py
+#
+# Per-request SQL profiling and query budgets.
+#
+# When SQL_PROFILING=true, the database session dependencies (get_db and
+# get_async_db in database.py) switch on statement capture for the request:
+# every SQL statement and its duration is recorded, logged at DEBUG level when
+# the request finishes, and summarised in a Server-Timing response header that
+# browser dev tools display next to the request, for example:
+#
+#   Server-Timing: db;dur=1.92;desc="3 queries", sql-1;dur=0.41;desc="SELECT plants.id ..."
+#
+# Routes can declare how many queries they are expected to run with
+# dependencies=[Depends(query_budget(n))]. A request that runs more is logged
+# as a warning and, with SQL_QUERY_BUDGET_ENFORCE=true (set by the tests),
+# recorded in budget_violations so the test suite fails. The garden owner
+# lookup in gardens.py is not counted: it runs once per garden per worker.
+
+import logging
+import os
+from typing import List, Optional
+
+from .metrics import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Reads a true/false setting from the environment."""
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+SQL_PROFILING = _env_bool("SQL_PROFILING", False)
+SQL_QUERY_BUDGET_ENFORCE = _env_bool("SQL_QUERY_BUDGET_ENFORCE", False)
+
+# Server-Timing lists at most this many individual statements
+MAX_TIMED_STATEMENTS = 20
+# Statements are shortened to this many characters in the Server-Timing header
+STATEMENT_DESCRIPTION_LENGTH = 60
+
+# Requests that ran more queries than their route's budget (only when enforcing)
+budget_violations: List[str] = []
+
+
+def start_profiling() -> None:
+    """
+    Starts capturing SQL statements for the current request, if profiling is on.
+
+    Called by the database session dependencies; does nothing outside a request
+    (for example in scripts) or when SQL_PROFILING is off.
+    """
+    stats = current_query_stats.get()
+    if SQL_PROFILING and stats is not None and stats.statements is None:
+        stats.statements = []
+
+
+def query_budget(max_queries: int):
+    """
+    Declares the most SQL statements a route may run per request.
+
+    Usage:
+        @router.get("/plants/id/{plant_id}", dependencies=[Depends(query_budget(1))])
+
+    Args:
+        max_queries (int): Allowed number of statements
+
+    Returns:
+        Callable: A FastAPI dependency that records the budget for the request
+    """
+
+    async def declare_budget() -> None:
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.budget = max_queries
+
+    return declare_budget
+
+
+def server_timing_header(stats: QueryStats, elapsed_seconds: float) -> Optional[str]:
+    """
+    Builds the Server-Timing header value for a profiled request.
+
+    Args:
+        stats (QueryStats): Queries recorded for the request so far
+        elapsed_seconds (float): Time since the request started
+
+    Returns:
+        str: The header value, or None when the request was not profiled
+    """
+    if stats.statements is None:
+        return None
+    entries = [
+        f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries"',
+        f"app;dur={elapsed_seconds * 1000:.2f}",
+    ]
+    for number, (statement, seconds) in enumerate(stats.statements[:MAX_TIMED_STATEMENTS], start=1):
+        description = " ".join(statement.split())[:STATEMENT_DESCRIPTION_LENGTH].replace('"', "'")
+        entries.append(f'sql-{number};dur={seconds * 1000:.2f};desc="{description}"')
+    return ", ".join(entries)
+
+
+def finish_request(method: str, route: str, stats: QueryStats) -> None:
+    """
+    Logs the SQL profile of a finished request and checks its query budget.
+
+    Args:
+        method (str): HTTP method
+        route (str): Route template, e.g. /api/v1/plants/id/{plant_id}
+        stats (QueryStats): Queries recorded for the request
+    """
+    if stats.statements is not None:
+        logger.debug(
+            "SQL profile for %s %s: %d queries in %.2f ms",
+            method, route, stats.count, stats.seconds * 1000,
+            extra={"statements": [statement for statement, _ in stats.statements]},
+        )
+    if stats.budget is not None and stats.count > stats.budget:
+        message = f"{method} {route} ran {stats.count} queries (budget {stats.budget})"
+        logger.warning("Query budget exceeded: %s", message)
+        if SQL_QUERY_BUDGET_ENFORCE:
+            budget_violations.append(message)
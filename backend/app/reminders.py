@@ -0,0 +1,403 @@
+# reminders.py
+#
+# Background watering reminders.
+#
+# Every plant with a parsed watering schedule has a next_due time (see
+# watering.py). The ReminderScheduler keeps those times in an in-memory
+# min-heap, so the next reminder is always at the top:
+# - the database is read once at startup, not polled
+# - adding, changing or deleting a plant updates the heap in O(log n)
+# - while nothing is due the scheduler task sleeps until the earliest due time
+#   (or until an earlier one is added), so an idle scheduler uses no CPU
+# - each due time is reminded once: re-scheduling a plant with the due time it
+#   was already reminded about (an edit that doesn't touch the schedule, or a
+#   reload after a bulk import) sends nothing until next_due changes
+# - if the database can't be reached (at startup or later), the error is logged
+#   and the scheduler tries again after a growing delay; no reminder is lost
+#
+# When a plant becomes due, a Reminder is handed to a sink: the log (default),
+# a webhook, or an in-process queue for other code to consume.
+#
+# Settings (environment variables):
+#   REMINDERS              log (default), webhook, queue or off
+#   REMINDER_WEBHOOK_URL   where the webhook sink POSTs reminders (REMINDERS=webhook)
+#
+# Each process runs its own scheduler. When running several workers, set
+# REMINDERS=off on all but one, or every worker sends the same reminders.
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import time
+import urllib.request
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from . import models
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# The heap is rebuilt when more than half of its entries are outdated
+# (and there are at least this many), keeping memory proportional to the plant count
+COMPACT_MIN_STALE = 1024
+# Most reminders sent in one go before the scheduler yields to other tasks
+DISPATCH_BATCH_SIZE = 1000
+# Rows fetched per round trip while loading schedules at startup
+LOAD_BATCH_SIZE = 10000
+# Seconds to wait before retrying after an error; doubled after each failure in a row, up to the maximum
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
+
+
+class Reminder(NamedTuple):
+    """A plant that needs water."""
+
+    plant_id: int
+    name: str
+    due_at: datetime  # UTC
+
+
+class LogSink:
+    """Writes each reminder to the application log."""
+
+    async def send(self, reminder: Reminder) -> None:
+        logger.info(
+            "Plant %s needs water (due %s)", reminder.name, reminder.due_at.isoformat(),
+            extra={"plant_id": reminder.plant_id},
+        )
+
+
+class WebhookSink:
+    """
+    POSTs each reminder as JSON to a URL, a stand-in for a real notification
+    service. Failures are logged and the reminder is dropped.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    async def send(self, reminder: Reminder) -> None:
+        body = json.dumps(
+            {"plant_id": reminder.plant_id, "name": reminder.name, "due_at": reminder.due_at.isoformat()}
+        ).encode()
+        try:
+            # urllib blocks, so the request runs in a worker thread
+            await run_in_threadpool(self._post, body)
+        except Exception as e:
+            logger.warning("Reminder webhook failed: %s", e, extra={"plant_id": reminder.plant_id})
+
+    def _post(self, body: bytes) -> None:
+        request = urllib.request.Request(
+            self.url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class QueueSink:
+    """
+    Puts reminders on an asyncio.Queue for other code in this process to consume.
+    When the queue is full, new reminders are dropped (and logged) rather than
+    blocking the scheduler.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    async def send(self, reminder: Reminder) -> None:
+        try:
+            self.queue.put_nowait(reminder)
+        except asyncio.QueueFull:
+            logger.warning("Reminder queue full, dropping reminder", extra={"plant_id": reminder.plant_id})
+
+
+def reminder_sink_from_env():
+    """
+    Creates the sink chosen by the REMINDERS environment variable.
+
+    Returns:
+        The sink, or None when REMINDERS=off
+
+    Raises:
+        ValueError: If REMINDERS is not recognized, or webhook is chosen without REMINDER_WEBHOOK_URL
+    """
+    choice = os.getenv("REMINDERS", "log").strip().lower()
+    if choice == "off":
+        return None
+    if choice == "log":
+        return LogSink()
+    if choice == "queue":
+        return QueueSink()
+    if choice == "webhook":
+        url = os.getenv("REMINDER_WEBHOOK_URL")
+        if not url:
+            raise ValueError("REMINDERS=webhook needs REMINDER_WEBHOOK_URL")
+        return WebhookSink(url)
+    raise ValueError(f"Unknown REMINDERS setting: {choice}")
+
+
+def _timestamp(value: datetime) -> float:
+    """Seconds since the epoch; naive datetimes (SQLite stores no offset) are UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def load_schedules(plant_ids: Optional[Iterable[int]] = None) -> List[Tuple[int, datetime]]:
+    """
+    Reads (plant ID, next_due) for plants that have a due time.
+
+    Args:
+        plant_ids (Iterable[int], optional): Only these plants (default: all)
+
+    Returns:
+        List[Tuple[int, datetime]]: One entry per plant with a next_due
+    """
+    plant = models.Plant
+    query = select(plant.id, plant.next_due).where(plant.next_due.is_not(None))
+    if plant_ids is not None:
+        query = query.where(plant.id.in_(list(plant_ids)))
+    with SessionLocal() as db:
+        rows = db.execute(query.execution_options(yield_per=LOAD_BATCH_SIZE))
+        return [(plant_id, next_due) for plant_id, next_due in rows if next_due is not None]
+
+
+def load_names(plant_ids: Iterable[int]) -> Dict[int, str]:
+    """Reads the names of the given plants (plants that no longer exist are left out)."""
+    plant = models.Plant
+    with SessionLocal() as db:
+        return dict(db.execute(select(plant.id, plant.name).where(plant.id.in_(list(plant_ids)))).all())
+
+
+class ReminderScheduler:
+    """
+    Sends a reminder when each plant's next_due time arrives.
+
+    The heap holds (due timestamp, plant ID) pairs. Updates never search the
+    heap: a changed plant gets a new entry, and _due records which entry is
+    current. Outdated entries are skipped when they reach the top and are
+    cleared out by an occasional rebuild. _sent records the due time each
+    plant was last reminded about, so the same reminder is never sent twice.
+
+    schedule(), cancel() and refresh() must be called from the event loop
+    (the async endpoints do this).
+    """
+
+    def __init__(
+        self,
+        load_schedules: Callable[..., List[Tuple[int, datetime]]] = load_schedules,
+        load_names: Callable[[Iterable[int]], Dict[int, str]] = load_names,
+    ):
+        self._load_schedules = load_schedules
+        self._load_names = load_names
+        self._heap: List[Tuple[float, int]] = []
+        self._due: Dict[int, float] = {}  # Plant ID -> current due timestamp
+        self._sent: Dict[int, float] = {}  # Plant ID -> due timestamp already reminded about
+        self._to_refresh: Set[int] = set()  # Plants to re-read from the database
+        self._reload = False  # Re-read every schedule (after a bulk import)
+        self._loaded = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.sink: Any = None  # LogSink, WebhookSink, QueueSink or anything with `async send(reminder)`
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def __len__(self) -> int:
+        """Number of plants with a pending reminder."""
+        return len(self._due)
+
+    async def start(self, sink) -> None:
+        """Starts the scheduler task; the schedules are loaded from the database in the background."""
+        if self.running:
+            return
+        self.sink = sink
+        # _reload makes the first pass of the loop load every schedule
+        self._heap, self._due, self._to_refresh, self._loaded, self._reload = [], {}, set(), False, True
+        self._sent = {}
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        self._task.add_done_callback(self._task_done)
+
+    async def stop(self) -> None:
+        """Stops the scheduler task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def schedule(self, plant_id: int, next_due: Optional[datetime]) -> None:
+        """Sets (or moves) a plant's reminder; None removes it. O(log n)."""
+        if not self.running:
+            return
+        if not self._loaded:
+            # The startup load may not include this change yet; re-read the plant afterwards
+            self.refresh([plant_id])
+            return
+        if next_due is None:
+            self.cancel(plant_id)
+            return
+        due = _timestamp(next_due)
+        if self._due.get(plant_id) == due or self._sent.get(plant_id) == due:
+            return  # Unchanged, or this due time was already reminded about
+        self._sent.pop(plant_id, None)
+        self._due[plant_id] = due
+        heapq.heappush(self._heap, (due, plant_id))
+        if self._heap[0] == (due, plant_id):
+            # The new entry is the earliest; wake the task so it sleeps for less
+            self._wake()
+        self._compact_if_needed()
+
+    def cancel(self, plant_id: int) -> None:
+        """Removes a plant's reminder (its heap entry is dropped lazily). O(1)."""
+        if not self.running:
+            return
+        if not self._loaded:
+            self.refresh([plant_id])
+            return
+        self._due.pop(plant_id, None)
+        self._sent.pop(plant_id, None)
+        self._compact_if_needed()
+
+    def refresh(self, plant_ids: Iterable[int]) -> None:
+        """Re-reads these plants' due times from the database (used after batch writes)."""
+        if not self.running:
+            return
+        self._to_refresh.update(plant_ids)
+        self._wake()
+
+    def reload(self) -> None:
+        """Re-reads every schedule from the database (used after bulk imports, instead of refresh())."""
+        if not self.running:
+            return
+        self._reload = True
+        self._wake()
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        # _run() only ends when cancelled, but if it ever stops on its own the scheduler
+        # must report that it is not running, rather than queueing updates nobody reads
+        if self._task is task:
+            self._task, self._loaded, self._to_refresh = None, False, set()
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _compact_if_needed(self) -> None:
+        stale = len(self._heap) - len(self._due)
+        if stale > COMPACT_MIN_STALE and stale > len(self._due):
+            self._heap = [(due, plant_id) for plant_id, due in self._due.items()]
+            heapq.heapify(self._heap)
+
+    def _drop_outdated_top(self) -> None:
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    async def _run(self) -> None:
+        delay = RETRY_DELAY
+        while True:
+            try:
+                await self._run_once()
+                delay = RETRY_DELAY
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Usually the database is unreachable. The failed step put its work back
+                # (see _load_all, _refresh and _dispatch_due), so the next pass retries it.
+                logger.exception("Reminder scheduler error, retrying in %.0fs", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+
+    async def _run_once(self) -> None:
+        """One pass of the scheduler loop: apply pending changes, then send due reminders or sleep."""
+        assert self._wakeup is not None
+        if self._reload:
+            await self._load_all()
+        if self._to_refresh:
+            await self._refresh()
+        self._drop_outdated_top()
+        now = time.time()
+        if self._heap and self._heap[0][0] <= now:
+            await self._dispatch_due(now)
+            return
+        # Sleep until the earliest reminder, or until something changes
+        timeout = self._heap[0][0] - now if self._heap else None
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _load_all(self) -> None:
+        # Changes made while loading are re-read afterwards (see schedule())
+        self._reload, self._loaded = False, False
+        started = time.perf_counter()
+        try:
+            schedules = await run_in_threadpool(self._load_schedules)
+        except Exception:
+            self._reload = True
+            raise
+        loaded = {plant_id: _timestamp(next_due) for plant_id, next_due in schedules}
+        # Reminders already sent stay sent; plants whose due time moved (or that are gone) are forgotten
+        self._sent = {plant_id: due for plant_id, due in self._sent.items() if loaded.get(plant_id) == due}
+        self._due = {plant_id: due for plant_id, due in loaded.items() if self._sent.get(plant_id) != due}
+        self._heap = [(due, plant_id) for plant_id, due in self._due.items()]
+        heapq.heapify(self._heap)  # O(n), cheaper than n pushes
+        self._loaded = True
+        logger.info("Reminder scheduler loaded %d schedules in %.2fs", len(self._due), time.perf_counter() - started)
+
+    async def _refresh(self) -> None:
+        plant_ids, self._to_refresh = self._to_refresh, set()
+        try:
+            current = dict(await run_in_threadpool(self._load_schedules, plant_ids))
+        except Exception:
+            self._to_refresh |= plant_ids
+            raise
+        for plant_id in plant_ids:
+            self.schedule(plant_id, current.get(plant_id))
+
+    async def _dispatch_due(self, now: float) -> None:
+        due: List[Tuple[int, float]] = []
+        while self._heap and self._heap[0][0] <= now and len(due) < DISPATCH_BATCH_SIZE:
+            timestamp, plant_id = heapq.heappop(self._heap)
+            if self._due.get(plant_id) == timestamp:
+                del self._due[plant_id]
+                self._sent[plant_id] = timestamp
+                due.append((plant_id, timestamp))
+        if not due:
+            return
+        try:
+            names = await run_in_threadpool(self._load_names, [plant_id for plant_id, _ in due])
+        except Exception:
+            # Put the reminders back (unless the plant was rescheduled meanwhile) to send them later
+            for plant_id, timestamp in due:
+                if plant_id not in self._due and self._sent.get(plant_id) == timestamp:
+                    del self._sent[plant_id]
+                    self._due[plant_id] = timestamp
+                    heapq.heappush(self._heap, (timestamp, plant_id))
+            raise
+        for plant_id, timestamp in due:
+            if plant_id not in names:
+                self._sent.pop(plant_id, None)
+                continue  # Deleted since it was scheduled
+            reminder = Reminder(plant_id, names[plant_id], datetime.fromtimestamp(timestamp, timezone.utc))
+            try:
+                await self.sink.send(reminder)
+            except Exception:
+                logger.exception("Reminder sink failed", extra={"plant_id": plant_id})
+
+
+# Shared scheduler, started from the FastAPI lifespan in main.py
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,331 @@
+# replicas.py
+#
+# Read replicas: sends read-only requests to replica databases, so reads like
+# GET /api/v1/plants don't compete with writes on the primary.
+#
+# - Set DATABASE_REPLICA_URLS to a comma-separated list of replica database
+#   URLs (same format as DATABASE_URL). Without it, everything uses the primary.
+# - Read-only handlers depend on get_read_db() instead of database.get_async_db().
+#   Each request takes the next replica in turn (round-robin).
+# - A replica that can't be connected to is skipped for DATABASE_REPLICA_RETRY_SECONDS
+#   (default 30); the request moves on to the next replica, and to the primary
+#   when none is left. Replica pools always test connections before handing
+#   them out (pool_pre_ping), so a restarted replica is noticed right away.
+# - Read-your-writes: replicas lag a little behind the primary, so a client that
+#   has just written would not see its own change. For READ_YOUR_WRITES_SECONDS
+#   (default 5) after a successful write, reads go to the primary when either
+#     - the client sends the cookie set on the write response (any worker can
+#       check it, for clients that keep cookies), or
+#     - the read is for a garden this worker has just written to (for clients
+#       that don't send cookies, like the frontend's cross-origin fetches).
+#   These reads also skip the read cache (cache.py): an entry may have been
+#   filled before the write, by another worker or from a lagging replica, and
+#   only this worker's entries are dropped by the write. Other reads are cached
+#   per source (replica or primary); see read_cache_scope().
+#
+# Writes always use database.get_async_db(), which is bound to the primary.
+
+from contextlib import contextmanager
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from fastapi import Request
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from . import database
+from .models import DEFAULT_GARDEN_ID
+from .profiling import start_profiling
+
+logger = logging.getLogger(__name__)
+
+# Cookie set on write responses; holds the Unix time until which reads use the primary
+PRIMARY_COOKIE = "primary_reads_until"
+
+# HTTP methods that change data
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Replica connections are checked before use, so a dead replica fails at checkout
+# (where get_read_db can still fail over) rather than in the middle of a handler
+REPLICA_POOL_SETTINGS = {"pool_pre_ping": True}
+
+
+class Replica:
+    """One replica database. Its engines are created on first use."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.down_until = 0.0  # time.monotonic() before which the replica is skipped
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._session_factory: Optional[sessionmaker] = None
+        self._async_session_factory: Any = None  # async_sessionmaker, or False when unavailable
+
+    def session_factory(self) -> sessionmaker:
+        """Returns a sessionmaker bound to this replica."""
+        if self._session_factory is None:
+            with self._lock:
+                if self._session_factory is None:
+                    engine = database.build_engine(self.url, REPLICA_POOL_SETTINGS)
+                    self._session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+        return self._session_factory
+
+    def async_session_factory(self):
+        """Returns an async_sessionmaker bound to this replica, or None for the sync fallback."""
+        if self._async_session_factory is None:
+            with self._lock:
+                if self._async_session_factory is None:
+                    self._async_session_factory = database.build_async_session_factory(
+                        database._to_async_url(self.url), REPLICA_POOL_SETTINGS
+                    ) or False
+        return self._async_session_factory or None
+
+    async def dispose(self) -> None:
+        """Closes the pooled connections of this replica's engines."""
+        if self._session_factory is not None:
+            await run_in_threadpool(self._session_factory.kw["bind"].dispose)
+        if self._async_session_factory:
+            await self._async_session_factory.kw["bind"].dispose()
+
+
+class ReplicaSet:
+    """
+    Picks replicas round-robin, skipping replicas that recently failed.
+
+    Args:
+        urls (List[str]): Replica database URLs
+        retry_seconds (float): How long a replica is skipped after a failed connection
+    """
+
+    def __init__(self, urls: List[str], retry_seconds: float = 30):
+        self.replicas = [Replica(url) for url in urls]
+        self.retry_seconds = retry_seconds
+        self._next = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    def candidates(self) -> List[Replica]:
+        """
+        Returns the healthy replicas, starting with the next one in round-robin order.
+
+        Returns:
+            List[Replica]: Replicas to try in order (empty if all are down)
+        """
+        if not self.replicas:
+            return []
+        start = next(self._next) % len(self.replicas)
+        now = time.monotonic()
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica.down_until <= now]
+
+    def mark_down(self, replica: Replica, error: Exception) -> None:
+        """Skips a replica for retry_seconds after it failed to connect."""
+        replica.failures += 1
+        replica.down_until = time.monotonic() + self.retry_seconds
+        logger.warning("Read replica unavailable, skipping it for %ss: %s", self.retry_seconds, error)
+
+    def status(self) -> List[dict]:
+        """Describes each replica (URL without password, health, failure count)."""
+        from sqlalchemy.engine import make_url
+
+        now = time.monotonic()
+        return [
+            {
+                "url": make_url(replica.url).render_as_string(hide_password=True),
+                "healthy": replica.down_until <= now,
+                "failures": replica.failures,
+            }
+            for replica in self.replicas
+        ]
+
+    async def dispose(self) -> None:
+        """Closes every replica's pooled connections (called when the app shuts down)."""
+        for replica in self.replicas:
+            await replica.dispose()
+
+
+class RecentWrites:
+    """
+    Remembers which gardens this worker wrote to in the last window_seconds.
+
+    Args:
+        window_seconds (float): How long reads of a garden stay on the primary after a write
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._until: Dict[int, float] = {}
+
+    def record(self, garden_id: int) -> None:
+        now = time.monotonic()
+        # Drop expired gardens now and then, so the dict stays small
+        if len(self._until) > 1000:
+            self._until = {garden: until for garden, until in self._until.items() if until > now}
+        self._until[garden_id] = now + self.window_seconds
+
+    def is_recent(self, garden_id: int) -> bool:
+        return self._until.get(garden_id, 0.0) > time.monotonic()
+
+    def clear(self) -> None:
+        self._until.clear()
+
+
+def _env_urls(name: str) -> List[str]:
+    return [url.strip() for url in os.getenv(name, "").split(",") if url.strip()]
+
+
+replica_set = ReplicaSet(
+    _env_urls("DATABASE_REPLICA_URLS"), retry_seconds=float(os.getenv("DATABASE_REPLICA_RETRY_SECONDS", "30"))
+)
+recent_writes = RecentWrites(float(os.getenv("READ_YOUR_WRITES_SECONDS", "5")))
+
+
+def _garden_id_from(headers, query_params: QueryParams) -> Optional[int]:
+    """Returns the garden a request is for (same rules as gardens.get_garden_id), or None if invalid."""
+    value = headers.get("x-garden-id") or query_params.get("garden_id")
+    if value is None:
+        return DEFAULT_GARDEN_ID
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def primary_required(request: Request) -> bool:
+    """
+    Tells whether a read must use the primary to see the client's own recent writes.
+
+    Args:
+        request (Request): The read request
+
+    Returns:
+        bool: True within READ_YOUR_WRITES_SECONDS of the client's (or its garden's) last write
+    """
+    try:
+        if float(request.cookies.get(PRIMARY_COOKIE, "0")) > time.time():
+            return True
+    except ValueError:
+        pass
+    garden_id = _garden_id_from(request.headers, request.query_params)
+    return garden_id is not None and recent_writes.is_recent(garden_id)
+
+
+# Read-only Database Session Dependency
+# Yields the same kind of session as database.get_async_db(), connected to a
+# replica when one is available. Only use it in handlers that never write.
+async def get_read_db(request: Request):
+    """
+    Creates a session for a read-only request, on a replica when possible.
+
+    Yields:
+        AsyncSession | SyncSessionAdapter: Session on a healthy replica, or on the
+            primary (no replicas, all replicas down, or the client wrote recently)
+    """
+    start_profiling()  # Captures every SQL statement of the request when SQL_PROFILING=true
+    use_primary = primary_required(request)
+    request.state.read_cache_scope = None  # See read_cache_scope()
+    if not use_primary:
+        for replica in replica_set.candidates():
+            async with database.async_session_scope(
+                replica.async_session_factory(), replica.session_factory()
+            ) as db:
+                try:
+                    await db.connection()  # Connect now, so a dead replica can still be skipped
+                except sa_exc.DBAPIError as e:
+                    replica_set.mark_down(replica, e)
+                    continue
+                request.state.read_cache_scope = "replica"
+                yield db
+                return
+        request.state.read_cache_scope = "primary"
+    async with database.async_session_scope(database.get_async_session_factory(), database.SessionLocal) as db:
+        yield db
+
+
+def read_cache_scope(request: Request) -> Optional[str]:
+    """
+    Tells how a read served by get_read_db() may use the read cache.
+
+    Args:
+        request (Request): The read request (after get_read_db() has run)
+
+    Returns:
+        Optional[str]: "replica" or "primary", the database the read came from,
+        to keep in the cache key; None when the read must neither use nor fill
+        the cache, because the client has to see its own recent writes
+        (primary_required) or the request did not go through get_read_db()
+    """
+    return getattr(request.state, "read_cache_scope", None)
+
+
+@contextmanager
+def read_session(use_primary: bool = False) -> Iterator[Session]:
+    """
+    Opens a sync session for reading, on a replica when possible (used by streamed exports).
+
+    Args:
+        use_primary (bool): Read from the primary (see primary_required)
+
+    Yields:
+        Session: Session on a healthy replica, or on the primary
+    """
+    if not use_primary:
+        for replica in replica_set.candidates():
+            db = replica.session_factory()()
+            try:
+                db.connection()
+            except sa_exc.DBAPIError as e:
+                db.close()
+                replica_set.mark_down(replica, e)
+                continue
+            try:
+                yield db
+            finally:
+                db.close()
+            return
+    db = database.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class ReadYourWritesMiddleware:
+    """
+    After a successful write, sends the client's reads to the primary for a while.
+
+    Records the garden in recent_writes and sets the PRIMARY_COOKIE cookie on
+    the response. Does nothing when no replicas are configured.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or not replica_set:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = MutableHeaders(scope=message)
+                garden_id = _garden_id_from(Headers(scope=scope), QueryParams(scope.get("query_string", b"")))
+                if garden_id is not None:
+                    recent_writes.record(garden_id)
+                window = recent_writes.window_seconds
+                headers.append(
+                    "Set-Cookie",
+                    f"{PRIMARY_COOKIE}={time.time() + window:.3f}; Max-Age={int(window) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,47 @@
+# responses.py
+#
+# Fast JSON encoding for large API responses.
+#
+# FastAPI normally validates every returned object against the endpoint's
+# response_model and then encodes it with the standard json module. For a long
+# plant list that per-row validation dominates the CPU time. The plant list
+# endpoint instead builds plain dicts straight from selected columns and encodes
+# them here, producing exactly the same bytes as FastAPI's JSONResponse.
+#
+# orjson is used when it is installed; otherwise the standard json module is
+# used with the same settings as Starlette's JSONResponse.
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encodes content as compact UTF-8 JSON.
+
+    The output is byte-for-byte what Starlette's JSONResponse produces
+    (no spaces, non-ASCII characters left unescaped).
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that encodes with orjson when it is available."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class EncodedJSONResponse(Response):
+    """Response for a body that has already been encoded as JSON (for example by dumps())."""
+
+    media_type = "application/json"
@@ -0,0 +1,103 @@
+# Z:\Main\github-repos\gardening_app\backend\app\routers\garden_router.py
+# Endpoints for gardens (tenants). Every plant belongs to one garden, and the
+# plant endpoints choose theirs with the X-Garden-ID header (see gardens.py).
+# A garden created with an X-User-ID header belongs to that user.
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import crud
+from ..database import get_async_db
+from ..gardens import check_garden_access, get_user_id, remember_garden_owner
+from ..profiling import query_budget
+from ..replicas import get_read_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+# Request body for POST /api/v1/gardens
+class GardenCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=200)  # Display name of the garden
+
+
+# A garden as returned by the API
+class GardenSchema(BaseModel):
+    id: int  # Send this as X-Garden-ID to work on the garden's plants
+    name: str
+    owner_id: Optional[int] = None  # The user it belongs to (None: shared by every client)
+
+
+# POST endpoint to create a new (empty) garden
+# Route: POST /api/v1/gardens
+@router.post("/gardens", response_model=GardenSchema, status_code=201, dependencies=[Depends(query_budget(2))])
+async def create_garden(
+    garden: GardenCreate,
+    owner_id: Optional[int] = Depends(get_user_id),  # The caller (X-User-ID) owns the new garden
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Creates a garden with no plants, owned by the caller when X-User-ID is sent.
+
+    Args:
+        garden (GardenCreate): The garden's name
+        owner_id (int, optional): The caller's user ID; None creates a shared garden
+        db (AsyncSession): Database session
+
+    Returns:
+        GardenSchema: The new garden, including its ID
+    """
+    # Two first gardens of a new user created at once can both try to add the
+    # user; the one that loses gets an IntegrityError, and then simply tries again
+    for attempt in range(2):
+        try:
+            if owner_id is not None:
+                await crud.add_user_if_missing(db, owner_id)
+            created = await crud.create_garden(db, garden.name.strip(), owner_id)
+            await db.commit()
+            break
+        except IntegrityError as e:
+            await db.rollback()
+            if attempt == 0:
+                continue
+            logger.error("Database error while creating garden: %s", e)
+            raise HTTPException(status_code=500, detail="Database error occurred")
+        except Exception as e:
+            await db.rollback()
+            logger.error("Database error while creating garden: %s", e)
+            raise HTTPException(status_code=500, detail="Database error occurred")
+    remember_garden_owner(created["id"], owner_id)
+    logger.info("Created garden %s", created["id"])
+    return created
+
+
+# GET endpoint to retrieve one garden by ID
+# Route: GET /api/v1/gardens/{garden_id}
+@router.get("/gardens/{garden_id}", response_model=GardenSchema, dependencies=[Depends(query_budget(1))])
+async def get_garden(
+    garden_id: int, user_id: Optional[int] = Depends(get_user_id), db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Returns a garden by its ID.
+
+    Args:
+        garden_id (int): ID of the garden
+        user_id (int, optional): The caller, from the X-User-ID header
+        db (AsyncSession): Database session
+
+    Returns:
+        GardenSchema: The garden
+
+    Raises:
+        HTTPException: If garden not found, or it belongs to another user
+    """
+    await check_garden_access(garden_id, user_id)
+    garden = await crud.get_garden(db, garden_id)
+    if garden is None:
+        raise HTTPException(status_code=404, detail="Garden not found")
+    return garden
@@ -0,0 +1,114 @@
+# Z:\Main\github-repos\gardening_app\backend\app\routers\metrics_router.py
+# Endpoints that expose the application's internal metrics (see metrics.py).
+# This router is included in main.py without the /api/v1 prefix, because these
+# endpoints are for operators and monitoring tools rather than the frontend.
+import logging
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.exc import SQLAlchemyError
+
+from .. import database, replicas
+from ..cache import read_cache
+from ..metrics import pool_metrics, render_cache_metrics, render_pool_metrics, request_metrics
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# GET endpoint to inspect the database connection pools
+# Route: GET /metrics/pool
+@router.get("/metrics/pool")
+def get_pool_metrics():
+    """
+    Returns database connection pool settings, current state and telemetry.
+
+    Use this to size the pool from data: long checkout waits, timeouts or
+    frequent overflow checkouts mean DATABASE_POOL_SIZE / DATABASE_MAX_OVERFLOW
+    are too small for the load.
+
+    Returns:
+        dict: "settings" (configured pool options), "pools" (current
+            connection counts per engine), "replicas" (read replica health)
+            and "events" (checkout telemetry)
+    """
+    return {
+        "settings": database.POOL_SETTINGS,
+        "pools": database.pool_status(),
+        "replicas": replicas.replica_set.status(),
+        "events": pool_metrics.snapshot(),
+    }
+
+
+# GET endpoint to inspect the plant read cache
+# Route: GET /metrics/cache
+@router.get("/metrics/cache")
+def get_cache_metrics():
+    """
+    Returns the read cache hit/miss counters (see cache.py).
+
+    Returns:
+        dict: Backend name, entry count, hits, misses, hit ratio, invalidations and evictions
+    """
+    return read_cache.stats()
+
+
+# GET endpoint for Prometheus (or any compatible scraper)
+# Route: GET /metrics
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Returns every metric in the Prometheus text exposition format.
+
+    Includes request counts, latency and response size histograms per route
+    template, requests in flight, database query counts and durations (overall
+    and per request), pool telemetry and read cache counters.
+
+    Returns:
+        PlainTextResponse: The metrics, one sample per line
+    """
+    lines = request_metrics.render()
+    lines += render_pool_metrics(pool_metrics.snapshot())
+    lines += render_cache_metrics(read_cache.stats())
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+# GET endpoint for liveness checks (docker-compose healthcheck, load balancer)
+# Route: GET /health
+@router.get("/health")
+def health():
+    """
+    Reports that the process is up and serving requests.
+
+    It does not touch the database, so a slow or restarting database does not
+    get healthy API containers restarted; use GET /ready for that.
+
+    Returns:
+        dict: {"status": "ok"}
+    """
+    return {"status": "ok"}
+
+
+# GET endpoint for readiness checks
+# Route: GET /ready
+@router.get("/ready")
+def ready():
+    """
+    Reports whether the API can serve traffic, by pinging the database.
+
+    Returns:
+        dict: {"status": "ready"} when the database answers
+
+    Raises:
+        HTTPException: 503 if the database cannot be reached
+    """
+    try:
+        database.ping_database()
+    except SQLAlchemyError as e:
+        logger.warning("Readiness check failed: %s", e)
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    return {"status": "ready"}
@@ -1,21 +1,42 @@
 # Z:\Main\github-repos\gardening_app\backend\app\routers\plant_router.py
 # Standard library imports for FastAPI functionality
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import and_, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Iterator, List, Literal, Optional, Sequence, Tuple, TypeVar, Union
+import anyio
+import asyncio
+import csv
+import io
+import json
 import logging
 
 # Import our database models and connection utilities
 # These connect to our PostgreSQL database running in Docker
-from .. import models
-from ..database import get_db
+from .. import bulk_import, crud, models
+from ..cache import read_cache
+from ..changes import change_feed, event_stream
+from ..http_cache import is_not_modified, make_etag, not_modified_response, set_cache_headers
+from ..responses import EncodedJSONResponse, dumps
+from ..database import get_async_db, get_engine
+from ..gardens import get_garden_id
+from ..profiling import query_budget
+from ..reminders import reminder_scheduler
+from ..replicas import get_read_db, primary_required, read_cache_scope, read_session
+from ..search import PlantSearchIndex, plant_search_indexes
 
-# Configure logging to show debug level messages
-# This helps track database operations and API requests
-logging.basicConfig(level=logging.DEBUG)
+# Logging is configured once for the whole app (see logging_config.py).
+# Messages use lazy %-style arguments, so debug messages cost almost nothing
+# unless LOG_LEVEL=DEBUG.
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 # Define the Plant data model using Pydantic
 # This creates a schema that validates the data structure for plants
@@ -31,108 +52,1436 @@ class PlantSchema(BaseModel):
         orm_mode = True
 
 
+# The response fields of a plant, in PlantSchema order
+PLANT_FIELDS = list(PlantSchema.model_fields)
+
+
+def _plant_to_dict(plant: models.Plant) -> dict:
+    """Copies the PlantSchema fields of a database row into a plain dict (safe to cache)."""
+    return {field: getattr(plant, field) for field in PLANT_FIELDS}
+
+
+def _publish_change(garden_id: int, change_type: str, row: dict) -> None:
+    """Sends a committed write to the live change feed (GET /plants/changes)."""
+    plant = None if change_type == "deleted" else {field: row[field] for field in PLANT_FIELDS}
+    change_feed.publish(garden_id, change_type, row["id"], plant)
+
+
+def _on_change_feed_reset(garden_id: int) -> None:
+    """
+    Runs on every worker after a bulk import (see ChangeFeed.publish_reset):
+    cached reads are dropped and the reminders are reloaded from the database.
+    """
+    read_cache.invalidate()
+    reminder_scheduler.reload()
+
+
+change_feed.add_reset_listener(_on_change_feed_reset)
+
+
+def _by_id(garden_id: int, plant_id: int):
+    """WHERE clause for one plant in a garden, by ID."""
+    return and_(models.Plant.garden_id == garden_id, models.Plant.id == plant_id)
+
+
+def _by_name(garden_id: int, plant_name: str):
+    """WHERE clause for one plant in a garden, by name (case-insensitive, through the (garden_id, name) index)."""
+    return and_(
+        models.Plant.garden_id == garden_id,
+        models.Plant.name_normalized == models.normalize_plant_name(plant_name),
+    )
+
+
+def _is_missing_garden(error: IntegrityError) -> bool:
+    """True if a write failed because its garden does not exist (foreign key on plants.garden_id)."""
+    return "foreign key" in str(error.orig).lower()
+
+
+async def _claim_row_versions(db: AsyncSession, garden_id: int, count: int) -> int:
+    """
+    Claims version numbers for a write to a garden's plants (see crud.claim_row_versions).
+
+    Returns:
+        int: The first claimed number
+
+    Raises:
+        HTTPException: 404 if the garden does not exist (the transaction is rolled back)
+    """
+    first_version = await crud.claim_row_versions(db, garden_id, count)
+    if first_version is None:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Garden not found")
+    return first_version
+
+
+def _cache_key(request: Request, *parts) -> Optional[str]:
+    """
+    Builds an unambiguous read cache key from request parameters.
+
+    The key includes the database the read came from (replica or primary).
+    It is None, so the read neither uses nor fills the cache, when the client
+    must see its own recent writes (see replicas.read_cache_scope).
+    """
+    scope = read_cache_scope(request)
+    return None if scope is None else "plants:" + json.dumps([scope, *parts])
+
+
+def _to_iso(value: Optional[datetime]) -> Optional[str]:
+    """Converts a timestamp to an ISO string so it can be stored in the read cache."""
+    return value.isoformat() if value is not None else None
+
+
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    """Converts an ISO string from the read cache back to a timestamp."""
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+async def _get_plants_version(request: Request, db: AsyncSession, garden_id: int) -> Tuple[str, Optional[datetime]]:
+    """
+    Returns the ETag and Last-Modified time for one garden's plant collection.
+
+    The ETag is built from the garden's row_version, which every write moves
+    forward. The underlying version query (crud.get_plants_version) is cached like
+    any other read, so a client revalidating an unchanged list costs no database work.
+    """
+    row_version, last_modified_iso = await _get_plants_row_version(request, db, garden_id)
+    return make_etag("plants", garden_id, row_version, last_modified_iso), _from_iso(last_modified_iso)
+
+
+async def _get_plants_row_version(request: Request, db: AsyncSession, garden_id: int) -> Tuple[int, Optional[str]]:
+    """Returns the garden's row_version and its newest updated_at (ISO 8601), through the read cache."""
+    cache_key = _cache_key(request, "version", garden_id)
+    cached = read_cache.get(cache_key)
+    if cached is None:
+        generation = read_cache.generation
+        row_version, last_modified = await crud.get_plants_version(db, garden_id)
+        cached = [row_version, _to_iso(last_modified)]
+        read_cache.set(cache_key, cached, generation)
+    return cached[0], cached[1]
+
+
+# A plant as listed by GET /api/v1/plants. With fields=..., each item only has
+# the requested fields (and always "id"), so every other field is optional here
+# and the published schema matches the narrowed items.
+class PlantFields(BaseModel):
+    name: Optional[str] = None  # Present unless left out by fields=
+    description: Optional[str] = None  # Present unless left out by fields=
+    watering_schedule: Optional[str] = None  # Present unless left out by fields=
+    id: int  # Always present (it is the page cursor)
+
+
+# Define the paginated response returned by GET /api/v1/plants
+# Clients pass next_cursor back as the "after" query parameter to get the next page.
+# next_cursor is None when there are no more plants to fetch.
+class PlantPage(BaseModel):
+    items: List[PlantFields]  # The plants on this page, ordered by ID
+    next_cursor: Optional[int] = None  # ID to pass as "after" for the next page
+    limit: int  # The page size that was applied
+
+
+# One change returned by GET /api/v1/plants/sync
+class PlantChange(BaseModel):
+    id: int  # The plant's ID
+    row_version: int  # Version of the change (see models.Plant.row_version)
+    deleted: bool  # True if the plant was deleted (plant is then None)
+    plant: Optional[PlantSchema] = None  # The plant as it is now
+
+
+# Response of GET /api/v1/plants/sync
+# Clients store version and send it back as "since" next time. While has_more
+# is true there are more changes: ask again straight away with the new version.
+class PlantSyncPage(BaseModel):
+    changes: List[PlantChange]  # Oldest first; apply them in this order
+    version: int  # Version to pass as "since" for the next request
+    has_more: bool  # True if more changes are waiting after this page
+
+
+# A search result: a plant plus how well it matched (higher is better)
+class PlantSearchResult(PlantSchema):
+    score: float
+
+
+# A plant with its parsed watering schedule (see watering.py), returned by the
+# watering endpoints. Times are in UTC.
+class PlantWatering(PlantSchema):
+    watering_interval_hours: Optional[int] = None  # Hours between waterings (None if not understood)
+    last_watered: Optional[datetime] = None  # When the plant was last watered
+    next_due: Optional[datetime] = None  # When the plant next needs water
+
+
+# Optional request body for POST .../watered
+class WateringEvent(BaseModel):
+    watered_at: Optional[datetime] = None  # When the plant was watered (defaults to now)
+
+
+# The response fields of PlantWatering, in order
+WATERING_FIELDS = list(PlantWatering.model_fields)
+
+# Page size limits for GET /api/v1/plants
+# Keeping a hard maximum stops a single request from dumping the whole table.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Page size limits for GET /api/v1/plants/sync
+DEFAULT_SYNC_LIMIT = 1000
+MAX_SYNC_LIMIT = 10000
+
+# Most IDs accepted by GET /api/v1/plants?ids=... (one IN list)
+MAX_PLANT_IDS = MAX_PAGE_SIZE
+
+# Result limits for GET /api/v1/plants/search
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+MAX_SEARCH_LENGTH = 100
+# Most changes applied to an in-process search index before a search; with more
+# waiting, the garden's index is rebuilt instead (see _update_search_index)
+MAX_SEARCH_INDEX_CHANGES = 1000
+
+# Result limits for GET /api/v1/plants/due
+DEFAULT_DUE_LIMIT = 100
+MAX_DUE_LIMIT = 1000
+
+# Export settings for GET /api/v1/plants/export
+# Rows are pulled from a server-side cursor this many at a time, so memory stays
+# flat no matter how big the plants table gets.
+EXPORT_BATCH_SIZE = 1000
+# The exported columns match the PlantSchema fields (and their order) exactly
+EXPORT_FIELDS = PLANT_FIELDS
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Content-Type of an import body -> import format (used when ?format= is not given)
+IMPORT_MEDIA_TYPES = {media_type: name for name, media_type in EXPORT_MEDIA_TYPES.items()}
+
+# Maximum number of plants accepted by a single batch request
+MAX_BATCH_SIZE = 10000
+
+
+# Request bodies for the batch endpoints
+class PlantBatchCreate(BaseModel):
+    items: List[PlantSchema] = Field(..., max_length=MAX_BATCH_SIZE)  # Plants to create
+
+
+class PlantBatchUpdate(BaseModel):
+    items: List[PlantSchema] = Field(..., max_length=MAX_BATCH_SIZE)  # Plants to update (id required)
+
+
+class PlantBatchDelete(BaseModel):
+    ids: List[int] = Field(..., max_length=MAX_BATCH_SIZE)  # IDs of plants to delete
+
+
+# The outcome of one item in a batch request
+# index is the item's position in the request, so clients can match results up.
+class BatchItemResult(BaseModel):
+    index: int
+    status: Literal["created", "updated", "deleted", "error"]
+    id: Optional[int] = None  # The plant's database ID (when known)
+    error: Optional[str] = None  # Why the item was rejected (status == "error")
+
+
+# Response body for POST /api/v1/plants:import
+class ImportRowError(BaseModel):
+    line: int  # Line of the file where the rejected row starts (1 = first line)
+    error: str
+
+
+class ImportResult(BaseModel):
+    received: int  # Data rows in the file
+    imported: int  # Plants created
+    rejected: int  # Rows not imported
+    errors: List[ImportRowError]  # The first bulk_import.MAX_REPORTED_ERRORS rejected rows, in file order
+    errors_truncated: bool  # True when more rows were rejected than are listed
+    seconds: float
+
+
+# Response body for every batch endpoint
+class BatchResult(BaseModel):
+    results: List[BatchItemResult]  # One result per request item, in request order
+    succeeded: int  # Number of items that were written
+    failed: int  # Number of items that were rejected
+
+
 # Create a FastAPI router to handle plant-related endpoints
 # This router will be included in main.py under the /api/v1 prefix
 router = APIRouter()
 
 # The following endpoints implement CRUD (Create, Read, Update, Delete) operations for plants.
-# Each endpoint uses dependency injection to get a database session (db: Session = Depends(get_db)).
-# All endpoints use SQLAlchemy ORM to interact with the PostgreSQL database.
+# Each endpoint uses dependency injection to get a database session (db: AsyncSession = Depends(get_async_db)).
+# Read-only endpoints use Depends(get_read_db) instead, which reads from a replica
+# when DATABASE_REPLICA_URLS is set (see replicas.py); writes always go to the primary.
+# Every endpoint also works on one garden (garden_id: int = Depends(get_garden_id), see gardens.py):
+# all queries are limited to that garden's plants, and cache keys include it.
+# All endpoints use SQLAlchemy ORM to interact with the PostgreSQL database, and "await"
+# every database call so a slow query never blocks the event loop for other requests.
+#
+# query_budget(n) declares how many SQL statements an endpoint is expected to run.
+# With SQL_PROFILING=true, going over the budget is logged (and fails the tests),
+# so a change that adds a database round trip is noticed (see profiling.py).
 
 
-# GET endpoint to retrieve all plants from PostgreSQL
+# GET endpoint to retrieve plants from PostgreSQL, one page at a time
 # Route: GET /api/v1/plants
-@router.get("/plants", response_model=List[PlantSchema])
-def get_plants(db: Session = Depends(get_db)):  # Inject database session
+@router.get("/plants", response_model=Union[PlantPage, List[PlantFields]], dependencies=[Depends(query_budget(2))])
+async def get_plants(
+    request: Request,  # Incoming request, used to read If-None-Match / If-Modified-Since
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[int] = Query(None, ge=0, description="Return plants with an ID greater than this cursor"),
+    watering_schedule: Optional[str] = Query(None, description="Only return plants with this watering schedule"),
+    name_prefix: Optional[str] = Query(None, description="Only return plants whose name starts with this text"),
+    unpaginated: bool = Query(False, alias="all", description="Return every matching plant as a plain list"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated plant fields to return, e.g. id,name (id is always included)"
+    ),
+    ids: Optional[str] = Query(None, description="Only return the plants with these comma-separated IDs"),
+    garden_id: int = Depends(get_garden_id),  # The garden to list (X-Garden-ID header)
+    db: AsyncSession = Depends(get_read_db),  # Inject database session
+):
+    """
+    Returns one garden's plants from the PostgreSQL database using keyset pagination.
+
+    Plants are ordered by ID. Each page holds at most `limit` plants, and
+    `next_cursor` is the value to send as `after` to fetch the next page.
+    Because the query filters on `id > after` instead of using OFFSET, every
+    page costs the same no matter how deep into the table it is.
+
+    Pass `all=true` to get the old response shape (a plain list of every
+    matching plant). This is kept for backward compatibility only.
+
+    `fields=id,name` returns only those fields of each plant, and only those
+    columns are selected from the database, so list views that don't show
+    descriptions don't pay for loading and encoding them. `ids=1,2,3` fetches
+    a handful of known plants with one IN query instead of one request each;
+    it combines with the other filters and pagination like any filter, and IDs
+    that don't exist in the garden are left out.
+
+    Results are served from the read cache (see cache.py) until a plant is
+    added, updated or deleted. Rows are selected as plain tuples and encoded
+    straight to JSON (see responses.py), skipping per-row Pydantic validation;
+    the bytes are identical to what response_model would produce.
+
+    Every response carries an ETag and Last-Modified header for the whole
+    collection. A client that sends them back (If-None-Match /
+    If-Modified-Since) gets 304 Not Modified while nothing has changed.
+
+    Args:
+        request (Request): Incoming request (automatically injected by FastAPI)
+        limit (int): Maximum number of plants to return on this page
+        after (int, optional): Cursor from the previous page's next_cursor
+        watering_schedule (str, optional): Exact watering schedule to filter on
+        name_prefix (str, optional): Case-insensitive name prefix to filter on
+        unpaginated (bool): Return a plain list of all matching plants
+        fields (str, optional): Comma-separated fields to return (see PLANT_FIELDS)
+        ids (str, optional): Comma-separated plant IDs to return (at most MAX_PLANT_IDS)
+        garden_id (int): Garden to list (automatically injected by FastAPI)
+        db (AsyncSession): Database session (automatically injected by FastAPI)
+
+    Returns:
+        PlantPage: One page of plants, or List[PlantFields] when all=true
+        (or an empty 304 response when the client's copy is current)
+
+    Raises:
+        HTTPException: 422 if fields names an unknown field, or ids is not a list of IDs
+    """
+    selected_fields = _parse_fields(fields)
+    plant_ids = _parse_ids(ids)
+
+    # Answer conditional requests before doing any list work
+    etag, last_modified = await _get_plants_version(request, db, garden_id)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
+    # Serve repeated reads from the cache (the cache holds the encoded JSON body)
+    cache_key = _cache_key(
+        request, "list", garden_id, limit, after, watering_schedule, name_prefix, unpaginated, selected_fields,
+        plant_ids,
+    )
+    body = read_cache.get(cache_key)
+    if body is None:
+        generation = read_cache.generation  # Captured before reading, see ReadCache.set()
+        page = await _query_plants_page(
+            db, garden_id, limit, after, watering_schedule, name_prefix, unpaginated, selected_fields, plant_ids
+        )
+        body = dumps(page).decode()
+        read_cache.set(cache_key, body, generation)
+
+    # The body is already JSON in the PlantPage / List[PlantFields] shape, so it is
+    # returned directly instead of being validated again against response_model
+    fast_response = EncodedJSONResponse(body)
+    set_cache_headers(fast_response, etag, last_modified)
+    return fast_response
+
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    """
+    Turns the fields= parameter of GET /plants into the list of fields to return.
+
+    Returns:
+        List[str]: The requested fields in PLANT_FIELDS order, always including
+        "id" (the page cursor); every field when fields is not given
+
+    Raises:
+        HTTPException: 422 if a name is not a plant field
+    """
+    if fields is None:
+        return PLANT_FIELDS
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(PLANT_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown field(s): {', '.join(sorted(unknown))} (choose from {', '.join(PLANT_FIELDS)})",
+        )
+    return [field for field in PLANT_FIELDS if field in requested or field == "id"]
+
+
+def _parse_ids(ids: Optional[str]) -> Optional[List[int]]:
+    """
+    Turns the ids= parameter of GET /plants ("1,2,3") into a sorted list of distinct IDs.
+
+    Raises:
+        HTTPException: 422 if a value is not a positive whole number, or there are more than MAX_PLANT_IDS
+    """
+    if ids is None:
+        return None
+    try:
+        plant_ids = sorted({int(value) for value in ids.split(",") if value.strip()})
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be comma-separated plant IDs")
+    if any(plant_id < 1 for plant_id in plant_ids):
+        raise HTTPException(status_code=422, detail="ids must be comma-separated plant IDs")
+    if len(plant_ids) > MAX_PLANT_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_PLANT_IDS} ids can be requested at once")
+    return plant_ids
+
+
+async def _query_plants_page(
+    db: AsyncSession,
+    garden_id: int,
+    limit: int,
+    after: Optional[int],
+    watering_schedule: Optional[str],
+    name_prefix: Optional[str],
+    unpaginated: bool,
+    fields: List[str],
+    plant_ids: Optional[List[int]],
+) -> Union[dict, List[dict]]:
+    """
+    Runs the plant list query for get_plants and returns JSON-ready data.
+
+    Only the requested PlantSchema columns are selected, and rows come back as
+    plain tuples, so no ORM objects or Pydantic models are built per plant.
+    The (garden_id, id) index serves the garden filter, the ID list and the ordering.
+    """
+    # Build the base query with the optional server-side filters
+    columns = [getattr(models.Plant, field) for field in fields]
+    query = select(*columns).where(models.Plant.garden_id == garden_id).order_by(models.Plant.id)
+    if plant_ids is not None:
+        query = query.where(models.Plant.id.in_(plant_ids))
+    if watering_schedule:
+        query = query.where(models.Plant.watering_schedule == watering_schedule.strip())
+    if name_prefix:
+        query = query.where(
+            models.Plant.name_normalized.startswith(models.normalize_plant_name(name_prefix), autoescape=True)
+        )
+
+    if unpaginated:
+        logger.debug("Fetching all plants from PostgreSQL database (unpaginated)")
+        rows = (await db.execute(query)).all()
+        logger.debug("Found %d plants in database", len(rows))
+        return [dict(zip(fields, row)) for row in rows]
+
+    # Keyset pagination: continue after the last ID the client has seen
+    if after is not None:
+        query = query.where(models.Plant.id > after)
+
+    # Fetch one extra row so we know whether another page exists
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    items = [dict(zip(fields, row)) for row in rows[:limit]]
+    next_cursor = items[-1]["id"] if has_more else None
+
+    logger.debug("Returning %d plants after cursor %s (next cursor: %s)", len(items), after, next_cursor)
+    return {"items": items, "next_cursor": next_cursor, "limit": limit}
+
+
+# GET endpoint that returns only what changed in a garden since a client last synced
+# Route: GET /api/v1/plants/sync
+@router.get("/plants/sync", response_model=PlantSyncPage, dependencies=[Depends(query_budget(1))])
+async def sync_plants(
+    request: Request,  # Incoming request, used to pick the read cache entry (see _cache_key)
+    since: int = Query(0, ge=0, description="Version from the previous sync (0 = everything)"),
+    limit: int = Query(DEFAULT_SYNC_LIMIT, ge=1, le=MAX_SYNC_LIMIT),
+    garden_id: int = Depends(get_garden_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Returns the plants created, updated or deleted in a garden after version `since`.
+
+    Every write stamps the rows it changes with a version number from the
+    garden's counter, and a delete leaves a tombstone with its version (see
+    crud.claim_row_versions). Versions are committed in increasing order, so
+    a client that stores the returned `version` and sends it back as `since`
+    gets every later change exactly once, and never misses one. Starting
+    from since=0 returns every plant (without tombstones).
+
+    Changes come oldest first, one page of at most `limit` at a time, from
+    the (garden_id, row_version) indexes. A plant changed several times shows
+    up once, in its latest version.
+
+    Args:
+        request (Request): Incoming request (automatically injected by FastAPI)
+        since (int): Version returned by the previous sync (0 for a first sync)
+        limit (int): Most changes to return in this page
+        garden_id (int): Garden to sync
+        db (AsyncSession): Database session
+
+    Returns:
+        PlantSyncPage: The changes, the version to sync from next and whether more are waiting
+    """
+    cache_key = _cache_key(request, "sync", garden_id, since, limit)
+    body = read_cache.get(cache_key)
+    if body is None:
+        generation = read_cache.generation
+        rows = await crud.get_plant_changes(db, garden_id, since, limit + 1)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        changes = [
+            {
+                "id": row["id"],
+                "row_version": row["row_version"],
+                "deleted": row["deleted"],
+                "plant": None if row["deleted"] else {field: row[field] for field in PLANT_FIELDS},
+            }
+            for row in rows
+        ]
+        version = rows[-1]["row_version"] if rows else since
+        logger.debug("Sync of garden %s since %s: %d changes, now at %s", garden_id, since, len(rows), version)
+        body = dumps({"changes": changes, "version": version, "has_more": has_more}).decode()
+        read_cache.set(cache_key, body, generation)
+    return EncodedJSONResponse(body)
+
+
+async def _get_plant_response(cache_key: Optional[str], request: Request, response: Response, db: AsyncSession, query):
+    """
+    Returns one plant (from the read cache or by running query), handling conditional requests.
+
+    The plant's ETag is built from its ID and updated_at, and updated_at is
+    also sent as Last-Modified.
+
+    Raises:
+        HTTPException: If the query finds no plant
+    """
+    cached = read_cache.get(cache_key)
+    if cached is None:
+        generation = read_cache.generation
+        db_plant = await db.scalar(query)
+        if not db_plant:
+            raise HTTPException(status_code=404, detail="Plant not found")
+        cached = {"plant": _plant_to_dict(db_plant), "updated_at": _to_iso(db_plant.updated_at)}
+        read_cache.set(cache_key, cached, generation)
+
+    plant = cached["plant"]
+    etag = make_etag("plant", plant["id"], cached["updated_at"])
+    last_modified = _from_iso(cached["updated_at"])
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    set_cache_headers(response, etag, last_modified)
+    return plant
+
+
+# GET endpoint to retrieve one plant by ID
+# Route: GET /api/v1/plants/id/{plant_id}
+@router.get("/plants/id/{plant_id}", response_model=PlantSchema, dependencies=[Depends(query_budget(1))])
+async def get_plant_by_id(
+    plant_id: int,
+    request: Request,
+    response: Response,
+    garden_id: int = Depends(get_garden_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Returns a single plant by its database ID (served from the read cache when possible).
+    Supports ETag / Last-Modified conditional requests.
+
+    Args:
+        plant_id (int): Database ID of the plant
+        request (Request): Incoming request
+        response (Response): Outgoing response
+        garden_id (int): Garden the plant belongs to
+        db (AsyncSession): Database session
+
+    Returns:
+        PlantSchema: The plant
+
+    Raises:
+        HTTPException: If plant not found
+    """
+    logger.debug("Fetching plant ID: %s", plant_id)
+    query = select(models.Plant).where(_by_id(garden_id, plant_id))
+    return await _get_plant_response(_cache_key(request, "id", garden_id, plant_id), request, response, db, query)
+
+
+# GET endpoint to retrieve one plant by name
+# Route: GET /api/v1/plants/name/{plant_name}
+@router.get("/plants/name/{plant_name}", response_model=PlantSchema, dependencies=[Depends(query_budget(1))])
+async def get_plant_by_name(
+    plant_name: str,
+    request: Request,
+    response: Response,
+    garden_id: int = Depends(get_garden_id),
+    db: AsyncSession = Depends(get_read_db),
+):
     """
-    Returns all plants from the PostgreSQL database.
-    Uses SQLAlchemy ORM for database queries.
+    Returns a single plant by its name, ignoring letter case (served from the read cache when possible).
+    Supports ETag / Last-Modified conditional requests.
 
     Args:
-        db (Session): Database session (automatically injected by FastAPI)
+        plant_name (str): Name of the plant
+        request (Request): Incoming request
+        response (Response): Outgoing response
+        garden_id (int): Garden the plant belongs to
+        db (AsyncSession): Database session
 
     Returns:
-        List[PlantSchema]: All plants in the database
+        PlantSchema: The plant
+
+    Raises:
+        HTTPException: If plant not found
+    """
+    logger.debug("Fetching plant named: %s", plant_name)
+    query = select(models.Plant).where(_by_name(garden_id, plant_name))
+    cache_key = _cache_key(request, "name", garden_id, models.normalize_plant_name(plant_name))
+    return await _get_plant_response(cache_key, request, response, db, query)
+
+
+# Only one request updates an in-process search index at a time; the others
+# wait for it and then use the updated index
+_search_index_lock = asyncio.Lock()
+
+
+# GET endpoint to search plants by name and description
+# Route: GET /api/v1/plants/search
+@router.get("/plants/search", response_model=List[PlantSearchResult], dependencies=[Depends(query_budget(3))])
+async def search_plants(
+    request: Request,  # Incoming request, used to pick the read cache entry (see _cache_key)
+    q: str = Query(..., min_length=1, max_length=MAX_SEARCH_LENGTH, description="Text to search for"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    garden_id: int = Depends(get_garden_id),
+    db: AsyncSession = Depends(get_read_db),
+):
     """
-    logger.debug("Fetching all plants from PostgreSQL database")
-    # Query all plants using SQLAlchemy
-    plants = db.query(models.Plant).all()
-    logger.debug(f"Found {len(plants)} plants in database")
-    return plants
+    Searches one garden's plants and returns the best matches first.
+
+    Names match partially ("toma" finds "Tomato") and despite small typos
+    ("tomatoe"); descriptions match when they contain every word of the query.
+    Name matches rank above description-only matches.
+
+    On PostgreSQL the search runs in the database on pg_trgm and full-text
+    GIN indexes (see crud.search_plants_postgres). Other databases use an
+    in-process inverted index per garden (see search.py) that is brought up to
+    date with the garden's changes before each search. Results are served from
+    the read cache until a plant is added, updated or deleted.
+
+    Args:
+        request (Request): Incoming request (automatically injected by FastAPI)
+        q (str): Text to search for
+        limit (int): Most results to return
+        garden_id (int): Garden to search (automatically injected by FastAPI)
+        db (AsyncSession): Database session (automatically injected by FastAPI)
+
+    Returns:
+        List[PlantSearchResult]: Matching plants with their scores, best match first
+    """
+    query = " ".join(q.split())
+    if not query:
+        raise HTTPException(status_code=422, detail="Search text must not be blank")
+
+    cache_key = _cache_key(request, "search", garden_id, query.lower(), limit)
+    results = read_cache.get(cache_key)
+    if results is None:
+        generation = read_cache.generation
+        logger.debug("Searching plants for %r (limit %d)", query, limit)
+        if get_engine().dialect.name == "postgresql":
+            rows = await crud.search_plants_postgres(db, garden_id, query, limit)
+            results = [
+                {**{field: row[field] for field in PLANT_FIELDS}, "score": round(float(row["score"]), 4)}
+                for row in rows
+            ]
+        else:
+            results = await _search_plants_in_process(request, db, garden_id, query, limit)
+        read_cache.set(cache_key, results, generation)
+    return results
+
+
+async def _search_plants_in_process(
+    request: Request, db: AsyncSession, garden_id: int, query: str, limit: int
+) -> List[dict]:
+    """
+    Runs a search on the garden's in-process index, updating it first if the garden's plants changed.
+
+    Only plant IDs and scores come from the index; the matching plants are
+    then loaded with one IN query, so results always reflect the database.
+    """
+    version, _ = await _get_plants_row_version(request, db, garden_id)
+    index = plant_search_indexes.get(garden_id)
+    if index.needs_rebuild or index.version < version:
+        async with _search_index_lock:
+            await _update_search_index(db, garden_id, index, version)
+
+    matches = index.search(query, limit)
+    plants = await crud.get_plants_by_ids(db, garden_id, [plant_id for plant_id, _ in matches])
+    return [
+        {**{field: plants[plant_id][field] for field in PLANT_FIELDS}, "score": round(score, 4)}
+        for plant_id, score in matches
+        if plant_id in plants  # Skip plants deleted since the index was built
+    ]
+
+
+async def _update_search_index(db: AsyncSession, garden_id: int, index: PlantSearchIndex, version: int) -> None:
+    """
+    Brings a garden's in-process search index up to (at least) the given row_version.
+
+    The plants changed since the index's version are read from the change log
+    (crud.get_plant_changes, as GET /api/v1/plants/sync does) and applied to the
+    index, so under steady writes each search only pays for the writes since the
+    previous one. The index is rebuilt from every plant instead the first time,
+    when it asks for it (needs_rebuild) or when more than MAX_SEARCH_INDEX_CHANGES
+    changes are waiting.
+    """
+    if not index.needs_rebuild:
+        if index.version >= version:
+            return  # Another request updated it while this one waited for the lock
+        changes = await crud.get_plant_changes(db, garden_id, index.version, MAX_SEARCH_INDEX_CHANGES + 1)
+        if len(changes) <= MAX_SEARCH_INDEX_CHANGES:
+            index.apply_changes(
+                [
+                    (change["id"], None, None) if change["deleted"]
+                    else (change["id"], models.normalize_plant_name(change["name"]), change["description"])
+                    for change in changes
+                ],
+                max([version] + [change["row_version"] for change in changes]),
+            )
+            return
+
+    logger.info("Rebuilding the in-process plant search index for garden %s", garden_id)
+    rows = await crud.get_plant_search_rows(db, garden_id)
+    # Building takes a while for large gardens, so keep it off the event loop
+    await run_in_threadpool(index.build, rows, version)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Returns a timestamp in UTC. Naive timestamps (from clients that send no
+    offset, or read back from SQLite, which stores none) are taken to be UTC.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _watering_to_dict(row: dict) -> dict:
+    """Copies the PlantWatering fields of a database row, with timestamps in UTC."""
+    plant = {field: row[field] for field in WATERING_FIELDS}
+    plant["last_watered"] = _as_utc(plant["last_watered"])
+    plant["next_due"] = _as_utc(plant["next_due"])
+    return plant
+
+
+# GET endpoint to list plants that need water
+# Route: GET /api/v1/plants/due
+@router.get("/plants/due", response_model=List[PlantWatering], dependencies=[Depends(query_budget(1))])
+async def get_due_plants(
+    before: Optional[datetime] = Query(None, description="Include plants due at or before this time (default: now)"),
+    limit: int = Query(DEFAULT_DUE_LIMIT, ge=1, le=MAX_DUE_LIMIT),
+    garden_id: int = Depends(get_garden_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Returns the garden's plants that need watering by a given time, soonest first.
+
+    Runs as a range scan on the (garden_id, next_due) index, so it costs the
+    same however many plants are not due. Plants whose schedule could not be parsed have no
+    due date and are never listed.
+
+    Args:
+        before (datetime, optional): Latest due time to include; defaults to now
+        limit (int): Most plants to return
+        garden_id (int): Garden to look in (automatically injected by FastAPI)
+        db (AsyncSession): Database session (automatically injected by FastAPI)
+
+    Returns:
+        List[PlantWatering]: Due plants, ordered by next_due
+    """
+    before = _as_utc(before) or models.utc_now()
+    logger.debug("Fetching plants due before %s", before)
+    return [_watering_to_dict(row) for row in await crud.get_due_plants(db, garden_id, before, limit)]
+
+
+async def _mark_watered_where(
+    db: AsyncSession, garden_id: int, condition, event: Optional[WateringEvent]
+) -> dict:
+    """
+    Shared body of the two POST .../watered endpoints: one UPDATE ... RETURNING, then commit.
+
+    Raises:
+        HTTPException: 404 if no plant matched, 500 on database errors
+    """
+    watered_at = _as_utc(event.watered_at if event is not None else None) or models.utc_now()
+    try:
+        row_version = await _claim_row_versions(db, garden_id, 1)
+        db_plant = await crud.mark_plant_watered(db, condition, watered_at, row_version)
+        if db_plant is None:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail="Plant not found")
+        await db.commit()
+        read_cache.invalidate()
+        reminder_scheduler.schedule(db_plant["id"], db_plant["next_due"])
+        logger.info("Plant watered, next due %s", db_plant["next_due"], extra={"plant_id": db_plant["id"]})
+        return _watering_to_dict(db_plant)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error("Database error while recording watering: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+
+
+# POST endpoint to record that a plant was watered (found by ID)
+# Route: POST /api/v1/plants/id/{plant_id}/watered
+@router.post(
+    "/plants/id/{plant_id}/watered", response_model=PlantWatering, dependencies=[Depends(query_budget(2))]
+)
+async def water_plant_by_id(
+    plant_id: int,
+    event: Optional[WateringEvent] = None,
+    garden_id: int = Depends(get_garden_id),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Records a watering: sets last_watered and moves next_due one interval past it.
+
+    Args:
+        plant_id (int): ID of the plant
+        event (WateringEvent, optional): When it was watered (defaults to now)
+        garden_id (int): Garden the plant belongs to
+        db (AsyncSession): Database session
+
+    Returns:
+        PlantWatering: The plant with its new last_watered and next_due
+
+    Raises:
+        HTTPException: If plant not found
+    """
+    return await _mark_watered_where(db, garden_id, _by_id(garden_id, plant_id), event)
+
+
+# POST endpoint to record that a plant was watered (found by name)
+# Route: POST /api/v1/plants/name/{plant_name}/watered
+@router.post(
+    "/plants/name/{plant_name}/watered", response_model=PlantWatering, dependencies=[Depends(query_budget(2))]
+)
+async def water_plant_by_name(
+    plant_name: str,
+    event: Optional[WateringEvent] = None,
+    garden_id: int = Depends(get_garden_id),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Records a watering for the plant with this name (ignoring letter case).
+
+    Args:
+        plant_name (str): Name of the plant
+        event (WateringEvent, optional): When it was watered (defaults to now)
+        garden_id (int): Garden the plant belongs to
+        db (AsyncSession): Database session
+
+    Returns:
+        PlantWatering: The plant with its new last_watered and next_due
+
+    Raises:
+        HTTPException: If plant not found
+    """
+    return await _mark_watered_where(db, garden_id, _by_name(garden_id, plant_name), event)
+
+
+def _iter_plant_rows(garden_id: int, use_primary: bool) -> Iterator[Sequence[tuple]]:
+    """
+    Yields batches of one garden's plant rows from a server-side cursor.
+
+    The session is opened here rather than injected with Depends(get_read_db),
+    because the response body is streamed after the endpoint has returned.
+    It is on a read replica unless use_primary is set (see replicas.py).
+    This is a plain (sync) generator: StreamingResponse iterates it in a worker
+    thread, so the blocking cursor reads never run on the event loop.
+
+    Yields:
+        Sequence[tuple]: Up to EXPORT_BATCH_SIZE rows, each a tuple in EXPORT_FIELDS order
+    """
+    columns = [getattr(models.Plant, field) for field in EXPORT_FIELDS]
+    # yield_per turns on stream_results, so the driver fetches rows in batches
+    # instead of loading the whole result set into memory
+    statement = (
+        select(*columns)
+        .where(models.Plant.garden_id == garden_id)
+        .order_by(models.Plant.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    with read_session(use_primary) as db:
+        for batch in db.execute(statement).partitions():
+            yield batch
+
+
+def _export_ndjson(garden_id: int, use_primary: bool) -> Iterator[str]:
+    """Yields a garden's plants as newline-delimited JSON, one plant per line."""
+    for batch in _iter_plant_rows(garden_id, use_primary):
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + "\n"
+            for row in batch
+        )
+
+
+def _export_csv(garden_id: int, use_primary: bool) -> Iterator[str]:
+    """Yields a garden's plants as CSV, starting with a header row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in _iter_plant_rows(garden_id, use_primary):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        # Reset the buffer so only the current batch is held in memory
+        buffer.seek(0)
+        buffer.truncate(0)
+    # Emit the header even when the table is empty
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+# GET endpoint to stream a garden's plants as NDJSON or CSV
+# Route: GET /api/v1/plants/export
+@router.get("/plants/export")
+def export_plants(
+    request: Request,
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    garden_id: int = Depends(get_garden_id),
+):
+    """
+    Streams every plant in a garden as NDJSON or CSV.
+
+    Unlike GET /api/v1/plants?all=true, this never builds the full result in
+    memory: rows are read from a server-side cursor in batches and written to
+    the response as they arrive. Intended for nightly exports and backups.
+
+    Args:
+        request (Request): The request (its cookies decide whether a replica may be used)
+        export_format (str): "ndjson" (default) or "csv"
+        garden_id (int): Garden to export
+
+    Returns:
+        StreamingResponse: The exported plants
+    """
+    logger.debug("Exporting plants of garden %s as %s", garden_id, export_format)
+    use_primary = primary_required(request)  # Read from a replica unless the client wrote recently
+    export = _export_ndjson if export_format == "ndjson" else _export_csv
+    body = export(garden_id, use_primary)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="plants.{export_format}"'},
+    )
+
+
+# GET endpoint that streams plant changes as server-sent events
+# Route: GET /api/v1/plants/changes
+@router.get("/plants/changes", dependencies=[Depends(query_budget(0))])
+async def stream_plant_changes(
+    last_event_id: Optional[str] = Header(None), garden_id: int = Depends(get_garden_id)
+):
+    """
+    Streams a garden's plant changes (server-sent events) so clients can keep
+    their list up to date without re-fetching it.
+
+    Each "created", "updated" or "deleted" event carries the plant's ID, the
+    plant after the change, and a sequence number. A new connection starts with
+    a "ready" event: load the list once, then apply the events. Browsers send
+    the Last-Event-ID header when they reconnect and receive only the changes
+    they missed, or a "reset" event if they missed too many. See changes.py.
+
+    Browsers' EventSource can't send headers, so pass ?garden_id=... instead
+    of X-Garden-ID when subscribing from a browser.
+
+    Args:
+        last_event_id (str, optional): ID of the last event the client received
+        garden_id (int): Garden whose changes are streamed
+
+    Returns:
+        StreamingResponse: A text/event-stream that stays open
+    """
+    logger.debug("Client subscribed to plant changes (Last-Event-ID: %s)", last_event_id)
+    return StreamingResponse(
+        event_stream(change_feed, last_event_id, garden_id),
+        media_type="text/event-stream",
+        # Don't let browsers or proxies (e.g. nginx) cache or buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _batch_result(results: Sequence[Optional[BatchItemResult]]) -> BatchResult:
+    """
+    Builds the batch response, counting succeeded and failed items.
+
+    The handlers fill a list with one slot per request item; by the time this is
+    called every slot holds a result.
+    """
+    filled = [result for result in results if result is not None]
+    failed = sum(1 for result in filled if result.status == "error")
+    return BatchResult(results=filled, succeeded=len(filled) - failed, failed=failed)
+
+
+async def _run_batch(db: AsyncSession, write: Callable[[], Awaitable[T]]) -> T:
+    """
+    Runs a batch write and commits it in one transaction.
+
+    Args:
+        db (AsyncSession): Database session
+        write (Callable): Returns an awaitable that performs the set-based write
+
+    Returns:
+        The value returned by write
+
+    Raises:
+        HTTPException: 404 if the garden does not exist, 400 if a name became a
+            duplicate after the checks ran, 500 for any other database error
+    """
+    try:
+        result = await write()
+        await db.commit()
+        read_cache.invalidate()
+        return result
+    except HTTPException:
+        raise
+    except IntegrityError as e:
+        await db.rollback()
+        logger.warning("Batch rejected by a database constraint: %s", e)
+        if _is_missing_garden(e):
+            raise HTTPException(status_code=404, detail="Garden not found")
+        raise HTTPException(status_code=400, detail="Plant with this name already exists")
+    except Exception as e:
+        await db.rollback()
+        logger.error("Database error while writing batch: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+
+
+# POST endpoint to add many plants in a single transaction
+# Route: POST /api/v1/plants:batch
+# No query budget: the number of INSERT round trips depends on the driver
+# (one statement for the whole batch on PostgreSQL, one per row on SQLite).
+@router.post("/plants:batch", response_model=BatchResult)
+async def add_plants_batch(
+    batch: PlantBatchCreate, garden_id: int = Depends(get_garden_id), db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Adds up to MAX_BATCH_SIZE plants in one transaction.
+
+    Duplicate names are detected with one set-based query against the
+    database plus an in-memory check within the batch. All accepted plants
+    are written with a multi-row INSERT ... RETURNING, so the whole batch
+    costs a handful of round trips instead of four per plant.
+
+    Args:
+        batch (PlantBatchCreate): Plants to create
+        garden_id (int): Garden to add the plants to
+        db (AsyncSession): Database session
+
+    Returns:
+        BatchResult: One result per item; duplicates are reported as errors
+    """
+    logger.debug("Adding batch of %d plants", len(batch.items))
+    results: List[Optional[BatchItemResult]] = [None] * len(batch.items)
+    names = [models.normalize_plant_name(plant.name) for plant in batch.items]
+    existing = await crud.find_plant_ids_by_names(db, garden_id, names)
+
+    # Decide which items to insert; the first occurrence of a name wins
+    seen = set()
+    accepted = []
+    for index, (plant, name) in enumerate(zip(batch.items, names)):
+        if name in existing:
+            results[index] = BatchItemResult(
+                index=index, status="error", id=existing[name], error="Plant with this name already exists"
+            )
+        elif name in seen:
+            results[index] = BatchItemResult(index=index, status="error", error="Duplicate name within batch")
+        else:
+            seen.add(name)
+            accepted.append(index)
+
+    rows = [
+        {
+            "garden_id": garden_id,
+            "name": batch.items[index].name.strip(),
+            "description": batch.items[index].description.strip(),
+            "watering_schedule": batch.items[index].watering_schedule.strip(),
+        }
+        for index in accepted
+    ]
+
+    async def insert_rows() -> List[int]:
+        if rows:
+            first_version = await _claim_row_versions(db, garden_id, len(rows))
+            for offset, row in enumerate(rows):
+                row["row_version"] = first_version + offset
+        return await crud.bulk_insert_plants(db, rows)
+
+    new_ids = await _run_batch(db, insert_rows)
+    # The batch INSERT returns only IDs; the scheduler reads the due times itself
+    reminder_scheduler.refresh(new_ids)
+    for row, plant_id in zip(rows, new_ids):
+        _publish_change(garden_id, "created", {**row, "id": plant_id})
+
+    for index, plant_id in zip(accepted, new_ids):
+        results[index] = BatchItemResult(index=index, status="created", id=plant_id)
+
+    logger.info("Batch add finished: %d of %d plants created", len(new_ids), len(batch.items))
+    return _batch_result(results)
+
+
+# PUT endpoint to update many plants by ID in a single transaction
+# Route: PUT /api/v1/plants:batch
+@router.put("/plants:batch", response_model=BatchResult, dependencies=[Depends(query_budget(4))])
+async def update_plants_batch(
+    batch: PlantBatchUpdate, garden_id: int = Depends(get_garden_id), db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Updates up to MAX_BATCH_SIZE plants by ID in one transaction.
+
+    Missing IDs and name conflicts are found with one query each, and all
+    accepted updates are sent as a single executemany UPDATE.
+
+    Args:
+        batch (PlantBatchUpdate): Plants to update; every item needs an id
+        garden_id (int): Garden the plants belong to
+        db (AsyncSession): Database session
+
+    Returns:
+        BatchResult: One result per item; missing or conflicting plants are reported as errors
+    """
+    logger.debug("Updating batch of %d plants", len(batch.items))
+    results: List[Optional[BatchItemResult]] = [None] * len(batch.items)
+    names = [models.normalize_plant_name(plant.name) for plant in batch.items]
+    found_ids = await crud.find_existing_plant_ids(
+        db, garden_id, [plant.id for plant in batch.items if plant.id is not None]
+    )
+    owners = await crud.find_plant_ids_by_names(db, garden_id, names)
+
+    seen_ids = set()
+    seen_names = set()
+    rows = []
+    for index, (plant, name) in enumerate(zip(batch.items, names)):
+        error = None
+        if plant.id is None:
+            error = "Plant ID is required"
+        elif plant.id not in found_ids:
+            error = "Plant not found"
+        elif plant.id in seen_ids:
+            error = "Duplicate ID within batch"
+        elif owners.get(name, plant.id) != plant.id or name in seen_names:
+            error = "Another plant with this name already exists"
+
+        if error:
+            results[index] = BatchItemResult(index=index, status="error", id=plant.id, error=error)
+            continue
+        seen_ids.add(plant.id)
+        seen_names.add(name)
+        rows.append(
+            {
+                "id": plant.id,
+                "name": plant.name.strip(),
+                "description": plant.description.strip(),
+                "watering_schedule": plant.watering_schedule.strip(),
+            }
+        )
+        results[index] = BatchItemResult(index=index, status="updated", id=plant.id)
+
+    async def update_rows() -> None:
+        if rows:
+            first_version = await _claim_row_versions(db, garden_id, len(rows))
+            for offset, row in enumerate(rows):
+                row["row_version"] = first_version + offset
+        await crud.bulk_update_plants(db, garden_id, rows)
+
+    await _run_batch(db, update_rows)
+    reminder_scheduler.refresh(plant_id for plant_id in seen_ids if plant_id is not None)
+    for row in rows:
+        _publish_change(garden_id, "updated", row)
+
+    logger.info("Batch update finished: %d of %d plants updated", len(rows), len(batch.items))
+    return _batch_result(results)
+
+
+# DELETE endpoint to remove many plants by ID in a single statement
+# Route: DELETE /api/v1/plants:batch
+@router.delete("/plants:batch", response_model=BatchResult, dependencies=[Depends(query_budget(3))])
+async def delete_plants_batch(
+    batch: PlantBatchDelete, garden_id: int = Depends(get_garden_id), db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Deletes up to MAX_BATCH_SIZE plants by ID with one DELETE ... RETURNING,
+    and records a tombstone for each deleted plant (for GET /plants/sync).
+
+    Args:
+        batch (PlantBatchDelete): IDs of the plants to delete
+        garden_id (int): Garden the plants belong to
+        db (AsyncSession): Database session
+
+    Returns:
+        BatchResult: One result per ID; IDs that did not exist are reported as errors
+    """
+    logger.debug("Deleting batch of %d plants", len(batch.ids))
+
+    async def delete_rows() -> set:
+        if not batch.ids:
+            return set()
+        # One version per distinct ID; those of IDs that don't exist go unused
+        first_version = await _claim_row_versions(db, garden_id, len(set(batch.ids)))
+        return await crud.bulk_delete_plants(db, garden_id, batch.ids, first_version)
+
+    deleted = await _run_batch(db, delete_rows)
+    for plant_id in deleted:
+        reminder_scheduler.cancel(plant_id)
+        _publish_change(garden_id, "deleted", {"id": plant_id})
+
+    results = []
+    reported = set()
+    for index, plant_id in enumerate(batch.ids):
+        if plant_id in deleted and plant_id not in reported:
+            reported.add(plant_id)
+            results.append(BatchItemResult(index=index, status="deleted", id=plant_id))
+        else:
+            results.append(BatchItemResult(index=index, status="error", id=plant_id, error="Plant not found"))
+
+    logger.info("Batch delete finished: %d of %d plants deleted", len(reported), len(batch.ids))
+    return _batch_result(results)
+
+
+def _request_chunks(request: Request) -> Iterator[bytes]:
+    """
+    Yields the request body chunk by chunk, from a worker thread.
+
+    The import runs in a worker thread (its database calls block), while the
+    body arrives on the event loop; each chunk is fetched from the loop as the
+    import needs it, so the body is never held in memory as a whole.
+    """
+    chunks = request.stream()
+    while True:
+        try:
+            yield anyio.from_thread.run(chunks.__anext__)
+        except StopAsyncIteration:
+            return
+
+
+# POST endpoint to import a CSV or NDJSON file of plants
+# Route: POST /api/v1/plants:import
+# No query budget: the number of statements grows with the size of the file.
+@router.post("/plants:import", response_model=ImportResult)
+async def import_plants(
+    request: Request,
+    import_format: Optional[Literal["csv", "ndjson"]] = Query(None, alias="format"),
+    garden_id: int = Depends(get_garden_id),
+):
+    """
+    Imports a large CSV or NDJSON file of plants into a garden (see bulk_import.py).
+
+    The file is the raw request body (not a form upload), in the same formats
+    GET /api/v1/plants/export produces, so an export can be imported into another
+    garden. It is read and loaded in batches, so memory use stays flat however
+    big the file is. All accepted rows are imported in one transaction.
+
+    Args:
+        request (Request): The request; its body is the file
+        import_format (str, optional): "csv" or "ndjson"; taken from the Content-Type when omitted
+        garden_id (int): Garden to import into
+
+    Returns:
+        ImportResult: Rows received, imported and rejected, with the reasons
+
+    Raises:
+        HTTPException: 400 for an unreadable file, 404 if the garden does not exist,
+            500 for any other database error
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    fmt = import_format or IMPORT_MEDIA_TYPES.get(media_type)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="Set format=csv or format=ndjson (or a matching Content-Type)")
+    logger.info("Importing plants into garden %s from %s", garden_id, fmt)
+
+    def run_import() -> bulk_import.ImportReport:
+        with get_engine().begin() as connection:
+            lines = bulk_import.iter_lines(_request_chunks(request))
+            return bulk_import.import_plants(connection, lines, fmt, garden_id, PlantSchema)
+
+    try:
+        report = await run_in_threadpool(run_import)
+    except bulk_import.ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except bulk_import.GardenNotFoundError:
+        raise HTTPException(status_code=404, detail="Garden not found")
+    except IntegrityError as e:
+        logger.warning("Import rejected by a database constraint: %s", e)
+        if _is_missing_garden(e):
+            raise HTTPException(status_code=404, detail="Garden not found")
+        raise HTTPException(status_code=400, detail="Plant with this name already exists")
+    except SQLAlchemyError as e:
+        logger.error("Database error while importing plants: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+
+    if report.imported:
+        # Too many plants to send one by one: every worker is told to drop its
+        # cache and reload its reminders, and open change streams reload the list.
+        # With LISTEN/NOTIFY that arrives a moment later, so this worker's cache
+        # is dropped right away for the client's next read.
+        read_cache.invalidate()
+        change_feed.publish_reset(garden_id)
+    return report.to_dict()
 
 
 # POST endpoint to add a new plant to PostgreSQL
 # Route: POST /api/v1/plants
-@router.post("/plants", response_model=PlantSchema)
+@router.post("/plants", response_model=PlantSchema, dependencies=[Depends(query_budget(2))])
 async def add_plant(
     plant: PlantSchema,  # Request body validated against PlantSchema model
-    db: Session = Depends(get_db),  # Database session
+    garden_id: int = Depends(get_garden_id),  # Garden to add the plant to
+    db: AsyncSession = Depends(get_async_db),  # Database session
 ):
     """
-    Adds a new plant to the PostgreSQL database.
-    Includes duplicate name checking and data validation.
+    Adds a new plant to a garden in the PostgreSQL database.
+    Duplicate names (case-insensitive) within the garden are rejected by the
+    unique index on (garden_id, name_normalized), so no separate lookup query
+    is needed, and the new row comes back from INSERT ... RETURNING (one round trip,
+    after claiming the plant's row_version from the garden).
 
     Args:
         plant (PlantSchema): Plant data from request body
-        db (Session): Database session for PostgreSQL
+        garden_id (int): Garden to add the plant to
+        db (AsyncSession): Database session for PostgreSQL
 
     Returns:
         PlantSchema: Newly created plant with database ID
 
     Raises:
-        HTTPException: If plant name already exists
+        HTTPException: If plant name already exists in the garden, or the garden does not exist
     """
-    logger.debug(f"Adding new plant: {plant.name}")
+    logger.debug("Adding new plant: %s", plant.name)
 
-    # Check for existing plants with same name (case-insensitive)
-    existing = (
-        db.query(models.Plant)
-        .filter(models.Plant.name.ilike(plant.name.strip()))
-        .first()
-    )
+    try:
+        # Insert the plant with cleaned data and read back the new row
+        row_version = await _claim_row_versions(db, garden_id, 1)
+        db_plant = await crud.insert_plant(
+            db, {**_clean_plant_values(plant), "garden_id": garden_id, "row_version": row_version}
+        )
+        await db.commit()
+        read_cache.invalidate()
+        reminder_scheduler.schedule(db_plant["id"], db_plant["next_due"])
+        _publish_change(garden_id, "created", db_plant)
+
+        logger.info(
+            "Successfully added plant: %s (ID: %s)", db_plant["name"], db_plant["id"],
+            extra={"plant_id": db_plant["id"]},
+        )
+        return db_plant
 
-    if existing:
-        logger.warning(f"Duplicate plant name found: {plant.name}")
+    except HTTPException:
+        raise
+    except IntegrityError as e:
+        # The unique index on (garden_id, name_normalized) rejects duplicate names
+        # (case-insensitive), which also covers two requests racing to add the same plant
+        await db.rollback()
+        if _is_missing_garden(e):
+            logger.warning("Plant added to unknown garden %s", garden_id)
+            raise HTTPException(status_code=404, detail="Garden not found")
+        logger.warning("Duplicate plant name found: %s", plant.name)
         raise HTTPException(
             status_code=400, detail="Plant with this name already exists"
         )
+    except Exception as e:
+        # Roll back transaction on error
+        await db.rollback()
+        logger.error("Database error while adding plant: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
 
-    try:
-        # Create new database model instance with cleaned data
-        db_plant = models.Plant(
-            name=plant.name.strip(),
-            description=plant.description.strip(),
-            watering_schedule=plant.watering_schedule.strip(),
-        )
 
-        # Add to database and commit transaction
-        db.add(db_plant)
-        db.commit()
-        db.refresh(db_plant)
+def _clean_plant_values(plant: PlantSchema) -> dict:
+    """Returns the writable columns of a plant from request data, with surrounding whitespace removed."""
+    return {
+        "name": plant.name.strip(),
+        "description": plant.description.strip(),
+        "watering_schedule": plant.watering_schedule.strip(),
+    }
+
+
+async def _update_plant_where(db: AsyncSession, garden_id: int, condition, updated_plant: PlantSchema) -> dict:
+    """
+    Shared body of the two PUT endpoints: one UPDATE ... RETURNING, then commit.
+
+    There is no fetch beforehand: "not found" is an UPDATE that matched no row,
+    and a name conflict is the unique index on (garden_id, name_normalized) rejecting the UPDATE.
 
-        logger.info(f"Successfully added plant: {db_plant.name} (ID: {db_plant.id})")
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden the plant belongs to
+        condition: WHERE clause selecting the plant to update (within the garden)
+        updated_plant (PlantSchema): New plant data
+
+    Returns:
+        dict: The updated row
+
+    Raises:
+        HTTPException: 404 if no plant matched, 400 on a name conflict, 500 on other database errors
+    """
+    try:
+        row_version = await _claim_row_versions(db, garden_id, 1)
+        values = {**_clean_plant_values(updated_plant), "row_version": row_version}
+        db_plant = await crud.update_plant(db, condition, values)
+        if db_plant is None:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail="Plant not found")
+        await db.commit()
+        read_cache.invalidate()
+        reminder_scheduler.schedule(db_plant["id"], db_plant["next_due"])
+        _publish_change(garden_id, "updated", db_plant)
         return db_plant
 
+    except HTTPException:
+        raise
+    except IntegrityError:
+        # Renaming onto another plant's name violates the unique index on (garden_id, name_normalized)
+        await db.rollback()
+        logger.warning("Name conflict found: %s", updated_plant.name)
+        raise HTTPException(
+            status_code=400, detail="Another plant with this name already exists"
+        )
     except Exception as e:
-        # Roll back transaction on error
-        db.rollback()
-        logger.error(f"Database error while adding plant: {str(e)}")
+        await db.rollback()
+        logger.error("Database error updating plant: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
 
 
 # PUT endpoint to update plant by ID in PostgreSQL
 # Route: PUT /api/v1/plants/id/{plant_id}
-@router.put("/plants/id/{plant_id}", response_model=PlantSchema)
+@router.put("/plants/id/{plant_id}", response_model=PlantSchema, dependencies=[Depends(query_budget(2))])
 async def update_plant_by_id(
-    plant_id: int, updated_plant: PlantSchema, db: Session = Depends(get_db)
+    plant_id: int,
+    updated_plant: PlantSchema,
+    garden_id: int = Depends(get_garden_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Updates an existing plant in PostgreSQL by ID.
+    Updates an existing plant in PostgreSQL by ID, in a single UPDATE ... RETURNING.
 
     Args:
         plant_id (int): Database ID of plant to update
         updated_plant (PlantSchema): New plant data
-        db (Session): Database session
+        garden_id (int): Garden the plant belongs to
+        db (AsyncSession): Database session
 
     Returns:
         PlantSchema: Updated plant data
@@ -140,60 +1489,29 @@ async def update_plant_by_id(
     Raises:
         HTTPException: If plant not found or name conflict
     """
-    logger.debug(f"Updating plant ID: {plant_id}")
-
-    # Find existing plant in database
-    db_plant = db.query(models.Plant).filter(models.Plant.id == plant_id).first()
-    if not db_plant:
-        logger.debug(f"Plant ID {plant_id} not found")
-        raise HTTPException(status_code=404, detail="Plant not found")
-
-    # Check for name conflicts (excluding current plant)
-    name_conflict = (
-        db.query(models.Plant)
-        .filter(
-            models.Plant.name.ilike(updated_plant.name.strip()),
-            models.Plant.id != plant_id,
-        )
-        .first()
-    )
-
-    if name_conflict:
-        logger.warning(f"Name conflict found: {updated_plant.name}")
-        raise HTTPException(
-            status_code=400, detail="Another plant with this name already exists"
-        )
-
-    try:
-        # Update plant in database
-        db_plant.name = updated_plant.name.strip()
-        db_plant.description = updated_plant.description.strip()
-        db_plant.watering_schedule = updated_plant.watering_schedule.strip()
-        db.commit()
-        db.refresh(db_plant)
-
-        logger.info(f"Successfully updated plant ID {plant_id}")
-        return db_plant
-
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Database error updating plant: {str(e)}")
-        raise HTTPException(status_code=500, detail="Database error occurred")
+    logger.debug("Updating plant ID: %s", plant_id)
+    db_plant = await _update_plant_where(db, garden_id, _by_id(garden_id, plant_id), updated_plant)
+    logger.info("Successfully updated plant ID %s", plant_id, extra={"plant_id": plant_id})
+    return db_plant
 
 
 # PUT endpoint to update plant by name in PostgreSQL
 # Route: PUT /api/v1/plants/name/{plant_name}
-@router.put("/plants/name/{plant_name}", response_model=PlantSchema)
+@router.put("/plants/name/{plant_name}", response_model=PlantSchema, dependencies=[Depends(query_budget(2))])
 async def update_plant_by_name(
-    plant_name: str, updated_plant: PlantSchema, db: Session = Depends(get_db)
+    plant_name: str,
+    updated_plant: PlantSchema,
+    garden_id: int = Depends(get_garden_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Updates an existing plant in PostgreSQL by name.
+    Updates an existing plant in PostgreSQL by name, in a single UPDATE ... RETURNING.
 
     Args:
-        plant_name (str): Current name of plant to update
+        plant_name (str): Current name of plant to update (case-insensitive)
         updated_plant (PlantSchema): New plant data
-        db (Session): Database session
+        garden_id (int): Garden the plant belongs to
+        db (AsyncSession): Database session
 
     Returns:
         PlantSchema: Updated plant data
@@ -201,60 +1519,61 @@ async def update_plant_by_name(
     Raises:
         HTTPException: If plant not found or name conflict
     """
-    logger.debug(f"Updating plant named: {plant_name}")
+    logger.debug("Updating plant named: %s", plant_name)
+    # Match case-insensitively through the (garden_id, name_normalized) index
+    db_plant = await _update_plant_where(db, garden_id, _by_name(garden_id, plant_name), updated_plant)
+    logger.info("Successfully updated plant: %s", db_plant["name"], extra={"plant_id": db_plant["id"]})
+    return db_plant
 
-    # Find existing plant by name
-    db_plant = (
-        db.query(models.Plant)
-        .filter(models.Plant.name.ilike(plant_name.strip()))
-        .first()
-    )
 
-    if not db_plant:
-        logger.debug(f"Plant named '{plant_name}' not found")
-        raise HTTPException(status_code=404, detail="Plant not found")
+async def _delete_plant_where(db: AsyncSession, garden_id: int, condition) -> int:
+    """
+    Shared body of the two single-plant DELETE endpoints: one DELETE ... RETURNING id
+    plus a tombstone for GET /plants/sync, then commit.
 
-    # Check for name conflicts if name is being changed
-    if plant_name.strip().lower() != updated_plant.name.strip().lower():
-        name_conflict = (
-            db.query(models.Plant)
-            .filter(models.Plant.name.ilike(updated_plant.name.strip()))
-            .first()
-        )
+    Args:
+        db (AsyncSession): Database session
+        garden_id (int): Garden the plant belongs to
+        condition: WHERE clause selecting the plant to delete (within the garden)
 
-        if name_conflict:
-            logger.warning(f"Name conflict found: {updated_plant.name}")
-            raise HTTPException(
-                status_code=400, detail="Another plant with this name already exists"
-            )
+    Returns:
+        int: The deleted plant's ID
 
+    Raises:
+        HTTPException: 404 if no plant matched, 500 on database errors
+    """
     try:
-        # Update plant in database
-        db_plant.name = updated_plant.name.strip()
-        db_plant.description = updated_plant.description.strip()
-        db_plant.watering_schedule = updated_plant.watering_schedule.strip()
-        db.commit()
-        db.refresh(db_plant)
-
-        logger.info(f"Successfully updated plant: {db_plant.name}")
-        return db_plant
-
+        row_version = await _claim_row_versions(db, garden_id, 1)
+        plant_id = await crud.delete_plant(db, garden_id, condition, row_version)
+        if plant_id is None:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail="Plant not found")
+        await db.commit()
+        read_cache.invalidate()
+        reminder_scheduler.cancel(plant_id)
+        _publish_change(garden_id, "deleted", {"id": plant_id})
+        return plant_id
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
-        logger.error(f"Database error updating plant: {str(e)}")
+        await db.rollback()
+        logger.error("Database error deleting plant: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
 
 
 # DELETE endpoint to remove a plant by ID in PostgreSQL
 # Route: DELETE /api/v1/plants/id/{plant_id}
-@router.delete("/plants/id/{plant_id}", status_code=204)
-async def delete_plant_by_id(plant_id: int, db: Session = Depends(get_db)):
+@router.delete("/plants/id/{plant_id}", status_code=204, dependencies=[Depends(query_budget(3))])
+async def delete_plant_by_id(
+    plant_id: int, garden_id: int = Depends(get_garden_id), db: AsyncSession = Depends(get_async_db)
+):
     """
-    Deletes a plant from the PostgreSQL database by its ID.
+    Deletes a plant from the PostgreSQL database by its ID, with one DELETE ... RETURNING.
 
     Args:
         plant_id (int): Database ID of the plant to delete
-        db (Session): Database session
+        garden_id (int): Garden the plant belongs to
+        db (AsyncSession): Database session
 
     Returns:
         None (204 No Content)
@@ -262,32 +1581,25 @@ async def delete_plant_by_id(plant_id: int, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If plant not found
     """
-    logger.debug(f"Attempting to delete plant with ID: {plant_id}")
-    db_plant = db.query(models.Plant).filter(models.Plant.id == plant_id).first()
-    if not db_plant:
-        logger.debug(f"Plant ID {plant_id} not found for deletion")
-        raise HTTPException(status_code=404, detail="Plant not found")
-    try:
-        db.delete(db_plant)
-        db.commit()
-        logger.info(f"Successfully deleted plant with ID: {plant_id}")
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Database error deleting plant: {str(e)}")
-        raise HTTPException(status_code=500, detail="Database error occurred")
+    logger.debug("Attempting to delete plant with ID: %s", plant_id)
+    await _delete_plant_where(db, garden_id, _by_id(garden_id, plant_id))
+    logger.info("Successfully deleted plant with ID: %s", plant_id, extra={"plant_id": plant_id})
     return
 
 
 # DELETE endpoint to remove a plant by name in PostgreSQL
 # Route: DELETE /api/v1/plants/name/{plant_name}
-@router.delete("/plants/name/{plant_name}", status_code=204)
-async def delete_plant_by_name(plant_name: str, db: Session = Depends(get_db)):
+@router.delete("/plants/name/{plant_name}", status_code=204, dependencies=[Depends(query_budget(3))])
+async def delete_plant_by_name(
+    plant_name: str, garden_id: int = Depends(get_garden_id), db: AsyncSession = Depends(get_async_db)
+):
     """
-    Deletes a plant from the PostgreSQL database by its name.
+    Deletes a plant from the PostgreSQL database by its name, with one DELETE ... RETURNING.
 
     Args:
-        plant_name (str): Name of the plant to delete
-        db (Session): Database session
+        plant_name (str): Name of the plant to delete (case-insensitive)
+        garden_id (int): Garden the plant belongs to
+        db (AsyncSession): Database session
 
     Returns:
         None (204 No Content)
@@ -295,21 +1607,7 @@ async def delete_plant_by_name(plant_name: str, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If plant not found
     """
-    logger.debug(f"Attempting to delete plant with name: {plant_name}")
-    db_plant = (
-        db.query(models.Plant)
-        .filter(models.Plant.name.ilike(plant_name.strip()))
-        .first()
-    )
-    if not db_plant:
-        logger.debug(f"Plant named '{plant_name}' not found for deletion")
-        raise HTTPException(status_code=404, detail="Plant not found")
-    try:
-        db.delete(db_plant)
-        db.commit()
-        logger.info(f"Successfully deleted plant with name: {plant_name}")
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Database error deleting plant: {str(e)}")
-        raise HTTPException(status_code=500, detail="Database error occurred")
+    logger.debug("Attempting to delete plant with name: %s", plant_name)
+    plant_id = await _delete_plant_where(db, garden_id, _by_name(garden_id, plant_name))
+    logger.info("Successfully deleted plant with name: %s", plant_name, extra={"plant_id": plant_id})
     return
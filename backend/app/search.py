@@ -0,0 +1,389 @@
+# search.py
+#
+# Plant search used by GET /api/v1/plants/search.
+#
+# On PostgreSQL the database does the work (see crud.search_plants_postgres):
+# pg_trgm trigram indexes match partial and misspelled names, and a tsvector
+# index matches words in descriptions.
+#
+# Other databases (SQLite in development and tests) have neither, so this module
+# keeps an in-process inverted index that behaves much the same way:
+# - every distinct word used in a plant name is indexed by its trigrams
+#   (3-letter pieces, split the same way pg_trgm does), so "toma" and "tomatoe"
+#   both find the word "tomato"; each query word must match a word of the name
+# - descriptions are split into words; every query word must appear (like
+#   plainto_tsquery, but without stemming)
+#
+# Matching runs over the (small) set of distinct name words first and only
+# then touches plants, so a query costs roughly the number of plants whose
+# names actually match, not the size of the table.
+#
+# Each garden gets its own index (see PlantSearchIndexes), so it never serves
+# another garden's plants. The index remembers the garden row_version it is up
+# to date with; before a search, the plants changed since then are read from
+# the same change log GET /api/v1/plants/sync uses and applied one by one
+# (apply_changes), so a write costs the next search about as much as the write
+# itself. The index is only rebuilt from scratch the first time a garden is
+# searched and after many changes.
+
+import heapq
+import re
+import threading
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# A query word matches a name word at least this similar to it (in addition to
+# name words that contain it). pg_trgm compares whole strings with 0.3; single
+# words need a stricter cut-off, or short words match nearly everything.
+WORD_SIMILARITY_THRESHOLD = 0.4
+# Extra score for names that contain the whole query as written
+SUBSTRING_BONUS = 0.5
+# Score for a description that contains every query word (names rank higher)
+DESCRIPTION_SCORE = 0.1
+# After this many plant changes since the last build, the index asks to be
+# rebuilt (see PlantSearchIndex.needs_rebuild), which clears out outdated entries
+MAX_CHANGES_BEFORE_REBUILD = 20000
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Splits text into trigrams the way pg_trgm does: each word is lower-cased
+    and padded with two spaces in front and one behind, so "rose" gives
+    "  r", " ro", "ros", "ose", "se ".
+    """
+    result: Set[str] = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def words(text: str) -> Set[str]:
+    """Returns the distinct lower-cased words of a text."""
+    return set(_WORD_RE.findall(text.lower()))
+
+
+def similarity(first: Set[str], second: Set[str]) -> float:
+    """pg_trgm similarity: shared trigrams divided by the trigrams of both strings combined."""
+    shared = len(first & second)
+    total = len(first) + len(second) - shared
+    return shared / total if total else 0.0
+
+
+def _append(postings: Dict, key, value: int) -> None:
+    """Adds value to the posting list stored under key."""
+    posting = postings.get(key)
+    if posting is None:
+        posting = postings[key] = array("q")
+    posting.append(value)
+
+
+class PlantSearchIndex:
+    """
+    In-memory inverted index over plant names and descriptions.
+
+    Posting lists are compact arrays of IDs:
+    - name trigram -> IDs of the distinct name words containing it
+    - name word ID -> IDs of the plants whose name uses that word
+    - description word -> IDs of the plants whose description uses that word
+
+    Only the normalized name is kept per plant; the matching plants themselves
+    are loaded from the database by ID.
+
+    Changes after the build (apply_changes) update the name postings exactly,
+    because the old name is known. The old description is not, so a changed
+    plant's description words are remembered instead, and description postings
+    that no longer hold are skipped when searching.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = None  # Garden row_version the index is up to date with
+        self._vocabulary: List[str] = []  # Distinct name words (word ID = position)
+        self._word_ids: Dict[str, int] = {}
+        self._sorted_words: List[str] = []  # The vocabulary in sorted order, for prefix scans
+        self._trigram_words: Dict[str, array] = {}
+        self._word_plants: List[array] = []
+        self._description_postings: Dict[str, array] = {}
+        self._names: Dict[int, str] = {}
+        # Plant ID -> current description words, for plants changed since the build
+        self._changed_descriptions: Dict[int, Set[str]] = {}
+        self._changes_since_build = 0
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """True before the first build, and once enough changes have piled up that a rebuild is worth it."""
+        return self.version is None or self._changes_since_build > MAX_CHANGES_BEFORE_REBUILD
+
+    def build(self, rows: Iterable[Tuple[int, str, str]], version) -> None:
+        """
+        Replaces the index contents.
+
+        Args:
+            rows (Iterable[Tuple[int, str, str]]): (id, name_normalized, description) of every plant
+            version: Garden row_version these rows are up to date with
+        """
+        plants_by_word: Dict[str, array] = {}
+        description_postings: Dict[str, array] = {}
+        names: Dict[int, str] = {}
+        for plant_id, name, description in rows:
+            names[plant_id] = name
+            for word in words(name):
+                _append(plants_by_word, word, plant_id)
+            for word in words(description or ""):
+                _append(description_postings, word, plant_id)
+
+        vocabulary = sorted(plants_by_word)
+        trigram_words: Dict[str, array] = {}
+        for word_id, word in enumerate(vocabulary):
+            for trigram in trigrams(word):
+                _append(trigram_words, trigram, word_id)
+        word_plants = [plants_by_word[word] for word in vocabulary]
+
+        word_ids = {word: word_id for word_id, word in enumerate(vocabulary)}
+
+        with self._lock:
+            self._vocabulary, self._trigram_words, self._word_plants = vocabulary, trigram_words, word_plants
+            self._word_ids, self._sorted_words = word_ids, list(vocabulary)
+            self._description_postings, self._names = description_postings, names
+            self._changed_descriptions, self._changes_since_build = {}, 0
+            self.version = version
+
+    def apply_changes(self, changes: Iterable[Tuple[int, Optional[str], Optional[str]]], version) -> None:
+        """
+        Updates the index with plants added, changed or deleted since it was built.
+
+        Each change costs about as much as the plant's words, not the size of
+        the index. Must not run at the same time as build().
+
+        Args:
+            changes (Iterable[Tuple[int, Optional[str], Optional[str]]]): (id, name_normalized,
+                description) of each changed plant, oldest first; a name of None means deleted
+            version: Garden row_version the index is up to date with afterwards
+        """
+        for plant_id, name, description in changes:
+            self._remove_name(plant_id)
+            if name is None:
+                self._changed_descriptions.pop(plant_id, None)
+            else:
+                self._add_name(plant_id, name)
+                self._add_description(plant_id, description or "")
+            self._changes_since_build += 1
+        self.version = version
+
+    def _remove_name(self, plant_id: int) -> None:
+        name = self._names.pop(plant_id, None)
+        if name is None:
+            return
+        for word in words(name):
+            try:
+                self._word_plants[self._word_ids[word]].remove(plant_id)
+            except ValueError:
+                pass
+
+    def _add_name(self, plant_id: int, name: str) -> None:
+        self._names[plant_id] = name
+        for word in words(name):
+            word_id = self._word_ids.get(word)
+            if word_id is None:
+                word_id = self._add_word(word)
+            self._word_plants[word_id].append(plant_id)
+
+    def _add_word(self, word: str) -> int:
+        """Adds a new name word to the vocabulary and returns its word ID."""
+        word_id = len(self._vocabulary)
+        self._vocabulary.append(word)
+        self._word_ids[word] = word_id
+        self._word_plants.append(array("q"))
+        insort(self._sorted_words, word)
+        for trigram in trigrams(word):
+            _append(self._trigram_words, trigram, word_id)
+        return word_id
+
+    def _add_description(self, plant_id: int, description: str) -> None:
+        # Postings are only ever added to; words this plant already got since
+        # the build are not posted again, so repeated updates don't grow them
+        current = words(description)
+        already_posted = self._changed_descriptions.get(plant_id, set())
+        for word in current - already_posted:
+            _append(self._description_postings, word, plant_id)
+        self._changed_descriptions[plant_id] = current
+
+    def _matching_words(self, query_word: str) -> Dict[int, float]:
+        """
+        Finds the name words a single query word matches.
+
+        Returns:
+            Dict[int, float]: Word ID -> trigram similarity, for every name word that
+            contains the query word or is at least WORD_SIMILARITY_THRESHOLD similar to it
+        """
+        vocabulary, trigram_words, word_ids = self._vocabulary, self._trigram_words, self._word_ids
+        query_trigrams = trigrams(query_word)
+        candidates: Set[int] = set()
+
+        # Words containing the query word contain its unpadded trigrams
+        inner = [query_word[i:i + 3] for i in range(len(query_word) - 2)]
+        if inner:
+            postings = sorted((trigram_words.get(trigram, ()) for trigram in inner), key=len)
+            contained = set(postings[0])
+            for posting in postings[1:]:
+                contained.intersection_update(posting)
+            candidates.update(word_id for word_id in contained if query_word in vocabulary[word_id])
+        else:
+            # One or two letters are too short to be misspelled: match words
+            # starting with them (a range scan of the sorted vocabulary)
+            sorted_words = self._sorted_words
+            position = bisect_left(sorted_words, query_word)
+            while position < len(sorted_words) and sorted_words[position].startswith(query_word):
+                candidates.add(word_ids[sorted_words[position]])
+                position += 1
+            return {word_id: similarity(query_trigrams, trigrams(vocabulary[word_id])) for word_id in candidates}
+
+        # Similar words share enough trigrams with the query word. A word with
+        # similarity >= t shares at least t * len(query_trigrams) of them.
+        shared_counts: Counter = Counter()
+        for trigram in query_trigrams:
+            shared_counts.update(trigram_words.get(trigram, ()))
+        minimum = WORD_SIMILARITY_THRESHOLD * len(query_trigrams)
+        candidates.update(word_id for word_id, shared in shared_counts.items() if shared >= minimum)
+
+        scores = {word_id: similarity(query_trigrams, trigrams(vocabulary[word_id])) for word_id in candidates}
+        return {
+            word_id: score for word_id, score in scores.items()
+            if score >= WORD_SIMILARITY_THRESHOLD or query_word in vocabulary[word_id]
+        }
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """
+        Finds the plants that best match a query.
+
+        A plant's name score is the average similarity of each query word to its
+        best-matching name word, plus SUBSTRING_BONUS if the name contains the
+        whole query. A description containing every query word adds DESCRIPTION_SCORE.
+
+        Args:
+            query (str): Search text (part of a name, or words from descriptions)
+            limit (int): Most results to return
+
+        Returns:
+            List[Tuple[int, float]]: (plant ID, score) pairs, best match first
+        """
+        with self._lock:
+            description_postings, names = self._description_postings, self._names
+            changed_descriptions = self._changed_descriptions
+        needle = " ".join(query.lower().split())
+        query_words = sorted(words(needle))
+        scores: Dict[int, float] = {}
+        if not query_words:
+            return []
+
+        # Names: a plant must match every query word; its score is the average
+        # similarity of each query word to its best-matching name word
+        if len(query_words) == 1:
+            # A one-word query is in a name exactly when it is in one of the
+            # name's words, so the substring bonus is decided per name word
+            scores = self._plant_scores(query_words[0], substring_bonus=True)
+        else:
+            best_per_word = sorted((self._plant_scores(word, substring_bonus=False) for word in query_words), key=len)
+            for plant_id in best_per_word[0]:
+                total = 0.0
+                for best in best_per_word:
+                    score = best.get(plant_id)
+                    if score is None:
+                        break
+                    total += score
+                else:
+                    score = total / len(best_per_word)
+                    if needle in names[plant_id]:
+                        score += SUBSTRING_BONUS
+                    scores[plant_id] = score
+
+        # Descriptions: plants whose description contains every query word
+        postings = sorted((description_postings.get(word, ()) for word in query_words), key=len)
+        if postings[0]:
+            matching = set(postings[0])
+            for posting in postings[1:]:
+                matching.intersection_update(posting)
+            for plant_id in matching:
+                current = changed_descriptions.get(plant_id)
+                if plant_id not in names or (current is not None and not current.issuperset(query_words)):
+                    continue  # Deleted, or the posting came from an older description
+                scores[plant_id] = scores.get(plant_id, 0.0) + DESCRIPTION_SCORE
+
+        return _top(scores, limit)
+
+    def _plant_scores(self, query_word: str, substring_bonus: bool) -> Dict[int, float]:
+        """
+        Returns plant ID -> similarity of the query word to the plant's best-matching name word.
+
+        With substring_bonus, name words containing the query word score SUBSTRING_BONUS extra.
+        """
+        vocabulary, word_plants = self._vocabulary, self._word_plants
+        word_scores = self._matching_words(query_word)
+        if substring_bonus:
+            for word_id in word_scores:
+                if query_word in vocabulary[word_id]:
+                    word_scores[word_id] += SUBSTRING_BONUS
+        best: Dict[int, float] = {}
+        # Lowest scores first, so a plant's best-matching word is written last
+        # (dict.update/fromkeys keep the per-plant work in C)
+        for word_id, score in sorted(word_scores.items(), key=lambda item: item[1]):
+            best.update(dict.fromkeys(word_plants[word_id], score))
+        return best
+
+
+def _top(scores: Dict[int, float], limit: int) -> List[Tuple[int, float]]:
+    """
+    Returns the `limit` best (plant ID, score) pairs: best score first, lowest ID
+    first among equal scores.
+
+    Many plants often share a score, so instead of sorting every match with a
+    Python key function, this finds the cut-off score and only sorts what is
+    above it (ties at the cut-off are picked by ID).
+    """
+    if not scores:
+        return []
+    cutoff = heapq.nlargest(limit, scores.values())[-1]
+    above = sorted(((plant_id, score) for plant_id, score in scores.items() if score > cutoff),
+                   key=lambda item: (-item[1], item[0]))
+    tied = heapq.nsmallest(limit - len(above), [plant_id for plant_id, score in scores.items() if score == cutoff])
+    return above + [(plant_id, cutoff) for plant_id in tied]
+
+
+class PlantSearchIndexes:
+    """
+    One PlantSearchIndex per garden, keeping only the most recently searched gardens.
+
+    Building an index for every garden up front would cost memory for gardens
+    nobody searches; instead an index is created the first time a garden is
+    searched, and the least recently used one is dropped when there are more
+    than max_gardens.
+    """
+
+    def __init__(self, max_gardens: int = 64):
+        self.max_gardens = max_gardens
+        self._lock = threading.Lock()
+        self._indexes: "OrderedDict[int, PlantSearchIndex]" = OrderedDict()
+
+    def get(self, garden_id: int) -> PlantSearchIndex:
+        """Returns the index for a garden (an empty, unbuilt one if it has none yet)."""
+        with self._lock:
+            index = self._indexes.get(garden_id)
+            if index is None:
+                index = self._indexes[garden_id] = PlantSearchIndex()
+                while len(self._indexes) > self.max_gardens:
+                    self._indexes.popitem(last=False)
+            else:
+                self._indexes.move_to_end(garden_id)
+            return index
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+
+# Shared indexes used by the search endpoint on databases without pg_trgm
+plant_search_indexes = PlantSearchIndexes()
@@ -0,0 +1,135 @@
+# watering.py
+#
+# Structured watering schedules.
+#
+# Plant.watering_schedule is free text typed by the user ("Once a week",
+# "Every 3 days", ...). parse_watering_schedule() turns it into an interval in
+# hours, which is stored next to it (Plant.watering_interval_hours) together
+# with when the plant was last watered and when it is next due. With next_due
+# in an indexed column, "which plants need water before X" is an index range
+# scan instead of fetching and parsing every row.
+#
+# Schedules that cannot be understood are kept as text, with no interval and
+# no due date; they simply never show up as due.
+
+import re
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# Length of each unit in hours (a month is counted as 30 days)
+HOURS_PER_UNIT = {"hour": 1, "day": 24, "week": 24 * 7, "fortnight": 24 * 14, "month": 24 * 30, "year": 24 * 365}
+
+# Single words that mean "every one <unit>"
+_ADVERBS = {
+    "hourly": "hour",
+    "daily": "day",
+    "nightly": "day",
+    "weekly": "week",
+    "fortnightly": "fortnight",
+    "biweekly": "fortnight",
+    "monthly": "month",
+    "yearly": "year",
+    "annually": "year",
+}
+
+_NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "once": 1, "two": 2, "twice": 2, "three": 3, "thrice": 3, "four": 4,
+    "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}
+
+_UNIT = r"(hour|day|week|fortnight|month|year)s?"
+_NUMBER = r"(\d+|" + "|".join(_NUMBER_WORDS) + r")"
+
+# "every 3 days", "every day", "every other week", "each 2 weeks"
+_EVERY_RE = re.compile(r"^(?:every|each)\s+(?:(other)\s+|" + _NUMBER + r"\s+)?" + _UNIT + r"$")
+# "once a week", "twice per day", "3 times a week", "3x a week", "once every 2 weeks"
+_TIMES_RE = re.compile(
+    r"^" + _NUMBER + r"(?:\s*x|\s+times?)?\s+(?:a|an|per|every|each)\s+(?:" + _NUMBER + r"\s+)?" + _UNIT + r"$"
+)
+
+
+def _to_number(text: str) -> int:
+    return int(text) if text.isdigit() else _NUMBER_WORDS[text]
+
+
+def parse_watering_schedule(schedule: Optional[str]) -> Optional[int]:
+    """
+    Converts a free-text watering schedule into an interval in hours.
+
+    Understands forms like "Daily", "Weekly", "Every day", "Every 3 days",
+    "Every other week", "Once a week", "Twice a day" and "3 times a week".
+    Intervals shorter than an hour are rounded up to one hour.
+
+    Args:
+        schedule (str, optional): The schedule as the user typed it
+
+    Returns:
+        Optional[int]: Hours between waterings, or None if the text is not understood
+    """
+    if not schedule:
+        return None
+    text = " ".join(schedule.lower().replace("-", " ").split()).rstrip(".!")
+
+    if text.replace(" ", "") in _ADVERBS:  # "Weekly", "Bi-weekly"
+        return HOURS_PER_UNIT[_ADVERBS[text.replace(" ", "")]]
+
+    match = _EVERY_RE.match(text)
+    if match:
+        other, count, unit = match.groups()
+        every = 2 if other else _to_number(count) if count else 1
+        return every * HOURS_PER_UNIT[unit] or None
+
+    match = _TIMES_RE.match(text)
+    if match:
+        times_text, every_text, unit = match.groups()
+        times = _to_number(times_text)
+        every = _to_number(every_text) if every_text else 1
+        if times == 0 or every == 0:
+            return None
+        return max(1, round(every * HOURS_PER_UNIT[unit] / times))
+
+    return None
+
+
+def next_due_after(watered_at: datetime, interval_hours: Optional[int]) -> Optional[datetime]:
+    """Returns when a plant watered at `watered_at` is due again (None without an interval)."""
+    return watered_at + timedelta(hours=interval_hours) if interval_hours is not None else None
+
+
+class plus_hours(FunctionElement):
+    """
+    SQL expression for "timestamp + hours", e.g. last_watered + watering_interval_hours.
+
+    Date arithmetic is written differently by each database, so this compiles to
+    make_interval() on PostgreSQL and to datetime(..., '+N hours') on SQLite.
+    The result is NULL when either argument is NULL.
+
+    Usage: plus_hours(Plant.last_watered, Plant.watering_interval_hours)
+    """
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+    name = "plus_hours"
+
+
+@compiles(plus_hours)
+def _plus_hours_default(element, compiler, **kw):
+    timestamp, hours = list(element.clauses)
+    return f"({compiler.process(timestamp, **kw)} + {compiler.process(hours, **kw)} * INTERVAL '1 hour')"
+
+
+@compiles(plus_hours, "postgresql")
+def _plus_hours_postgresql(element, compiler, **kw):
+    timestamp, hours = list(element.clauses)
+    return f"({compiler.process(timestamp, **kw)} + make_interval(hours => {compiler.process(hours, **kw)}))"
+
+
+@compiles(plus_hours, "sqlite")
+def _plus_hours_sqlite(element, compiler, **kw):
+    timestamp, hours = list(element.clauses)
+    # SQLite stores timestamps as text; datetime() returns the same "YYYY-MM-DD HH:MM:SS" form
+    return f"datetime({compiler.process(timestamp, **kw)}, '+' || {compiler.process(hours, **kw)} || ' hours')"
@@ -0,0 +1,92 @@
+"""
+Benchmark: response size and latency of the full plant list with and without compression.
+
+Seeds a temporary SQLite database with N plants, then requests
+GET /api/v1/plants?all=true through the in-process TestClient with
+Accept-Encoding set to identity, gzip and br. For each encoding it prints the
+bytes sent on the wire, the median server latency and an estimated download
+time on a slow link (--mbps), which is where compression pays off.
+
+The list body is served from the read cache after the first request, so the
+latency column is mostly the cost of compressing it. Run from backend/:
+
+    python benchmarks/bench_compression.py --rows 50000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ["DATABASE_ASYNC"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import database, models  # noqa: E402
+from app.main import app  # noqa: E402
+
+ENCODINGS = ["identity", "gzip", "br"]
+
+
+def seed(rows: int):
+    """Creates the tables and inserts `rows` plants in one transaction."""
+    models.Base.metadata.create_all(database.get_engine())
+    with database.SessionLocal() as session:
+        session.execute(
+            models.Plant.__table__.insert(),
+            [
+                {
+                    "name": f"Plant {i}",
+                    "name_normalized": f"plant {i}",
+                    "description": f"Description of plant number {i}, planted in the north bed",
+                    "watering_schedule": "Once a week" if i % 2 else "Daily",
+                }
+                for i in range(1, rows + 1)
+            ],
+        )
+        session.commit()
+
+
+def measure(client: TestClient, encoding: str, repeat: int):
+    """Returns (bytes on the wire, median latency in seconds) for one encoding."""
+    timings = []
+    wire_bytes = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        headers = {"Accept-Encoding": encoding}
+        with client.stream("GET", "/api/v1/plants", params={"all": "true"}, headers=headers) as response:
+            # iter_raw() yields the body exactly as sent, before any decoding
+            wire_bytes = sum(len(chunk) for chunk in response.iter_raw())
+        timings.append(time.perf_counter() - start)
+    return wire_bytes, statistics.median(timings)
+
+
+def main(rows: int, repeat: int, mbps: float):
+    seed(rows)
+    client = TestClient(app)
+    client.get("/api/v1/plants", params={"all": "true"})  # Warm the read cache
+
+    print(f"rows={rows} (median of {repeat}, transfer estimated at {mbps:g} Mbit/s)")
+    print(f"{'encoding':<10}{'bytes':>12}{'ratio':>8}{'latency':>12}{'transfer':>12}")
+    baseline = None
+    for encoding in ENCODINGS:
+        wire_bytes, latency = measure(client, encoding, repeat)
+        baseline = baseline or wire_bytes
+        transfer = wire_bytes * 8 / (mbps * 1_000_000)
+        print(
+            f"{encoding:<10}{wire_bytes:>12,}{wire_bytes / baseline:>8.1%}"
+            f"{latency * 1000:>9.1f} ms{transfer * 1000:>9.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="Number of plants to seed")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed requests per encoding")
+    parser.add_argument("--mbps", type=float, default=10.0, help="Link speed used for the transfer estimate")
+    args = parser.parse_args()
+    main(args.rows, args.repeat, args.mbps)
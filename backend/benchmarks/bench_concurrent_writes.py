@@ -0,0 +1,73 @@
+"""
+Concurrent write throughput benchmark for the plant API.
+
+Starts CLIENTS concurrent clients that each create, update and delete plants
+against a running backend, then prints requests per second and latency
+percentiles. Run it once with the async database layer and once with the sync
+fallback to compare them:
+
+    # Terminal 1 (from backend/)
+    DATABASE_ASYNC=true uvicorn app.main:app --port 8000
+    # Terminal 2
+    python benchmarks/bench_concurrent_writes.py --url http://localhost:8000 --clients 100
+
+Restart the server with DATABASE_ASYNC=false for the sync fallback numbers.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+async def run_client(client: httpx.AsyncClient, client_id: int, rounds: int, prefix: str, latencies: list):
+    """One simulated client: create, update, then delete a plant, `rounds` times."""
+    for round_number in range(rounds):
+        name = f"{prefix}-{client_id}-{round_number}"
+        body = {"name": name, "description": "benchmark", "watering_schedule": "Weekly"}
+
+        start = time.perf_counter()
+        created = await client.post("/api/v1/plants", json=body)
+        latencies.append(time.perf_counter() - start)
+        created.raise_for_status()
+        plant_id = created.json()["id"]
+
+        start = time.perf_counter()
+        updated = await client.put(f"/api/v1/plants/id/{plant_id}", json={**body, "description": "updated"})
+        latencies.append(time.perf_counter() - start)
+        updated.raise_for_status()
+
+        start = time.perf_counter()
+        deleted = await client.delete(f"/api/v1/plants/id/{plant_id}")
+        latencies.append(time.perf_counter() - start)
+        deleted.raise_for_status()
+
+
+async def main(url: str, clients: int, rounds: int):
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"  # Unique names so runs never collide
+    latencies: list = []
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(run_client(client, i, rounds, prefix, latencies) for i in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000  # noqa: E731
+    print(f"clients={clients} requests={len(latencies)} elapsed={elapsed:.2f}s")
+    print(f"throughput={len(latencies) / elapsed:.1f} req/s")
+    print(
+        f"latency ms: mean={statistics.mean(latencies) * 1000:.1f} "
+        f"p50={percentile(50):.1f} p95={percentile(95):.1f} p99={percentile(99):.1f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the running backend")
+    parser.add_argument("--clients", type=int, default=100, help="Number of concurrent clients")
+    parser.add_argument("--rounds", type=int, default=5, help="Create/update/delete rounds per client")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.clients, args.rounds))
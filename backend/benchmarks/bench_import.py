@@ -0,0 +1,113 @@
+"""
+Benchmark: bulk import (bulk_import.py) vs. adding plants one request at a time.
+
+Writes a CSV file of --rows plants (5% of them rejected: repeated names and
+short rows) to a temporary folder, then:
+
+- bulk: imports it with "python -m app.cli import" semantics (cli.import_file),
+  in a fresh garden, and reports rows/s and the peak Python memory allocated
+  during the import (tracemalloc);
+- per row: POSTs the first --single-rows plants one by one to /api/v1/plants
+  through the in-process TestClient (like a client looping over add_plant),
+  and extrapolates to the whole file.
+
+Run it at two sizes to see that the import's memory stays flat as the file grows.
+From backend/:
+
+    python benchmarks/bench_import.py --rows 500000
+
+Without DATABASE_URL it uses a temporary SQLite file (executemany into the
+staging table). Point DATABASE_URL at PostgreSQL (after "python -m app.cli
+migrate") to measure the COPY path.
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_tmp_dir = tempfile.mkdtemp()
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+os.environ["DATABASE_ASYNC"] = "false"
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # Keep the per-request log lines out of the results
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import cli, database, models  # noqa: E402
+from app.main import app  # noqa: E402
+
+SCHEDULES = ["Daily", "Every 3 days", "Twice a week", "Once a week", "Water when dry"]
+
+
+def write_csv(path: str, rows: int) -> None:
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["name", "description", "watering_schedule"])
+        for i in range(rows):
+            if i % 40 == 39:
+                writer.writerow([f"Plant {i - 1}", "repeated name", "Daily"])
+            elif i % 40 == 19:
+                writer.writerow([f"Plant {i}"])  # Missing fields
+            else:
+                writer.writerow([f"Plant {i}", f"Catalogue entry {i}, hardy", SCHEDULES[i % len(SCHEDULES)]])
+
+
+def new_garden(client: TestClient, name: str) -> int:
+    return client.post("/api/v1/gardens", json={"name": name}).json()["id"]
+
+
+def bench_bulk(client: TestClient, path: str) -> dict:
+    garden_id = new_garden(client, "Bulk import")
+    tracemalloc.start()
+    start = time.perf_counter()
+    report = cli.import_file(path, garden_id)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {**report, "wall_seconds": seconds, "peak_mib": peak / 2**20}
+
+
+def bench_single(client: TestClient, rows: int) -> float:
+    """Returns seconds per plant when each plant is its own POST /api/v1/plants."""
+    headers = {"X-Garden-ID": str(new_garden(client, "One by one"))}
+    start = time.perf_counter()
+    for i in range(rows):
+        client.post(
+            "/api/v1/plants",
+            json={"name": f"Plant {i}", "description": f"Catalogue entry {i}", "watering_schedule": "Daily"},
+            headers=headers,
+        )
+    return (time.perf_counter() - start) / rows
+
+
+def main(rows: int, single_rows: int):
+    if database.SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+        models.Base.metadata.create_all(database.get_engine())
+    client = TestClient(app)
+    path = os.path.join(_tmp_dir, "plants.csv")
+    write_csv(path, rows)
+    size_mib = os.path.getsize(path) / 2**20
+
+    bulk = bench_bulk(client, path)
+    per_row = bench_single(client, single_rows)
+    print(f"file: {rows:,} rows, {size_mib:.1f} MiB ({database.get_engine().dialect.name})")
+    print(
+        f"bulk import: {bulk['imported']:,} imported, {bulk['rejected']:,} rejected in {bulk['wall_seconds']:.2f} s "
+        f"({bulk['received'] / bulk['wall_seconds']:,.0f} rows/s), peak Python memory {bulk['peak_mib']:.1f} MiB"
+    )
+    print(
+        f"one POST per plant: {per_row * 1000:.2f} ms/plant "
+        f"-> {per_row * rows / 60:.1f} min for the whole file (measured on {single_rows:,} plants)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500000, help="Rows in the generated CSV file")
+    parser.add_argument("--single-rows", type=int, default=1000, help="Plants added one request at a time")
+    args = parser.parse_args()
+    main(args.rows, args.single_rows)
@@ -0,0 +1,80 @@
+"""
+Micro-benchmark: plant list serialization, response_model path vs. fast path.
+
+Compares the CPU cost of turning N plant rows into a JSON response body:
+
+- response_model path (before): ORM objects are validated against
+  List[PlantSchema] with from_attributes, dumped to JSON-compatible data and
+  encoded with json.dumps, which is what FastAPI does for a response_model.
+- fast path (now): column tuples are zipped into dicts and encoded with
+  app.responses.dumps (orjson when installed).
+
+Both paths must produce identical bytes; the script checks this first.
+No database is needed. Run from backend/:
+
+    python benchmarks/bench_list_serialization.py --rows 50000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")  # Importing the app must not need PostgreSQL
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from app import models  # noqa: E402
+from app.responses import dumps, orjson  # noqa: E402
+from app.routers.plant_router import PLANT_FIELDS, PlantSchema  # noqa: E402
+
+
+def make_rows(count: int):
+    """Builds matching ORM objects and column tuples for `count` plants."""
+    tuples = [(f"Plant {i} 🌱", f"Description of plant number {i}", "Once a week", i) for i in range(1, count + 1)]
+    objects = [
+        models.Plant(id=plant_id, name=name, description=description, watering_schedule=schedule)
+        for name, description, schedule, plant_id in tuples
+    ]
+    return objects, tuples
+
+
+def response_model_path(objects, adapter: TypeAdapter) -> bytes:
+    validated = adapter.validate_python(objects, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(tuples) -> bytes:
+    return dumps([dict(zip(PLANT_FIELDS, row)) for row in tuples])
+
+
+def best_of(repeat: int, function, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(rows: int, repeat: int):
+    objects, tuples = make_rows(rows)
+    adapter = TypeAdapter(List[PlantSchema])
+    assert response_model_path(objects, adapter) == fast_path(tuples), "Fast path output differs"
+
+    before = best_of(repeat, response_model_path, objects, adapter)
+    after = best_of(repeat, fast_path, tuples)
+    print(f"rows={rows} encoder={'orjson' if orjson is not None else 'json'} (best of {repeat})")
+    print(f"response_model path: {before * 1000:8.1f} ms")
+    print(f"fast path:           {after * 1000:8.1f} ms  ({before / after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="Number of plants to serialize")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs (the best is reported)")
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
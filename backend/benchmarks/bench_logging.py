@@ -0,0 +1,119 @@
+"""
+Benchmark: requests/sec with the old logging setup vs. the structured logging subsystem.
+
+Modes (each runs in its own subprocess so logging starts from a clean state):
+
+- legacy: what plant_router.py used to do at import time,
+  logging.basicConfig(level=logging.DEBUG), i.e. every debug message is
+  formatted and written to stderr synchronously on the request path.
+- structured: configure_logging() defaults (LOG_LEVEL=INFO, JSON, queue);
+  debug messages are skipped before any formatting.
+- structured-debug: configure_logging(level="DEBUG"); every message is
+  still emitted, but formatting and writing happen on the listener thread.
+
+Requests are sent in-process (httpx.ASGITransport, no network) against a
+temporary SQLite database, mixing single-plant reads and short list pages.
+stderr of each run is sent to a temporary file, like container logs. Each
+mode also times 100,000 isolated logger.debug() calls.
+Run from backend/:
+
+    python benchmarks/bench_logging.py --requests 5000
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ["legacy", "structured", "structured-debug"]
+
+
+def run_mode(mode: str, requests: int):
+    """Runs one mode in this process; returns (requests per second, microseconds per debug call)."""
+    import logging
+
+    import httpx
+
+    sys.path.insert(0, BACKEND_DIR)
+    from app import database, models
+    from app.logging_config import configure_logging, shutdown_logging
+    from app.main import app
+
+    # The ASGI transport doesn't run the app lifespan, so do its setup here
+    models.Base.metadata.create_all(database.get_engine())
+    if mode == "legacy":
+        logging.basicConfig(level=logging.DEBUG, force=True)
+    elif mode == "structured-debug":
+        configure_logging(level="DEBUG")
+    else:
+        configure_logging()
+    # The benchmark client's own request logging is not part of the server's cost
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("asyncio").setLevel(logging.WARNING)
+
+    async def drive() -> float:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            ids = []
+            for i in range(20):
+                response = await client.post(
+                    "/api/v1/plants",
+                    json={"name": f"Bench {i}", "description": "desc", "watering_schedule": "Weekly"},
+                )
+                ids.append(response.json()["id"])
+            start = time.perf_counter()
+            for i in range(requests):
+                if i % 2:
+                    await client.get(f"/api/v1/plants/id/{ids[i % len(ids)]}")
+                else:
+                    await client.get("/api/v1/plants", params={"limit": 10})
+            return requests / (time.perf_counter() - start)
+
+    rate = asyncio.run(drive())
+
+    # Cost of one debug call like the ones on the request path, in isolation
+    logger = logging.getLogger("app.routers.plant_router")
+    calls = 100000
+    start = time.perf_counter()
+    for i in range(calls):
+        logger.debug("Fetching plant ID: %s", i)
+    per_call = (time.perf_counter() - start) / calls * 1_000_000
+    shutdown_logging()
+    return rate, per_call
+
+
+def main(requests: int):
+    print(f"requests={requests} (in-process ASGI, SQLite, sequential)")
+    baseline = None
+    for mode in MODES:
+        with tempfile.TemporaryDirectory() as tmp, open(os.path.join(tmp, "stderr.log"), "w") as log_file:
+            env = dict(
+                os.environ,
+                DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                DATABASE_ASYNC="false",
+            )
+            output = subprocess.run(
+                [sys.executable, __file__, "--requests", str(requests), "--mode", mode],
+                env=env, cwd=BACKEND_DIR, stdout=subprocess.PIPE, stderr=log_file, text=True, check=True,
+            ).stdout
+            log_bytes = os.path.getsize(log_file.name)
+        rate, per_call = (float(value) for value in output.split())
+        baseline = baseline or rate
+        print(
+            f"{mode:<18}{rate:>8.0f} req/s ({rate / baseline:.2f}x)"
+            f"{per_call:>8.2f} us/debug call   log output: {log_bytes:,} bytes"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="Number of timed requests per mode")
+    parser.add_argument("--mode", choices=MODES, help="Run a single mode and print req/s (used internally)")
+    args = parser.parse_args()
+    if args.mode:
+        print(*run_mode(args.mode, args.requests))
+    else:
+        main(args.requests)
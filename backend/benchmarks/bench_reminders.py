@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: the watering reminder scheduler (app/reminders.py) at 1M plants.
+
+The scheduler is given N synthetic schedules through a fake loader (no
+database) and the script measures:
+- startup: building the heap from the loaded schedules
+- schedule(): moving reminders, as an update or a watering would
+- cancel(): removing reminders, as a delete would
+- idle CPU: process CPU time used while nothing is due
+
+Run from backend/:
+
+    python benchmarks/bench_reminders.py --rows 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# app.reminders imports the database module; no database is used, so any URL will do
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.reminders import QueueSink, ReminderScheduler  # noqa: E402
+
+
+async def run(rows: int, operations: int, idle: float, seed: int):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    # Everything is due between one hour and 30 days from now, so nothing fires
+    schedules = [(plant_id, now + timedelta(hours=rng.uniform(1, 720))) for plant_id in range(1, rows + 1)]
+
+    scheduler = ReminderScheduler(load_schedules=lambda plant_ids=None: schedules, load_names=lambda plant_ids: {})
+    start = time.perf_counter()
+    await scheduler.start(QueueSink())
+    while len(scheduler) < rows:
+        await asyncio.sleep(0.01)
+    print(f"rows={rows} startup load: {time.perf_counter() - start:.2f} s")
+
+    plant_ids = [rng.randint(1, rows) for _ in range(operations)]
+    due_times = [now + timedelta(hours=rng.uniform(1, 720)) for _ in range(operations)]
+    start = time.perf_counter()
+    for plant_id, due in zip(plant_ids, due_times):
+        scheduler.schedule(plant_id, due)
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / operations * 1e6
+    print(f"schedule(): {per_call:.2f} µs per call ({operations} calls, heap {len(scheduler._heap)})")
+
+    start = time.perf_counter()
+    for plant_id in plant_ids:
+        scheduler.cancel(plant_id)
+    elapsed = time.perf_counter() - start
+    print(f"cancel():   {elapsed / operations * 1e6:.2f} µs per call ({operations} calls)")
+
+    await asyncio.sleep(0.1)  # Let the scheduler handle the wake-ups from the calls above
+    cpu = time.process_time()
+    await asyncio.sleep(idle)
+    print(f"idle: {(time.process_time() - cpu) * 1000:.1f} ms CPU in {idle:.0f} s")
+
+    await scheduler.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000, help="Number of plants with a schedule")
+    parser.add_argument("--operations", type=int, default=100000, help="schedule() and cancel() calls to time")
+    parser.add_argument("--idle", type=float, default=5, help="Seconds to measure idle CPU for")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic schedules")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.operations, args.idle, args.seed))
@@ -0,0 +1,151 @@
+"""
+Micro-benchmark: the in-process plant search index (app/search.py).
+
+This is the search path used on databases without pg_trgm (SQLite). The
+script builds the index over N synthetic plants and times a mix of queries:
+whole, partial and misspelled names, and words from descriptions.
+
+It then times the same queries with writes mixed in: before each search,
+--writes plants are renamed, re-described, deleted or added and the changes
+are applied to the index (what the search endpoint does after writes), so the
+time includes keeping the index up to date. No database is needed. Run from backend/:
+
+    python benchmarks/bench_search.py --rows 1000000
+
+On PostgreSQL the search runs in the database instead (see
+crud.search_plants_postgres); check it with EXPLAIN ANALYZE after
+`alembic upgrade head` has created the GIN indexes.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.search import PlantSearchIndex  # noqa: E402
+
+SYLLABLES = ["ba", "be", "bo", "ca", "co", "da", "de", "fa", "ga", "go", "ha", "la", "le", "li", "lo", "ma", "me",
+             "mi", "na", "no", "pa", "pe", "ra", "ri", "ro", "sa", "si", "ta", "te", "to", "va", "za", "mon", "ter",
+             "lin", "sar", "bel", "gor"]
+NAME_VOCABULARY = 3000  # Distinct words used in plant names
+DESCRIPTION_VOCABULARY = 20000  # Distinct words used in descriptions
+
+
+def make_vocabulary(size: int, rng: random.Random) -> List[str]:
+    """Builds `size` distinct made-up words of 2-4 syllables."""
+    vocabulary = set()
+    while len(vocabulary) < size:
+        vocabulary.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(vocabulary)
+
+
+def make_rows(count: int, seed: int) -> List[Tuple[int, str, str]]:
+    """
+    Builds (id, name_normalized, description) for `count` synthetic plants.
+
+    Names are three words from a shared vocabulary ("Tomato Cherokee Purple"
+    style) and are unique, like the real column; descriptions are eight words.
+    """
+    rng = random.Random(seed)
+    name_words = make_vocabulary(NAME_VOCABULARY, rng)
+    description_words = make_vocabulary(DESCRIPTION_VOCABULARY, rng)
+    rows, seen = [], set()
+    while len(rows) < count:
+        name = " ".join(rng.choice(name_words) for _ in range(3))
+        if name not in seen:
+            seen.add(name)
+            rows.append((len(rows) + 1, name, " ".join(rng.choice(description_words) for _ in range(8))))
+    return rows
+
+
+def make_queries(rows: List[Tuple[int, str, str]], seed: int) -> Dict[str, str]:
+    """Picks one query of each kind from the generated plants."""
+    rng = random.Random(seed)
+    _, name, description = rng.choice(rows)
+    first, second, third = name.split()
+    typo = first[:-1] + ("a" if first[-1] != "a" else "o")  # Last letter wrong
+    description_words = description.split()
+    return {
+        "full name": name,
+        "partial name": f"{first} {second[:3]}",
+        "word prefix": first[:4],
+        "misspelled name": f"{typo} {third}",
+        "description word": description_words[2],
+        "description words": f"{description_words[2]} {description_words[5]}",
+        "two letters": first[:2],
+    }
+
+
+def make_changes(plants: List[Tuple[int, str, str]], count: int, rng: random.Random) -> List[tuple]:
+    """
+    Builds `count` changes in the form apply_changes() takes: mostly updates of
+    existing plants (a name word swapped, a new description), some deletes and adds.
+    """
+    changes: List[tuple] = []
+    for _ in range(count):
+        plant_id, name, description = rng.choice(plants)
+        kind = rng.random()
+        if kind < 0.1:
+            changes.append((plant_id, None, None))  # Deleted
+        elif kind < 0.2:
+            _, other_name, other_description = rng.choice(plants)
+            changes.append((len(plants) + rng.randint(1, 10**9), f"new {other_name}", other_description))  # Added
+        else:
+            first, second, third = name.split()
+            _, other_name, other_description = rng.choice(plants)
+            changes.append((plant_id, f"{first} {other_name.split()[1]} {third}", other_description))
+    return changes
+
+
+def time_queries(index: PlantSearchIndex, queries: Dict[str, str], repeat: int, limit: int, before_search=None):
+    for label, query in queries.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            if before_search is not None:
+                before_search()
+            results = index.search(query, limit)
+            timings.append(time.perf_counter() - start)
+        print(
+            f"{label:<18} q={query!r:<34} results={len(results):>3}"
+            f"  p50 {statistics.median(timings) * 1000:7.2f} ms  max {max(timings) * 1000:7.2f} ms"
+        )
+
+
+def main(rows: int, repeat: int, limit: int, seed: int, writes: int):
+    plants = make_rows(rows, seed)
+    index = PlantSearchIndex()
+    start = time.perf_counter()
+    index.build(plants, version=1)
+    print(f"rows={rows} build: {time.perf_counter() - start:.1f} s")
+
+    queries = make_queries(plants, seed)
+    print("warm index:")
+    time_queries(index, queries, repeat, limit)
+
+    rng = random.Random(seed)
+    version = [index.version]
+
+    def write_then_apply():
+        version[0] += writes
+        index.apply_changes(make_changes(plants, writes, rng), version[0])
+
+    # Without incremental updates, every one of these searches would pay the build time above
+    print(f"with {writes} writes applied before each search:")
+    time_queries(index, queries, repeat, limit, before_search=write_then_apply)
+    print(f"changes applied: {index._changes_since_build}, rebuild needed: {index.needs_rebuild}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000, help="Number of plants to index")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--limit", type=int, default=20, help="Results per query")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic plants")
+    parser.add_argument("--writes", type=int, default=10, help="Plant changes applied before each search")
+    args = parser.parse_args()
+    main(args.rows, args.repeat, args.limit, args.seed, args.writes)
@@ -0,0 +1,88 @@
+"""
+Benchmark: sparse fieldsets (fields=id,name) and multi-get (ids=1,2,3) on GET /api/v1/plants.
+
+Imports --plants plants with realistic descriptions (about 300 characters)
+into a temporary SQLite database, then times through the in-process TestClient:
+
+- a list view: pages of 1,000 plants with every field vs. fields=id,name;
+- fetching --known plants by ID: one GET /api/v1/plants/id/{id} each vs. one
+  GET /api/v1/plants?ids=... request.
+
+The read cache is cleared before every request, so each one queries the
+database. Prints the median time and response size. Run from backend/:
+
+    python benchmarks/bench_sparse_fields.py --plants 20000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ["DATABASE_ASYNC"] = "false"
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # Keep the per-request log lines out of the results
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import database, models  # noqa: E402
+from app.cache import read_cache  # noqa: E402
+from app.main import app  # noqa: E402
+
+DESCRIPTION = (
+    "Hardy perennial for borders and containers. Prefers full sun to part shade and well-drained soil; "
+    "feed monthly in the growing season, deadhead to prolong flowering, and cut back to the base in late "
+    "autumn. Divide every three years in spring. Attracts bees and butterflies."
+)
+
+
+def seed(client: TestClient, plants: int) -> None:
+    lines = ["name,description,watering_schedule"] + [
+        f'Plant {i},"{DESCRIPTION}",Twice a week' for i in range(plants)
+    ]
+    client.post("/api/v1/plants:import?format=csv", content="\n".join(lines))
+
+
+def timed(client: TestClient, runs: int, requests) -> tuple:
+    """Runs a list of (url, params) requests `runs` times; returns (median seconds, bytes per run)."""
+    timings, size = [], 0
+    for _ in range(runs):
+        size = 0
+        start = time.perf_counter()
+        for url, params in requests:
+            read_cache.invalidate()
+            size += len(client.get(url, params=params).content)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), size
+
+
+def main(plants: int, known: int, runs: int):
+    models.Base.metadata.create_all(database.get_engine())
+    client = TestClient(app)
+    seed(client, plants)
+    all_ids = [plant["id"] for plant in client.get("/api/v1/plants", params={"all": "true", "fields": "id"}).json()]
+    chosen = random.Random(1).sample(all_ids, known)
+
+    print(f"{plants:,} plants, median of {runs} runs")
+    rows = [
+        ("list page, every field", [("/api/v1/plants", {"limit": 1000})]),
+        ("list page, fields=id,name", [("/api/v1/plants", {"limit": 1000, "fields": "id,name"})]),
+        (f"{known} plants, one GET each", [(f"/api/v1/plants/id/{plant_id}", {}) for plant_id in chosen]),
+        (f"{known} plants, ids=...", [("/api/v1/plants", {"ids": ",".join(map(str, chosen))})]),
+    ]
+    for label, requests in rows:
+        seconds, size = timed(client, runs, requests)
+        print(f"{label:<30} {seconds * 1000:8.2f} ms {size:>10,} bytes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plants", type=int, default=20000, help="Plants in the database")
+    parser.add_argument("--known", type=int, default=20, help="Plants fetched by ID")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs (the median is reported)")
+    args = parser.parse_args()
+    main(args.plants, args.known, args.runs)
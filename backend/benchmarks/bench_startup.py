@@ -0,0 +1,110 @@
+"""
+Benchmark: how long a new worker takes to import the app and to become ready.
+
+Each run uses a fresh Python process, so nothing is cached between runs:
+- import: time to run "from app.main import app"
+- ready: time from starting "uvicorn app.main:app" until GET /health answers 200
+  (the worker has imported the app and run its startup), and until the first
+  GET /ready answers 200 (the database has been reached once)
+
+The database is a temporary SQLite file, migrated once before the runs. To
+compare with an older version of the app, point --backend-dir at a checkout of
+its backend/ folder. Run from backend/:
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SCRIPT = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "from app.main import app\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, timeout: float = 30) -> None:
+    """Polls url every 5 ms until it answers 200."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(url)
+
+
+def time_import(backend_dir: str, env: dict) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT], cwd=backend_dir, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.splitlines()[-1])
+
+
+def time_ready(backend_dir: str, env: dict):
+    """Returns (seconds until /health answers, seconds until /ready answers) for one uvicorn worker."""
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=backend_dir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(f"http://127.0.0.1:{port}/health")
+        healthy = time.perf_counter() - start
+        wait_for(f"http://127.0.0.1:{port}/ready")
+        return healthy, time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(backend_dir: str, runs: int):
+    db_dir = tempfile.mkdtemp()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{os.path.join(db_dir, 'bench.db')}",
+        "LOG_LEVEL": "WARNING",
+    }
+    # Create the schema once (older versions create it on import instead)
+    if os.path.exists(os.path.join(backend_dir, "app", "cli.py")):
+        subprocess.run([sys.executable, "-m", "app.cli", "migrate"], cwd=backend_dir, env=env, check=True)
+    time_import(backend_dir, env)  # Warm-up: writes the .pyc files
+
+    imports = [time_import(backend_dir, env) for _ in range(runs)]
+    ready = [time_ready(backend_dir, env) for _ in range(runs)]
+    print(f"backend: {backend_dir} (median of {runs} runs)")
+    print(f"{'import app.main':<28}{statistics.median(imports) * 1000:>10.0f} ms")
+    print(f"{'start -> /health 200':<28}{statistics.median(h for h, _ in ready) * 1000:>10.0f} ms")
+    print(f"{'start -> /ready 200':<28}{statistics.median(r for _, r in ready) * 1000:>10.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend-dir", default=BACKEND_DIR, help="backend/ folder of the version to measure")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh processes per measurement")
+    args = parser.parse_args()
+    main(os.path.abspath(args.backend_dir), args.runs)
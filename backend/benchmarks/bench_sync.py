@@ -0,0 +1,128 @@
+"""
+Benchmark: refreshing a client's plant list with a full reload vs. a delta sync.
+
+Imports --plants plants into a new garden of a temporary SQLite database, then
+repeats --rounds times: change --changes plants (one batch update, plus one
+delete), and refresh the list in two ways through the in-process TestClient:
+
+- full reload: page through GET /api/v1/plants (1,000 per page), which is what
+  the frontend's fetchPlants did before;
+- delta sync: GET /api/v1/plants/sync?since=<version from the last sync>.
+
+The read cache is cleared before every request, so each one queries the
+database. Prints the median time and the bytes downloaded per refresh, and
+SQLite's plan for the sync query (it should use the row_version indexes).
+Run from backend/:
+
+    python benchmarks/bench_sync.py --plants 100000 --changes 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ["DATABASE_ASYNC"] = "false"
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # Keep the per-request log lines out of the results
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app import database, models  # noqa: E402
+from app.cache import read_cache  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def seed(client: TestClient, plants: int) -> dict:
+    """Creates a garden with `plants` plants (through the bulk import) and returns its headers."""
+    garden = {"X-Garden-ID": str(client.post("/api/v1/gardens", json={"name": "Sync"}).json()["id"])}
+    lines = ["name,description,watering_schedule"] + [f"Plant {i},Plant number {i},Daily" for i in range(plants)]
+    client.post("/api/v1/plants:import?format=csv", content="\n".join(lines), headers=garden)
+    return garden
+
+
+def full_reload(client: TestClient, garden: dict) -> int:
+    """Downloads every plant page by page; returns the bytes received."""
+    received, after = 0, None
+    while True:
+        read_cache.invalidate()
+        params = {"limit": 1000, **({"after": after} if after is not None else {})}
+        response = client.get("/api/v1/plants", params=params, headers=garden)
+        received += len(response.content)
+        after = response.json()["next_cursor"]
+        if after is None:
+            return received
+
+
+def delta_sync(client: TestClient, garden: dict, since: int):
+    """Downloads the changes after `since`; returns (bytes received, new version)."""
+    received = 0
+    while True:
+        read_cache.invalidate()
+        response = client.get("/api/v1/plants/sync", params={"since": since}, headers=garden)
+        received += len(response.content)
+        page = response.json()
+        since = page["version"]
+        if not page["has_more"]:
+            return received, since
+
+
+def make_changes(client: TestClient, garden: dict, ids: list, changes: int, round_number: int):
+    """Updates changes - 1 plants in one batch and deletes one."""
+    items = [
+        {"id": plant_id, "name": f"Plant {plant_id} r{round_number}", "description": "changed",
+         "watering_schedule": "Daily"}
+        for plant_id in ids[: changes - 1]
+    ]
+    client.put("/api/v1/plants:batch", json={"items": items}, headers=garden)
+    client.request("DELETE", "/api/v1/plants:batch", json={"ids": [ids.pop()]}, headers=garden)
+
+
+def sync_query_plan(garden_id: int) -> str:
+    """Returns SQLite's plan for the sync query (changes after a version)."""
+    sql = (
+        "SELECT id, row_version FROM plants WHERE garden_id = {g} AND row_version > 1 "
+        "UNION ALL SELECT plant_id, row_version FROM plant_tombstones WHERE garden_id = {g} AND row_version > 1 "
+        "ORDER BY row_version LIMIT 1001"
+    ).format(g=garden_id)
+    with database.get_engine().connect() as connection:
+        return "; ".join(row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+
+def main(plants: int, changes: int, rounds: int):
+    models.Base.metadata.create_all(database.get_engine())
+    client = TestClient(app)
+    garden = seed(client, plants)
+    ids = [change["id"] for change in client.get(
+        "/api/v1/plants/sync", params={"limit": 10000}, headers=garden
+    ).json()["changes"]]
+    _, version = delta_sync(client, garden, 0)
+
+    full_times, full_bytes, sync_times, sync_bytes = [], [], [], []
+    for round_number in range(rounds):
+        make_changes(client, garden, ids, changes, round_number)
+        start = time.perf_counter()
+        full_bytes.append(full_reload(client, garden))
+        full_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        received, version = delta_sync(client, garden, version)
+        sync_times.append(time.perf_counter() - start)
+        sync_bytes.append(received)
+
+    print(f"{plants:,} plants, {changes} changes per refresh, median of {rounds} refreshes")
+    print(f"full reload: {statistics.median(full_times) * 1000:8.1f} ms {statistics.median(full_bytes):>12,.0f} bytes")
+    print(f"delta sync:  {statistics.median(sync_times) * 1000:8.1f} ms {statistics.median(sync_bytes):>12,.0f} bytes")
+    print(f"sync query plan: {sync_query_plan(int(garden['X-Garden-ID']))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plants", type=int, default=100000, help="Plants in the garden")
+    parser.add_argument("--changes", type=int, default=10, help="Plants changed between refreshes")
+    parser.add_argument("--rounds", type=int, default=10, help="Refreshes to time")
+    args = parser.parse_args()
+    main(args.plants, args.changes, args.rounds)
@@ -0,0 +1,127 @@
+"""
+Benchmark: per-garden plant list latency as the number of gardens (tenants) grows.
+
+Seeds a temporary SQLite database in steps (10, 100, 1,000, 10,000 gardens by
+default, each with the same number of plants) and after each step times
+GET /api/v1/plants for random gardens through the in-process TestClient, with
+the X-Garden-ID header. The read cache is cleared before every request, so
+each one runs its version query and list query against the database.
+
+Every per-garden query is served by an index that starts with garden_id, so
+the latency should stay flat while the table grows a thousandfold. Run from
+backend/:
+
+    python benchmarks/bench_tenants.py --plants-per-garden 50
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ["DATABASE_ASYNC"] = "false"
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # Keep the per-request log lines out of the results
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import select, text  # noqa: E402
+
+from app import database, models  # noqa: E402
+from app.cache import read_cache  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def add_gardens(first_id: int, last_id: int, plants_per_garden: int):
+    """Inserts gardens first_id..last_id, each with plants_per_garden plants, in one transaction."""
+    now = models.utc_now()
+    with database.SessionLocal() as session:
+        garden_ids = range(first_id, last_id + 1)
+        session.execute(
+            models.Garden.__table__.insert(),
+            [{"id": garden_id, "name": f"Garden {garden_id}", "created_at": now} for garden_id in garden_ids],
+        )
+        session.execute(
+            models.Plant.__table__.insert(),
+            [
+                {
+                    "garden_id": garden_id,
+                    "name": f"Plant {i}",
+                    "name_normalized": f"plant {i}",
+                    "description": f"Plant number {i} of garden {garden_id}",
+                    "watering_schedule": "Once a week",
+                    "updated_at": now,
+                }
+                for garden_id in garden_ids
+                for i in range(plants_per_garden)
+            ],
+        )
+        session.commit()
+
+
+def query_plan() -> str:
+    """Returns SQLite's plan for the per-garden list query (which index it uses)."""
+    statement = (
+        select(models.Plant.id, models.Plant.name)
+        .where(models.Plant.garden_id == 1)
+        .order_by(models.Plant.id)
+        .limit(101)
+    )
+    sql = str(statement.compile(database.get_engine(), compile_kwargs={"literal_binds": True}))
+    with database.get_engine().connect() as connection:
+        return "; ".join(row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+
+def measure(client: TestClient, gardens: int, requests: int, rng: random.Random) -> float:
+    """Returns the median latency (seconds) of listing a random garden's plants."""
+    timings = []
+    for _ in range(requests):
+        garden_id = rng.randint(1, gardens)
+        read_cache.invalidate()  # Make every request hit the database
+        start = time.perf_counter()
+        response = client.get("/api/v1/plants", headers={"X-Garden-ID": str(garden_id)})
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200 and response.json()["items"]
+    return statistics.median(timings)
+
+
+def main(steps, plants_per_garden: int, requests: int, seed: int):
+    rng = random.Random(seed)
+    client = TestClient(app)
+    models.Base.metadata.create_all(database.get_engine())
+    # Garden 1 is created with the schema; it gets plants like every other garden
+    add_gardens(2, steps[0], plants_per_garden)
+    with database.SessionLocal() as session:
+        session.execute(
+            models.Plant.__table__.insert(),
+            [
+                {"garden_id": 1, "name": f"Plant {i}", "name_normalized": f"plant {i}",
+                 "description": "", "watering_schedule": "Daily"}
+                for i in range(plants_per_garden)
+            ],
+        )
+        session.commit()
+
+    print(f"plants per garden={plants_per_garden} (median of {requests} requests, random gardens)")
+    print(f"{'gardens':>10}{'plants':>12}{'list latency':>16}")
+    gardens = steps[0]
+    for step in steps:
+        if step > gardens:
+            add_gardens(gardens + 1, step, plants_per_garden)
+            gardens = step
+        latency = measure(client, gardens, requests, rng)
+        print(f"{gardens:>10,}{gardens * plants_per_garden:>12,}{latency * 1000:>13.2f} ms")
+    print(f"plan: {query_plan()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gardens", default="10,100,1000,10000", help="Comma-separated garden counts to measure at")
+    parser.add_argument("--plants-per-garden", type=int, default=50, help="Plants in every garden")
+    parser.add_argument("--requests", type=int, default=500, help="Timed requests per step")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for picking gardens")
+    args = parser.parse_args()
+    main(sorted(int(count) for count in args.gardens.split(",")), args.plants_per_garden, args.requests, args.seed)
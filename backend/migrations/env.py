@@ -0,0 +1,52 @@
+# Alembic environment for the Plant Tracker backend
+#
+# This file is run by the "alembic" command. It connects to the database and
+# applies the migration scripts in migrations/versions/ in order.
+import os
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+config = context.config
+
+# Set up Python logging from alembic.ini (only when run from the command line)
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+# Use the same DATABASE_URL as the application (see app/database.py).
+# Callers such as the test suite can pass a different URL through config.attributes.
+DATABASE_URL = config.attributes.get("database_url") or os.getenv(
+    "DATABASE_URL", "postgresql://postgres:password@db:5432/postgres"
+)
+
+# The models, so "alembic revision --autogenerate" and "alembic check" can compare
+# them with the database. Migrations are still reviewed and edited by hand
+# (e.g. the PostgreSQL partitioning in 0006 is not something autogenerate writes).
+# Importing the models has no side effects: app.database creates no engine or tables at import.
+from app.models import Base  # noqa: E402
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Writes the migration SQL to stdout instead of running it (alembic upgrade --sql)."""
+    context.configure(url=DATABASE_URL, target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Connects to the database and runs the migrations."""
+    connectable = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        # render_as_batch lets ALTER TABLE migrations work on SQLite too
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,39 @@
+"""Create the plants table
+
+This is the schema the application used to create on its own with
+Base.metadata.create_all(). Databases that were created that way already
+match this revision and can be marked as migrated with:
+
+    alembic stamp 0001
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "plants",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("watering_schedule", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_plants_id", "plants", ["id"])
+    op.create_index("ix_plants_name", "plants", ["name"], unique=True)
+    op.create_index("ix_plants_description", "plants", ["description"])
+    op.create_index("ix_plants_watering_schedule", "plants", ["watering_schedule"])
+
+
+def downgrade():
+    op.drop_table("plants")
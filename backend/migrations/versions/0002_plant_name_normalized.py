@@ -0,0 +1,38 @@
+"""Add a normalized, case-insensitively unique plant name key
+
+Duplicate names used to be detected with name ILIKE '...', which cannot use
+the btree index on name and so scanned the whole table. The new
+name_normalized column holds lower(trim(name)) and carries the unique index,
+so duplicate checks are index lookups and races are caught by the database.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("plants", sa.Column("name_normalized", sa.String(), nullable=True))
+    op.execute("UPDATE plants SET name_normalized = lower(trim(name))")
+    with op.batch_alter_table("plants") as batch_op:
+        batch_op.alter_column("name_normalized", existing_type=sa.String(), nullable=False)
+        # The unique index moves from name to name_normalized
+        batch_op.drop_index("ix_plants_name")
+        batch_op.create_index("ix_plants_name", ["name"])
+        batch_op.create_index("ix_plants_name_normalized", ["name_normalized"], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table("plants") as batch_op:
+        batch_op.drop_index("ix_plants_name_normalized")
+        batch_op.drop_index("ix_plants_name")
+        batch_op.create_index("ix_plants_name", ["name"], unique=True)
+        batch_op.drop_column("name_normalized")
@@ -0,0 +1,30 @@
+"""Add plants.updated_at for HTTP caching
+
+updated_at is set on every insert and update. The API derives ETag and
+Last-Modified headers from it, so clients can revalidate their copy of the
+plant list with a 304 Not Modified instead of downloading it again.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("plants", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE plants SET updated_at = CURRENT_TIMESTAMP")
+    op.create_index("ix_plants_updated_at", "plants", ["updated_at"])
+
+
+def downgrade():
+    with op.batch_alter_table("plants") as batch_op:
+        batch_op.drop_index("ix_plants_updated_at")
+        batch_op.drop_column("updated_at")
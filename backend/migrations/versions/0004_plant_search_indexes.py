@@ -0,0 +1,47 @@
+"""Add search indexes for GET /api/v1/plants/search (PostgreSQL only)
+
+- ix_plants_name_normalized_trgm: pg_trgm GIN index for fuzzy and substring
+  name matches
+- ix_plants_description_tsv: GIN index on to_tsvector('english', description)
+  for full-text description matches
+
+Other databases have neither feature; the API searches them with an
+in-process index instead (app/search.py), so this migration does nothing there.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    if not _is_postgresql():
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_plants_name_normalized_trgm "
+        "ON plants USING gin (name_normalized gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_plants_description_tsv "
+        "ON plants USING gin (to_tsvector('english', description))"
+    )
+
+
+def downgrade():
+    if not _is_postgresql():
+        return
+    # The pg_trgm extension is left installed; other objects may depend on it
+    op.execute("DROP INDEX IF EXISTS ix_plants_description_tsv")
+    op.execute("DROP INDEX IF EXISTS ix_plants_name_normalized_trgm")
@@ -0,0 +1,61 @@
+"""Add a structured watering schedule and an indexed next-due time
+
+watering_schedule stays free text. Its parsed interval is stored in
+watering_interval_hours, and last_watered/next_due record when the plant was
+last watered and when it is next due. The index on next_due lets the API
+list due plants with a range scan instead of parsing every row.
+
+Existing plants are backfilled with the parsed interval and are due one
+interval after the migration runs.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.watering import parse_watering_schedule
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("plants", sa.Column("watering_interval_hours", sa.Integer(), nullable=True))
+    op.add_column("plants", sa.Column("last_watered", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("plants", sa.Column("next_due", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_plants_next_due", "plants", ["next_due"])
+
+    # Backfill: one UPDATE per distinct schedule text, not per plant
+    plants = sa.table(
+        "plants",
+        sa.column("watering_schedule", sa.String()),
+        sa.column("watering_interval_hours", sa.Integer()),
+        sa.column("next_due", sa.DateTime(timezone=True)),
+    )
+    connection = op.get_bind()
+    now = datetime.now(timezone.utc)
+    schedules = connection.execute(sa.select(plants.c.watering_schedule).distinct()).scalars().all()
+    for schedule in schedules:
+        interval = parse_watering_schedule(schedule)
+        if interval is None:
+            continue
+        connection.execute(
+            plants.update()
+            .where(plants.c.watering_schedule == schedule)
+            .values(watering_interval_hours=interval, next_due=now + timedelta(hours=interval))
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("plants") as batch_op:
+        batch_op.drop_index("ix_plants_next_due")
+        batch_op.drop_column("next_due")
+        batch_op.drop_column("last_watered")
+        batch_op.drop_column("watering_interval_hours")
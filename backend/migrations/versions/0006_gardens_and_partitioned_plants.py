@@ -0,0 +1,147 @@
+"""Add gardens (tenants) and scope plants by garden
+
+- gardens: one row per user's or household's garden. Garden 1 ("My garden")
+  is created here, and every existing plant is moved into it.
+- plants.garden_id: the owning garden (foreign key to gardens.id)
+- Plant names are unique per garden instead of globally: the unique index is
+  now (garden_id, name_normalized). The updated_at and next_due indexes also
+  start with garden_id, and (garden_id, id) serves the paginated plant list.
+
+On PostgreSQL the plants table is rebuilt as a hash-partitioned table
+(PARTITION BY HASH (garden_id), PARTITION_COUNT partitions), so a query for
+one garden only touches that garden's partition. PostgreSQL requires the
+partition key in the primary key, so it becomes (id, garden_id); id values
+still come from the same sequence and stay unique. Changing PARTITION_COUNT
+later means rebuilding the table again.
+
+The downgrade fails if two gardens have a plant with the same name, because
+names become globally unique again.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# Number of hash partitions of the plants table (PostgreSQL only)
+PARTITION_COUNT = 16
+
+DEFAULT_GARDEN_ID = 1
+
+# Indexes created by this migration (every per-garden query starts with garden_id)
+GARDEN_INDEXES = [
+    ("ix_plants_garden_name", ["garden_id", "name_normalized"], True),
+    ("ix_plants_garden_id_id", ["garden_id", "id"], False),
+    ("ix_plants_garden_updated_at", ["garden_id", "updated_at"], False),
+    ("ix_plants_garden_next_due", ["garden_id", "next_due"], False),
+]
+
+# Single-column indexes from migrations 0001-0005 that are kept as they are
+KEPT_INDEXES = [
+    ("ix_plants_id", ["id"]),
+    ("ix_plants_name", ["name"]),
+    ("ix_plants_description", ["description"]),
+    ("ix_plants_watering_schedule", ["watering_schedule"]),
+]
+
+# Indexes from migrations 0002-0005 that this migration replaces with GARDEN_INDEXES
+REPLACED_INDEXES = [
+    ("ix_plants_name_normalized", ["name_normalized"], True),
+    ("ix_plants_updated_at", ["updated_at"], False),
+    ("ix_plants_next_due", ["next_due"], False),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def _create_search_indexes():
+    """Re-creates the PostgreSQL search indexes from migration 0004 on a rebuilt plants table."""
+    op.execute("CREATE INDEX ix_plants_name_normalized_trgm ON plants USING gin (name_normalized gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_plants_description_tsv ON plants USING gin (to_tsvector('english', description))")
+
+
+def _rebuild_plants_table(partitioned: bool):
+    """
+    Copies plants into a new table with the same columns and swaps it in (PostgreSQL).
+
+    Indexes and constraints are not copied; the caller creates them on the new table.
+    """
+    partition_clause = " PARTITION BY HASH (garden_id)" if partitioned else ""
+    op.execute(f"CREATE TABLE plants_new (LIKE plants INCLUDING DEFAULTS){partition_clause}")
+    if partitioned:
+        for remainder in range(PARTITION_COUNT):
+            op.execute(
+                f"CREATE TABLE plants_p{remainder} PARTITION OF plants_new "
+                f"FOR VALUES WITH (MODULUS {PARTITION_COUNT}, REMAINDER {remainder})"
+            )
+    op.execute("INSERT INTO plants_new SELECT * FROM plants")
+    # Keep the ID sequence (the column default still points at it) when the old table is dropped
+    op.execute("ALTER SEQUENCE plants_id_seq OWNED BY plants_new.id")
+    op.execute("DROP TABLE plants")
+    op.execute("ALTER TABLE plants_new RENAME TO plants")
+
+
+def upgrade():
+    op.create_table(
+        "gardens",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.execute(
+        f"INSERT INTO gardens (id, name, created_at) VALUES ({DEFAULT_GARDEN_ID}, 'My garden', CURRENT_TIMESTAMP)"
+    )
+    # Existing plants all belong to the default garden
+    op.add_column(
+        "plants", sa.Column("garden_id", sa.Integer(), nullable=False, server_default=str(DEFAULT_GARDEN_ID))
+    )
+
+    if _is_postgresql():
+        # The row above was inserted with an explicit ID; move the sequence past it
+        op.execute(f"SELECT setval(pg_get_serial_sequence('gardens', 'id'), {DEFAULT_GARDEN_ID})")
+        _rebuild_plants_table(partitioned=True)
+        op.execute("ALTER TABLE plants ALTER COLUMN garden_id DROP DEFAULT")
+        op.execute("ALTER TABLE plants ADD CONSTRAINT plants_pkey PRIMARY KEY (id, garden_id)")
+        op.create_foreign_key("fk_plants_garden_id_gardens", "plants", "gardens", ["garden_id"], ["id"])
+        for name, columns in KEPT_INDEXES:
+            op.create_index(name, "plants", columns)
+        _create_search_indexes()
+    else:
+        for name, _, _ in REPLACED_INDEXES:
+            op.drop_index(name, table_name="plants")
+        with op.batch_alter_table("plants") as batch_op:
+            batch_op.alter_column("garden_id", existing_type=sa.Integer(), server_default=None)
+            batch_op.create_foreign_key("fk_plants_garden_id_gardens", "gardens", ["garden_id"], ["id"])
+
+    for name, columns, unique in GARDEN_INDEXES:
+        op.create_index(name, "plants", columns, unique=unique)
+
+
+def downgrade():
+    if _is_postgresql():
+        # Back to a plain table with a primary key on id alone
+        _rebuild_plants_table(partitioned=False)
+        op.execute("ALTER TABLE plants DROP COLUMN garden_id")
+        op.execute("ALTER TABLE plants ADD CONSTRAINT plants_pkey PRIMARY KEY (id)")
+        for name, columns in KEPT_INDEXES:
+            op.create_index(name, "plants", columns)
+        _create_search_indexes()
+    else:
+        for name, _, _ in GARDEN_INDEXES:
+            op.drop_index(name, table_name="plants")
+        with op.batch_alter_table("plants") as batch_op:
+            batch_op.drop_constraint("fk_plants_garden_id_gardens", type_="foreignkey")
+            batch_op.drop_column("garden_id")
+
+    for name, columns, unique in REPLACED_INDEXES:
+        op.create_index(name, "plants", columns, unique=unique)
+    op.drop_table("gardens")
@@ -0,0 +1,49 @@
+"""Add row versions and tombstones for incremental sync
+
+- gardens.row_version: the last version number handed out in the garden
+- plants.row_version: the version of each plant's last change, indexed with
+  garden_id for GET /api/v1/plants/sync?since=N
+- plant_tombstones: one row per deleted plant, so a sync can report deletes
+
+Existing plants get their ID as version (unique within a garden), and each
+garden's counter starts at its highest plant version.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("gardens", sa.Column("row_version", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("plants", sa.Column("row_version", sa.Integer(), nullable=False, server_default="0"))
+    op.execute("UPDATE plants SET row_version = id")
+    op.execute(
+        "UPDATE gardens SET row_version = "
+        "COALESCE((SELECT MAX(row_version) FROM plants WHERE plants.garden_id = gardens.id), 0)"
+    )
+    op.create_index("ix_plants_garden_row_version", "plants", ["garden_id", "row_version"])
+    op.create_table(
+        "plant_tombstones",
+        sa.Column("garden_id", sa.Integer(), sa.ForeignKey("gardens.id"), primary_key=True),
+        sa.Column("row_version", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("plant_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("plant_tombstones")
+    op.drop_index("ix_plants_garden_row_version", table_name="plants")
+    with op.batch_alter_table("plants") as batch_op:
+        batch_op.drop_column("row_version")
+    with op.batch_alter_table("gardens") as batch_op:
+        batch_op.drop_column("row_version")
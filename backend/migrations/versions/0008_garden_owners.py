@@ -0,0 +1,40 @@
+"""Add users and garden owners
+
+- users: one row per user that owns a garden. The IDs come from the
+  X-User-ID header set by the authenticating proxy, so they are not generated.
+- gardens.owner_id: the user a garden belongs to (foreign key to users.id).
+  Existing gardens, including the default garden, get no owner and stay
+  usable by every client.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    with op.batch_alter_table("gardens") as batch_op:
+        batch_op.add_column(sa.Column("owner_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key("fk_gardens_owner_id_users", "users", ["owner_id"], ["id"])
+        batch_op.create_index("ix_gardens_owner_id", ["owner_id"])
+
+
+def downgrade():
+    with op.batch_alter_table("gardens") as batch_op:
+        batch_op.drop_index("ix_gardens_owner_id")
+        batch_op.drop_constraint("fk_gardens_owner_id_users", type_="foreignkey")
+        batch_op.drop_column("owner_id")
+    op.drop_table("users")
@@ -2,12 +2,42 @@
 
 import './App.css';
 
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 // Import all necessary API functions
-import { fetchPlants, deletePlantById, deletePlantByName } from './services';
+import {
+  fetchPlants,
+  deletePlantById,
+  deletePlantByName,
+  searchPlants,
+  subscribeToPlantChanges,
+} from './services';
 import { PlantForm } from './components';
 import plantLogo from './logo.svg';
 
+/**
+ * Applies one change from the live change feed to a plant list
+ * @param {Array} list - The current plants
+ * @param {Object} change - { type, id, plant } as sent by the backend
+ * @returns {Array} The new list (the old one is not modified)
+ *
+ * Created and updated plants replace the plant with the same ID, or are added
+ * at the end (new plants have the highest IDs). Deleted plants are removed.
+ * Applying the same change twice gives the same list, so a change this tab
+ * made itself can arrive again from the feed without harm.
+ */
+const applyPlantChange = (list, { type, id, plant }) => {
+  if (type === 'deleted') {
+    return list.filter((existing) => existing.id !== id);
+  }
+  const index = list.findIndex((existing) => existing.id === id);
+  if (index === -1) {
+    return [...list, plant];
+  }
+  const updated = [...list];
+  updated[index] = plant;
+  return updated;
+};
+
 /**
  * Main App Component
  * Manages the plant list and editing functionality
@@ -27,21 +57,30 @@ const App = () => {
   const [selectedPlant, setSelectedPlant] = useState(null); // Plant being edited
   const [isLoading, setIsLoading] = useState(false); // Loading state
   const [success, setSuccess] = useState(null); // Success message state
+  const [searchQuery, setSearchQuery] = useState(''); // Text in the search box
+  const [searchResults, setSearchResults] = useState(null); // Matching plants (null when not searching)
+  // True while connected to the backend's live change feed (GET /plants/changes)
+  const liveUpdates = useRef(false);
+  // Changes that arrive while the list is loading; applied once it has loaded (null when not loading)
+  const pendingChanges = useRef(null);
 
   /**
    * Fetches plants from the PostgreSQL database via FastAPI
-   * Called when component mounts and after updates
+   * Called when the live change feed connects (or on mount, without the feed)
+   * and after updates when there is no live feed
    *
    * This function is responsible for retrieving the latest list of plants from the backend.
    * It sets the loading state, handles errors, and updates the plants state.
    */
   const loadPlants = async () => {
     setIsLoading(true); // Show loading indicator
+    pendingChanges.current = [];
     try {
       const fetchedPlants = await fetchPlants(); // Fetch plants from backend
       console.log('Fetched plants from database:', fetchedPlants);
-      // Update plants state with fetched data
-      setPlants(fetchedPlants);
+      // Update plants state with fetched data, plus any changes that arrived meanwhile
+      setPlants(pendingChanges.current.reduce(applyPlantChange, fetchedPlants));
+      setSearchResults(null); // Show the full, fresh list after any change
       setError(null); // Clear any previous errors
       setSuccess(null); // Clear success on successful load
     } catch (error) {
@@ -50,14 +89,98 @@ const App = () => {
       setError('Failed to load plants. Please try again later.');
       setSuccess(null); // Clear success on error
     } finally {
+      pendingChanges.current = null;
       setIsLoading(false); // Hide loading indicator
     }
   };
 
-  // Load plants when component mounts
+  /**
+   * Handles one change pushed by the backend's live change feed
+   * @param {Object} change - { type, id, plant }
+   *
+   * Only the changed plant is updated; the list is not fetched again.
+   */
+  const handlePlantChange = (change) => {
+    if (change.type !== 'deleted' && !change.plant) {
+      // The backend sent only the ID (the plant was too large to include)
+      loadPlants();
+    } else if (pendingChanges.current) {
+      pendingChanges.current.push(change);
+    } else {
+      setPlants((current) => applyPlantChange(current, change));
+    }
+  };
+
+  /**
+   * Shows a change this tab just made
+   * @param {Object} change - { type, id, plant }
+   *
+   * With the live feed connected, the change is applied to the list right away
+   * (the feed sends it again a moment later, which is harmless). Without it, the
+   * whole list is fetched again.
+   */
+  const showChange = async (change) => {
+    if (liveUpdates.current && change.id !== undefined && change.id !== null) {
+      setPlants((current) => applyPlantChange(current, change));
+      setSearchResults(null); // Show the full list after any change, as a reload would
+    } else {
+      await loadPlants();
+    }
+  };
+
+  /**
+   * Searches plants on the backend and shows only the matches
+   * @param {Event} event - The search form's submit event
+   *
+   * The backend ranks the results, so they are shown in the order returned.
+   * An empty search box shows the full plant list again.
+   */
+  const handleSearch = async (event) => {
+    event.preventDefault();
+    const query = searchQuery.trim();
+    if (!query) {
+      setSearchResults(null);
+      return;
+    }
+    setIsLoading(true);
+    try {
+      setSearchResults(await searchPlants(query));
+      setError(null);
+    } catch (error) {
+      console.error('Error searching plants:', error);
+      setError('Failed to search plants. Please try again.');
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
+  /**
+   * Clears the search and shows the full plant list again
+   */
+  const handleClearSearch = () => {
+    setSearchQuery('');
+    setSearchResults(null);
+  };
+
+  // Load plants when component mounts, and follow live changes from then on
   // useEffect is a React hook that runs after the component is rendered
   useEffect(() => {
-    loadPlants();
+    // The feed calls loadPlants once it is connected, so no change is missed in between
+    const source = subscribeToPlantChanges({
+      onReload: loadPlants,
+      onChange: handlePlantChange,
+    });
+    if (!source) {
+      // No live feed (e.g. an old browser): load once and reload after every change
+      loadPlants();
+      return undefined;
+    }
+    liveUpdates.current = true;
+    // Returned function runs when the component unmounts
+    return () => {
+      liveUpdates.current = false;
+      source.close();
+    };
   }, []); // Empty dependency array means this runs only once on mount
 
   /**
@@ -66,13 +189,13 @@ const App = () => {
    * @param {Object} newPlant - The newly added plant
    *
    * This function is called after a plant is added via the PlantForm.
-   * It refreshes the plant list to include the new plant.
+   * It adds the new plant to the list (or reloads the list without the live feed).
    */
   const handleAddPlant = async (newPlant) => {
     try {
       setError(null);
       setSuccess(null);
-      await loadPlants();
+      await showChange({ type: 'created', id: newPlant.id, plant: newPlant });
       setSuccess('Plant added successfully!');
     } catch (error) {
       console.error('Error adding plant:', error);
@@ -87,13 +210,13 @@ const App = () => {
    * @param {Object} updatedPlant - The updated plant data
    *
    * This function is called after a plant is updated via the PlantForm.
-   * It refreshes the plant list and clears the selectedPlant state.
+   * It updates the plant in the list and clears the selectedPlant state.
    */
   const handleUpdatePlant = async (updatedPlant) => {
     try {
       setError(null);
       setSuccess(null);
-      await loadPlants();
+      await showChange({ type: 'updated', id: updatedPlant.id, plant: updatedPlant });
       setSelectedPlant(null);
       setSuccess('Plant updated successfully!');
     } catch (error) {
@@ -131,7 +254,7 @@ const App = () => {
    * @param {Object} plant - The plant object to delete
    *
    * This function determines whether to delete by ID or name, calls the appropriate API function,
-   * and refreshes the plant list. It also handles errors and loading state.
+   * and removes the plant from the list. It also handles errors and loading state.
    */
   const handleDeletePlant = async (plant) => {
     try {
@@ -143,7 +266,7 @@ const App = () => {
       } else {
         await deletePlantByName(plant.name);
       }
-      await loadPlants(); // refresh list
+      await showChange({ type: 'deleted', id: plant.id, plant: null });
       setSuccess('Plant deleted successfully!');
     } catch (error) {
       setError('Failed to delete plant. Please try again.');
@@ -195,12 +318,34 @@ const App = () => {
       {/* Plant List: displays all plants and provides edit/delete buttons */}
       <section className="plant-list-section">
         <h2>Your Plants</h2>
+
+        {/* Search: shows only the plants matching the query, best match first */}
+        <form className="search-form" role="search" onSubmit={handleSearch}>
+          <input
+            type="search"
+            aria-label="Search plants"
+            placeholder="Search plants..."
+            value={searchQuery}
+            onChange={(event) => setSearchQuery(event.target.value)}
+          />
+          <button type="submit" disabled={isLoading}>
+            Search
+          </button>
+          {searchResults !== null && (
+            <button type="button" onClick={handleClearSearch}>
+              Clear
+            </button>
+          )}
+        </form>
+
         <div className="plant-list">
-          {plants.length === 0 ? (
+          {searchResults !== null && searchResults.length === 0 ? (
+            <p>No plants match your search.</p>
+          ) : plants.length === 0 ? (
             <p>No plants yet. Add your first plant above!</p>
           ) : (
             <ul>
-              {plants.map((plant) => (
+              {(searchResults ?? plants).map((plant) => (
                 <li key={plant.id || plant.name} className="plant-item">
                   <div className="plant-card">
                     <div className="plant-info">
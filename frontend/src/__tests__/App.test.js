@@ -1,5 +1,5 @@
 import React from 'react';
-import { render, screen, fireEvent, waitFor } from '@testing-library/react';
+import { render, screen, fireEvent, waitFor, act } from '@testing-library/react';
 import '@testing-library/jest-dom';
 import App from '../App';
 import * as api from '../services/api';
@@ -30,6 +30,8 @@ describe('App Component Tests', () => {
     );
     api.deletePlantById.mockResolvedValue();
     api.deletePlantByName.mockResolvedValue();
+    // No live change feed unless a test sets one up
+    api.subscribeToPlantChanges.mockImplementation(() => null);
   });
 
   // Test initial render and plant loading
@@ -58,6 +60,24 @@ describe('App Component Tests', () => {
     });
   });
 
+  // Test searching shows only the matching plants
+  test('searches plants and clears the search', async () => {
+    api.searchPlants.mockResolvedValueOnce([mockPlants[1]]);
+    render(<App />);
+    await waitFor(() => expect(screen.getByText('Rose')).toBeInTheDocument());
+
+    fireEvent.change(screen.getByLabelText('Search plants'), {
+      target: { value: 'toma' },
+    });
+    fireEvent.click(screen.getByText('Search'));
+    await waitFor(() => expect(screen.queryByText('Rose')).not.toBeInTheDocument());
+    expect(api.searchPlants).toHaveBeenCalledWith('toma');
+    expect(screen.getByText('Tomato')).toBeInTheDocument();
+
+    fireEvent.click(screen.getByText('Clear'));
+    expect(screen.getByText('Rose')).toBeInTheDocument();
+  });
+
   // Test plant editing workflow
   test('enables plant editing mode correctly', async () => {
     render(<App />);
@@ -270,6 +290,34 @@ describe('App Component Tests', () => {
     await waitFor(() => expect(screen.getByText('Rose')).toBeInTheDocument());
   });
 
+  test('applies live changes without fetching the list again', async () => {
+    // Capture the handlers App registers with the live change feed
+    let feed;
+    api.subscribeToPlantChanges.mockImplementation((handlers) => {
+      feed = handlers;
+      return { close: jest.fn() };
+    });
+    render(<App />);
+    // The list is loaded once the feed is connected
+    expect(api.fetchPlants).not.toHaveBeenCalled();
+    await act(async () => feed.onReload());
+    expect(screen.getByText('Rose')).toBeInTheDocument();
+
+    act(() => {
+      feed.onChange({ type: 'created', id: 3, plant: { id: 3, name: 'Basil', description: 'Herb' } });
+      feed.onChange({ type: 'updated', id: 1, plant: { id: 1, name: 'Red Rose', description: 'A beautiful flower' } });
+      feed.onChange({ type: 'deleted', id: 2, plant: null });
+    });
+    expect(screen.getByText('Basil')).toBeInTheDocument();
+    expect(screen.getByText('Red Rose')).toBeInTheDocument();
+    expect(screen.queryByText('Tomato')).not.toBeInTheDocument();
+
+    // This tab's own delete updates the list directly, without a refetch
+    fireEvent.click(screen.getAllByText('Delete')[0]);
+    await waitFor(() => expect(screen.queryByText('Red Rose')).not.toBeInTheDocument());
+    expect(api.fetchPlants).toHaveBeenCalledTimes(1);
+  });
+
   test('accessibility: all buttons have accessible names', async () => {
     render(<App />);
     await waitFor(() => expect(screen.getByText('Rose')).toBeInTheDocument());
@@ -6,6 +6,8 @@ import {
   updatePlantById,
   deletePlantById,
   deletePlantByName,
+  searchPlants,
+  subscribeToPlantChanges,
 } from '../services/api';
 
 // Mock the global fetch function
@@ -30,10 +32,13 @@ describe('API Service Tests', () => {
 
   // Test GET plants endpoint
   test('fetchPlants calls correct endpoint with GET method', async () => {
+    fetch.mockImplementationOnce(() =>
+      Promise.resolve(mockFetchResponse({ changes: [], version: 0, has_more: false })),
+    );
     await fetchPlants();
 
     expect(fetch).toHaveBeenCalledWith(
-      'http://localhost:8000/api/v1/plants',
+      'http://localhost:8000/api/v1/plants/sync?since=0',
       expect.objectContaining({
         method: 'GET',
         headers: {
@@ -43,6 +48,53 @@ describe('API Service Tests', () => {
     );
   });
 
+  // Later fetches only download what changed, and apply it to the previous list
+  test('fetchPlants applies changes since the last sync', async () => {
+    const rose = { id: 1, name: 'Rose' };
+    const fern = { id: 2, name: 'Fern' };
+    fetch
+      .mockImplementationOnce(() =>
+        Promise.resolve(
+          mockFetchResponse({
+            changes: [{ id: 1, deleted: false, plant: rose }],
+            version: 4,
+            has_more: true,
+          }),
+        ),
+      )
+      .mockImplementationOnce(() =>
+        Promise.resolve(
+          mockFetchResponse({
+            changes: [{ id: 2, deleted: false, plant: fern }],
+            version: 5,
+            has_more: false,
+          }),
+        ),
+      );
+    expect(await fetchPlants()).toEqual([rose, fern]);
+
+    const mint = { id: 3, name: 'Mint' };
+    fetch.mockImplementationOnce(() =>
+      Promise.resolve(
+        mockFetchResponse({
+          changes: [
+            { id: 1, deleted: true, plant: null },
+            { id: 3, deleted: false, plant: mint },
+            { id: 2, deleted: false, plant: { ...fern, name: 'Tree fern' } },
+          ],
+          version: 8,
+          has_more: false,
+        }),
+      ),
+    );
+    expect(await fetchPlants()).toEqual([{ ...fern, name: 'Tree fern' }, mint]);
+    expect(fetch.mock.calls.map(([url]) => url)).toEqual([
+      'http://localhost:8000/api/v1/plants/sync?since=0',
+      'http://localhost:8000/api/v1/plants/sync?since=4',
+      'http://localhost:8000/api/v1/plants/sync?since=5',
+    ]);
+  });
+
   // Test POST new plant endpoint
   test('addPlant sends correct data with POST method', async () => {
     const newPlant = {
@@ -136,4 +188,55 @@ describe('API Service Tests', () => {
       'Failed to delete plant',
     );
   });
+
+  test('searchPlants calls the search endpoint with an encoded query', async () => {
+    fetch.mockResolvedValueOnce(mockFetchResponse([{ id: 2, name: 'Tomato', score: 1.2 }]));
+    const results = await searchPlants('cherry tom');
+    expect(fetch).toHaveBeenCalledWith(
+      'http://localhost:8000/api/v1/plants/search?q=cherry%20tom',
+      expect.objectContaining({ method: 'GET' }),
+    );
+    expect(results).toEqual([{ id: 2, name: 'Tomato', score: 1.2 }]);
+  });
+
+  test('searchPlants throws error on failure', async () => {
+    fetch.mockResolvedValueOnce(mockFetchResponse({}, false));
+    await expect(searchPlants('rose')).rejects.toThrow('Failed to search plants');
+  });
+
+  test('subscribeToPlantChanges returns null without EventSource support', () => {
+    expect(subscribeToPlantChanges({ onReload: jest.fn(), onChange: jest.fn() })).toBeNull();
+  });
+
+  test('subscribeToPlantChanges forwards feed events to the handlers', () => {
+    // Minimal stand-in for the browser's EventSource
+    const listeners = {};
+    global.EventSource = jest.fn(() => ({
+      addEventListener: (type, listener) => {
+        listeners[type] = listener;
+      },
+      close: jest.fn(),
+    }));
+    const onReload = jest.fn();
+    const onChange = jest.fn();
+    try {
+      subscribeToPlantChanges({ onReload, onChange });
+      expect(global.EventSource).toHaveBeenCalledWith(
+        'http://localhost:8000/api/v1/plants/changes',
+      );
+
+      listeners.ready({ data: '{"seq":0}' });
+      expect(onReload).toHaveBeenCalledTimes(1);
+      listeners.updated({ data: '{"seq":1,"id":2,"plant":{"id":2,"name":"Fern"}}' });
+      expect(onChange).toHaveBeenCalledWith({
+        type: 'updated',
+        id: 2,
+        plant: { id: 2, name: 'Fern' },
+      });
+      listeners.reset({ data: '{"seq":5}' });
+      expect(onReload).toHaveBeenCalledTimes(2);
+    } finally {
+      delete global.EventSource;
+    }
+  });
 });
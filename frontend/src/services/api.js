@@ -13,38 +13,86 @@
 // This URL matches our FastAPI backend running in Docker and includes API version
 const API_BASE_URL = 'http://localhost:8000/api/v1';
 
+// The plant list as of the last successful fetchPlants call, and the sync
+// version it is at (see GET /plants/sync). Later calls only download the
+// plants that changed since then, instead of the whole list.
+let syncedPlants = null;
+let syncedVersion = 0;
+
+/**
+ * Applies one page of changes from GET /plants/sync to a plant list
+ * @param {Array} list - The plants before the changes
+ * @param {Array} changes - { id, deleted, plant } objects, oldest first
+ * @returns {Array} A new list, ordered by ID (the old one is not modified)
+ *
+ * Changes are applied in the order the backend sent them: a created or
+ * updated plant replaces the plant with the same ID, a deleted one is removed.
+ */
+const applySyncChanges = (list, changes) => {
+  const byId = new Map(list.map((plant) => [plant.id, plant]));
+  changes.forEach(({ id, deleted, plant }) => {
+    if (deleted) {
+      byId.delete(id);
+    } else {
+      byId.set(id, plant);
+    }
+  });
+  return [...byId.values()].sort((a, b) => a.id - b.id);
+};
+
 /**
  * Fetches all plants from the database
  *
- * This function sends a GET request to the backend to retrieve all plant records.
- * It returns an array of plant objects, or an empty array if there is an error.
+ * The first call downloads every plant from GET /plants/sync?since=0. The
+ * backend answers with the changes and a version number; later calls send
+ * that version back as "since" and only receive the plants added, updated or
+ * deleted since then, which are applied to the list from the previous call.
+ * Large syncs come in pages (has_more); this function keeps requesting until
+ * it has them all.
  *
- * @returns {Promise<Array>} Returns a promise that resolves to an array of plants
+ * @returns {Promise<Array>} Returns a promise that resolves to an array of plants, ordered by ID
  */
 export const fetchPlants = async () => {
   try {
-    // Use GET method and set headers to match test expectations
-    const response = await fetch(`${API_BASE_URL}/plants`, {
-      method: 'GET',
-      headers: { 'Content-Type': 'application/json' },
-    });
+    let plants = syncedPlants || [];
+    let since = syncedPlants ? syncedVersion : 0;
+    let hasMore = true;
 
-    // Debugging logs to help understand what's happening
-    console.log('Response Status:', response.status);
-    const text = await response.text(); // Get response as text
-    console.log('Response Body:', text);
+    while (hasMore) {
+      // Use GET method and set headers to match test expectations
+      const response = await fetch(
+        `${API_BASE_URL}/plants/sync?since=${since}`,
+        {
+          method: 'GET',
+          headers: { 'Content-Type': 'application/json' },
+        },
+      );
 
-    // Check if the request was successful
-    if (!response.ok) {
-      // Throw an error so tests and UI can handle it
-      throw new Error(`HTTP error! status: ${response.status}`);
-    }
+      // Debugging logs to help understand what's happening
+      console.log('Response Status:', response.status);
+      const text = await response.text(); // Get response as text
+      console.log('Response Body:', text);
 
-    // Parse the JSON text into a JavaScript object
-    const data = JSON.parse(text);
+      // Check if the request was successful
+      if (!response.ok) {
+        // Throw an error so tests and UI can handle it
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
 
-    // Return the parsed data to the calling component
-    return data;
+      // Parse the JSON text into a JavaScript object
+      const data = JSON.parse(text);
+
+      // Apply this page of changes and continue from its version
+      plants = applySyncChanges(plants, data.changes);
+      since = data.version;
+      hasMore = data.has_more;
+    }
+
+    // Remember where we are, so the next call only asks for newer changes
+    syncedPlants = plants;
+    syncedVersion = since;
+    // Return all plants to the calling component
+    return plants;
   } catch (error) {
     // If any error occurs in the try block, it's caught here
     console.error('Error fetching plants:', error);
@@ -220,3 +268,59 @@ export const deletePlantByName = async (plantName) => {
     throw new Error('Failed to delete plant');
   }
 };
+
+/**
+ * Searches plants by name and description
+ *
+ * Names match partially and despite small typos ("toma" or "tomatoe" find "Tomato").
+ * The backend returns the best matches first, each with a "score".
+ *
+ * @param {string} query - Text to search for
+ * @returns {Promise<Array>} Returns a promise that resolves to the matching plants
+ */
+export const searchPlants = async (query) => {
+  const response = await fetch(
+    `${API_BASE_URL}/plants/search?q=${encodeURIComponent(query)}`,
+    {
+      method: 'GET',
+      headers: { 'Content-Type': 'application/json' },
+    },
+  );
+  // If the response is not OK, throw an error so the UI can handle it
+  if (!response.ok) {
+    throw new Error('Failed to search plants');
+  }
+  return response.json();
+};
+
+/**
+ * Subscribes to live plant changes (server-sent events)
+ *
+ * The backend pushes one event per added, updated or deleted plant, so the
+ * plant list can be kept up to date without fetching it again. If the
+ * connection drops, the browser reconnects by itself and the backend replays
+ * the changes that were missed.
+ *
+ * @param {Object} handlers
+ * @param {Function} handlers.onReload - Called when the full list has to be loaded: when the
+ *   stream first opens, and when the backend cannot replay everything that was missed
+ * @param {Function} handlers.onChange - Called with { type, id, plant } for each change;
+ *   type is 'created', 'updated' or 'deleted' (plant is null for deletes)
+ * @returns {EventSource|null} The open connection (call close() to stop), or null if the
+ *   browser does not support server-sent events
+ */
+export const subscribeToPlantChanges = ({ onReload, onChange }) => {
+  if (typeof EventSource === 'undefined') {
+    return null;
+  }
+  const source = new EventSource(`${API_BASE_URL}/plants/changes`);
+  source.addEventListener('ready', () => onReload());
+  source.addEventListener('reset', () => onReload());
+  ['created', 'updated', 'deleted'].forEach((type) => {
+    source.addEventListener(type, (event) => {
+      const { id, plant } = JSON.parse(event.data);
+      onChange({ type, id, plant });
+    });
+  });
+  return source;
+};
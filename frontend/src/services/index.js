@@ -18,4 +18,6 @@ export {
   updatePlantByName,
   deletePlantById,
   deletePlantByName,
+  searchPlants,
+  subscribeToPlantChanges,
 } from './api';